@@ -0,0 +1,97 @@
+# app/api/admin.py
+from fastapi import APIRouter, Depends, Header, HTTPException
+from typing import Optional
+import asyncio
+import hmac
+import os
+
+from app.core.config import ADMIN_TOKEN, PROFILE_MAX_REQUESTS
+from app.core.leader import leader_lock
+from app.core.profiling import MODES as PROFILE_MODES, profile_schedule
+from app.inference.registry import model_registry
+
+router = APIRouter(prefix="/admin")
+
+
+def is_admin(token: Optional[str]) -> bool:
+    return bool(ADMIN_TOKEN) and token is not None and hmac.compare_digest(token, ADMIN_TOKEN)
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Admin endpoints are off without ADMIN_TOKEN and need it in X-Admin-Token otherwise."""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Admin endpoints are disabled (ADMIN_TOKEN not set)")
+    if not is_admin(x_admin_token):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+@router.get("/models", dependencies=[Depends(require_admin)])
+def list_models():
+    return model_registry.status()
+
+
+@router.post("/models/{version}/activate", dependencies=[Depends(require_admin)])
+async def activate_model(version: str):
+    """
+    Load `version` (off the event loop) and swap it in. Requests already
+    running keep the model they started with. The choice is also written to
+    the ACTIVE file, which the other workers watch.
+    """
+    try:
+        await asyncio.to_thread(model_registry.activate, version)
+        await asyncio.to_thread(model_registry.write_active_file, version)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown model version {version!r}")
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return model_registry.status()
+
+
+@router.post("/models/{version}/shadow", dependencies=[Depends(require_admin)])
+async def shadow_model(version: str):
+    """Score live traffic with `version` as a challenger; responses still come from the champion."""
+    try:
+        await asyncio.to_thread(model_registry.set_challenger, version)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown model version {version!r}")
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return model_registry.status()
+
+
+@router.delete("/models/shadow", dependencies=[Depends(require_admin)])
+async def stop_shadow():
+    await asyncio.to_thread(model_registry.set_challenger, None)
+    return model_registry.status()
+
+
+@router.get("/profile", dependencies=[Depends(require_admin)])
+def profile_status():
+    """What is still armed, and the most recent profile files."""
+    return profile_schedule.status()
+
+
+@router.post("/profile", dependencies=[Depends(require_admin)])
+def arm_profile(requests: int = 0, drift_cycles: int = 0, mode: str = "sampling"):
+    """
+    Profile the next `requests` /predict requests (stack sampling) and the
+    next `drift_cycles` drift checks (`mode`: sampling or cprofile). Output
+    goes to PROFILE_DIR. Arming again replaces what is left of the previous one.
+    Arming is per worker: requests are profiled on the worker that got this
+    call, and drift cycles can only be armed on the leader (409 elsewhere).
+    """
+    if not 0 <= requests <= PROFILE_MAX_REQUESTS:
+        raise HTTPException(status_code=400, detail=f"requests must be between 0 and {PROFILE_MAX_REQUESTS}")
+    if drift_cycles < 0:
+        raise HTTPException(status_code=400, detail="drift_cycles must not be negative")
+    if mode not in PROFILE_MODES:
+        raise HTTPException(status_code=400, detail=f"Unknown mode {mode!r}, expected one of {list(PROFILE_MODES)}")
+    if drift_cycles and not leader_lock.is_leader:
+        # the schedule is per process and only the leader runs drift checks
+        raise HTTPException(
+            status_code=409,
+            detail=f"Drift checks run on the leader worker (pid {leader_lock.holder_pid()}), not on worker "
+                   f"{os.getpid()}; retry until the request reaches the leader",
+        )
+    profile_schedule.arm(requests, drift_cycles, mode)
+    return profile_schedule.status()
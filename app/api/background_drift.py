@@ -1,82 +1,216 @@
 # app/api/background_drift.py
 import asyncio
+import numpy as np
 import pandas as pd
 import os
 import json
+import threading
+import time
+
+from app.api.dashboard_data import dashboard_snapshot
+from app.core.executors import run_drift
+from app.monitoring.drift import drift_job, run_streaming_drift_check
+from app.monitoring.streaming import STREAMING_ENABLED, get_drift_state
+from app.core.config import DRIFT_MAX_STALENESS_SECONDS, DRIFT_MIN_NEW_ROWS
+from app.core.leader import leader_lock
+from app.core.metrics import DRIFT_CYCLE, DRIFT_CYCLES_SKIPPED, DRIFT_PHASE
+from app.core.profiling import profile_schedule, run_profiled
+from app.monitoring.log_writer import get_prediction_writer
+from app.monitoring.report_cache import html_report_cache
+from app.inference.registry import model_registry
+from app.inference.results import columns_to_records, prediction_labels
 
-from app.monitoring.drift import run_drift_check
-from app.inference.predictor import Predictor
 
-predictor = Predictor()
-
-REFERENCE_PATH = "models/v1/reference_data.csv"
-PROD_LOG_PATH = "data/production/predictions_log.csv"
 DASHBOARD_JSON = "reports/evidently/drift_report.json"
 
 MAX_ROWS = 5000  # rolling window
-os.makedirs(os.path.dirname(DASHBOARD_JSON), exist_ok=True)
-
-async def drift_loop(interval_seconds: int = 10):
+MAX_DISPLAY = 50  # last N predictions for dashboard
+
+
+def load_drift_window(max_rows: int, features: list) -> pd.DataFrame:
+    """Newest rows of the prediction log with all required features."""
+    prediction_writer = get_prediction_writer(features)
+    # Include rows still queued in the write-behind buffer
+    prediction_writer.flush()
+    # Rolling window (retention itself drops whole log segments)
+    prod_df = prediction_writer.log.tail(max_rows)
+    if prod_df.empty:
+        return prod_df
+
+    missing_features = set(features) - set(prod_df.columns)
+    if missing_features:
+        print(f"Skipping drift check, missing features: {missing_features}")
+        return prod_df.iloc[0:0]
+
+    return prod_df.dropna(subset=features)
+
+
+def log_position(features: list) -> dict:
+    """Rows per prediction log segment, counting rows still queued in the write-behind buffer."""
+    prediction_writer = get_prediction_writer(features)
+    prediction_writer.flush()
+    return prediction_writer.log.row_counts()
+
+
+def new_rows(previous: dict, current: dict) -> int:
+    """Rows logged between two positions (segments dropped by retention don't count)."""
+    return sum(max(0, rows - previous.get(segment, 0)) for segment, rows in current.items())
+
+
+class DriftWatermark:
+    """
+    Where the prediction log stood at the last completed drift check. A new
+    check is due when there was none yet, another model became active, at
+    least `min_new_rows` rows were logged since, or the last check is older
+    than `max_staleness` seconds (0 disables that). A failed check does not
+    move the watermark, so the next cycle retries it.
+    """
+
+    def __init__(self, min_new_rows: int = DRIFT_MIN_NEW_ROWS, max_staleness: float = DRIFT_MAX_STALENESS_SECONDS):
+        self.min_new_rows = max(1, min_new_rows)
+        self.max_staleness = max_staleness
+        self.position = None
+        self.model_version = None
+        self.checked_at = None
+
+    def due(self, position: dict, model_version: str, now: float = None) -> bool:
+        if self.position is None or model_version != self.model_version:
+            return True
+        if new_rows(self.position, position) >= self.min_new_rows:
+            return True
+        now = time.monotonic() if now is None else now
+        return self.max_staleness > 0 and now - self.checked_at >= self.max_staleness
+
+    def mark(self, position: dict, model_version: str, now: float = None):
+        self.position = position
+        self.model_version = model_version
+        self.checked_at = time.monotonic() if now is None else now
+
+
+def build_dashboard_payload(prod_df: pd.DataFrame, drift_dict: dict, max_display: int, shadow: dict = None,
+                            n_rows: int = None) -> dict:
+    # ---- Populate predictions for dashboard ----
+    results = []
+    if "model_prediction" in prod_df.columns and "model_probability" in prod_df.columns:
+        shown = prod_df.tail(max_display)
+        probas = shown["model_probability"].to_numpy(dtype=np.float64)
+        columns = {
+            "row": shown.index.to_numpy(),
+            "prediction": prediction_labels(shown["model_prediction"].to_numpy() == 1),
+            "probability": np.round(probas, 4),
+            "risk_level": (shown["model_risk_level"].fillna("Unknown").to_numpy()
+                           if "model_risk_level" in shown.columns else np.full(len(shown), "Unknown", dtype=object)),
+        }
+        if "timestamp" in shown.columns:
+            columns["timestamp"] = pd.to_datetime(shown["timestamp"], utc=True).map(pd.Timestamp.isoformat).to_numpy()
+        results = columns_to_records(columns)
+
+    return {
+        # rows in the drift window (prod_df may only hold the displayed ones)
+        "n_rows": len(prod_df) if n_rows is None else n_rows,
+        "results": results,
+        "drift": [
+            {"column": col, "score": float(score)}
+            for col, score in drift_dict.items()
+        ],
+        # champion/challenger agreement while shadow scoring is on
+        "shadow": shadow,
+    }
+
+
+def write_dashboard_json(payload: dict):
+    os.makedirs(os.path.dirname(DASHBOARD_JSON), exist_ok=True)
+    # per-thread temp file: two concurrent writers must not rename each other's file
+    tmp_path = f"{DASHBOARD_JSON}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(payload, f, indent=2)
+    os.replace(tmp_path, DASHBOARD_JSON)
+
+
+def streaming_drift(model_version: str, profile=None):
+    # Drift comes from the accumulator (seeded from the log when it was created)
+    drift_state = get_drift_state(model_version)
+    timings = {}
+    if profile is None:
+        alerts, drift_dict = run_streaming_drift_check(drift_state, model_version=model_version, timings=timings)
+    else:
+        (alerts, drift_dict), timings["profile_output"] = run_profiled(
+            "drift", profile, run_streaming_drift_check, drift_state, model_version, timings
+        )
+    return alerts, drift_dict, drift_state.n_rows, timings
+
+
+def observe_phases(timings: dict):
+    for phase, seconds in timings.items():
+        DRIFT_PHASE.labels(phase).observe(seconds)
+
+
+async def drift_cycle(max_rows: int = MAX_ROWS, max_display: int = MAX_DISPLAY):
+    """
+    One drift check. File I/O runs in worker threads and the drift computation
+    on the drift executor, so the event loop only awaits.
+    Drift is checked against the reference of the model active at the start
+    of the cycle. Returns the dashboard payload, or None when there is nothing
+    to check.
+    """
+    predictor = model_registry.active
+    # the streaming accumulator only sees this worker's traffic: use it only while no other worker runs
+    streaming = STREAMING_ENABLED and await asyncio.to_thread(leader_lock.worker_count) == 1
+    with DRIFT_PHASE.labels("load_log").time():
+        # streaming: the log only supplies the rows shown on the dashboard
+        prod_df = await asyncio.to_thread(
+            load_drift_window, max_display if streaming else max_rows, predictor.features
+        )
+    if prod_df.empty:
+        return None
+
+    # profiling armed through /admin/profile: None (the usual case) or a mode
+    profile = profile_schedule.take_drift_cycle()
+    if streaming:
+        _, drift_dict, n_rows, timings = await asyncio.to_thread(streaming_drift, predictor.model_version, profile)
+    else:
+        # ---- Run drift on features only (streaming with several workers: native engine on the log) ----
+        window = prod_df[predictor.features]
+        backend = "native" if STREAMING_ENABLED else None
+        _, drift_dict, timings = await run_drift(drift_job, window, predictor.model_version, backend, profile)
+        n_rows = len(prod_df)
+        # the HTML report of this window is only rendered if someone asks for it
+        await asyncio.to_thread(html_report_cache.update, window, predictor.model_version)
+    if "profile_output" in timings:
+        profile_path = timings.pop("profile_output")
+        profile_schedule.record(profile_path)
+        print("Drift check profile written to", profile_path)
+    observe_phases(timings)
+
+    with DRIFT_PHASE.labels("publish").time():
+        dashboard_payload = await asyncio.to_thread(
+            build_dashboard_payload, prod_df, drift_dict, max_display, model_registry.shadow_stats(), n_rows
+        )
+        # the in-memory snapshot serves /dashboard/data; the file is only persistence
+        await asyncio.to_thread(dashboard_snapshot.publish, dashboard_payload)
+    with DRIFT_PHASE.labels("write_json").time():
+        await asyncio.to_thread(write_dashboard_json, dashboard_payload)
+    return dashboard_payload
+
+
+async def drift_loop(interval_seconds: int = 10, max_rows: int = MAX_ROWS, max_display: int = MAX_DISPLAY,
+                     watermark: DriftWatermark = None):
+    # cycles without new predictions only list the log directory
+    watermark = watermark or DriftWatermark()
     while True:
+        started = time.perf_counter()
         try:
-            if not os.path.exists(PROD_LOG_PATH):
-                await asyncio.sleep(interval_seconds)
-                continue
-
-            prod_df = pd.read_csv(PROD_LOG_PATH)
-
-            # Retention window
-            if len(prod_df) > MAX_ROWS:
-                prod_df = prod_df.tail(MAX_ROWS)
-                prod_df.to_csv(PROD_LOG_PATH, index=False)
-
-            # Keep only rows with all required features
-            missing_features = set(predictor.features) - set(prod_df.columns)
-            if missing_features:
-                print(f"Skipping drift check, missing features: {missing_features}")
-                await asyncio.sleep(interval_seconds)
-                continue
-
-            prod_df = prod_df.dropna(subset=predictor.features)
-            if prod_df.empty:
-                await asyncio.sleep(interval_seconds)
-                continue
-
-            reference_df = pd.read_csv(REFERENCE_PATH)
-
-            # ---- Run drift on features only ----
-            _, drift_dict = run_drift_check(
-                prod_df[predictor.features],
-                reference_df[predictor.features],
-                model_version="v1"
-            )
-
-            # ---- Populate predictions for dashboard ----
-            results = []
-            if "model_prediction" in prod_df.columns and "model_probability" in prod_df.columns:
-                for i, row in prod_df.tail(50).iterrows():  # last 50 rows
-                    results.append({
-                        "row": i,
-                        "prediction": "Default" if row["model_prediction"] == 1 else "No Default",
-                        "probability": round(float(row["model_probability"]), 4),
-                        "risk_level": row.get("model_risk_level", "Unknown")
-                    })
-
-            dashboard_payload = {
-                "n_rows": len(prod_df),
-                "results": results,
-                "drift": [
-                    {"column": col, "score": float(score)}
-                    for col, score in drift_dict.items()
-                ],
-            }
-
-            tmp_path = DASHBOARD_JSON + ".tmp"
-            with open(tmp_path, "w") as f:
-                json.dump(dashboard_payload, f, indent=2)
-            os.replace(tmp_path, DASHBOARD_JSON)
-
+            predictor = model_registry.active
+            position = await asyncio.to_thread(log_position, predictor.features)
+            # a cycle armed for profiling runs even on an unchanged log
+            if watermark.due(position, predictor.model_version) or profile_schedule.drift_cycles > 0:
+                await drift_cycle(max_rows, max_display)
+                watermark.mark(position, predictor.model_version)
+                DRIFT_CYCLE.observe(time.perf_counter() - started)
+            else:
+                DRIFT_CYCLES_SKIPPED.inc()
         except Exception as e:
             print("Drift loop error:", e)
+            DRIFT_CYCLE.observe(time.perf_counter() - started)
 
         await asyncio.sleep(interval_seconds)
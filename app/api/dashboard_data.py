@@ -1,24 +1,234 @@
 # app/api/dashboard_data.py
-from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+import asyncio
+import hashlib
 import json
 import os
+import threading
+import time
+
+from app.core.metrics import metrics
 
 router = APIRouter()
 
 DATA_FILE = "reports/evidently/drift_report.json"  # we will write drift info here
 
+SSE_KEEPALIVE_SECONDS = 15
+SSE_QUEUE_SIZE = 16  # events buffered per client before it is resynced with a full snapshot
+FOLLOW_SECONDS = 2  # how often workers that do not run the drift loop check DATA_FILE
+
+
+def prediction_delta(previous: list, current: list):
+    """
+    Predictions in `current` that were not in `previous`, or None if they
+    cannot be lined up (first publish, or the window moved past them).
+    Log batches share one timestamp and are written whole, so everything after
+    the last row carrying the previous newest timestamp is new.
+    """
+    if not previous:
+        return None
+    anchor = previous[-1].get("timestamp")
+    if anchor is None:
+        return None
+    for i in range(len(current) - 1, -1, -1):
+        if current[i].get("timestamp") == anchor:
+            return current[i + 1:]
+    return None
+
+
+def drift_delta(previous: list, current: list) -> list:
+    """Drift scores that are new or changed since the previous payload."""
+    before = {d["column"]: d["score"] for d in previous}
+    return [d for d in current if before.get(d["column"]) != d["score"]]
+
+
+class _Subscriber:
+    """Event queue of one stream client, fed from any thread via its loop."""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=SSE_QUEUE_SIZE)
+
+    def offer(self, event):
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            pass  # the client's loop is closed; it is unsubscribed on its way out
+
+    def _put(self, event):
+        if self.queue.full():
+            # slow client: drop its backlog, it gets a full snapshot instead
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            event = "resync"
+        self.queue.put_nowait(event)
+
+
+class DashboardSnapshot:
+    """
+    Latest dashboard payload, published by the drift loop and kept in memory
+    as pre-serialized response bytes. The ETag is a hash of those bytes, so a
+    republished but unchanged payload still answers 304. Each change is also
+    pushed to stream subscribers as a delta against the previous payload.
+    """
+
+    def __init__(self, fallback_file: str = DATA_FILE):
+        self.fallback_file = fallback_file
+        self.version = 0
+        self.payload = None
+        self.body = None
+        self.etag = None
+        self.published_at = None  # wall-clock time of the last publish, changed or not
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def publish(self, payload: dict):
+        body = json.dumps({"status": "ok", "data": payload}, separators=(",", ":")).encode()
+        etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+        with self._lock:
+            self.published_at = time.time()
+            if etag == self.etag:
+                return
+            previous = self.payload
+            self.version += 1
+            self.payload, self.body, self.etag = payload, body, etag
+            event = self._delta_event(previous, payload)
+            subscribers = list(self._subscribers)
+        for sub in subscribers:
+            sub.offer(event)
+
+    def _delta_event(self, previous, payload):
+        predictions = prediction_delta(previous["results"], payload["results"]) if previous else None
+        if predictions is None:
+            return "resync"
+        return ("delta", self.version, {
+            "version": self.version,
+            "n_rows": payload["n_rows"],
+            "predictions": predictions,
+            "drift": drift_delta(previous["drift"], payload["drift"]),
+            "shadow": payload.get("shadow"),
+        })
+
+    def snapshot_event(self):
+        with self._lock:
+            if self.payload is None:
+                return None
+            return ("snapshot", self.version, {"version": self.version, **self.payload})
+
+    def current(self):
+        """(body, etag); before the first publish, seeded from the persisted JSON file."""
+        if self.body is None and os.path.exists(self.fallback_file):
+            with open(self.fallback_file, "r") as f:
+                self.publish(json.load(f))
+        return self.body, self.etag
+
+    def reload(self, mtime):
+        """Publish the persisted payload if the file changed since `mtime`; returns its mtime."""
+        try:
+            current = os.path.getmtime(self.fallback_file)
+            if current == mtime:
+                return mtime
+            with open(self.fallback_file, "r") as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return mtime
+        self.publish(payload)
+        self.published_at = current  # when the leader wrote it
+        return current
+
+    async def follow(self, interval_seconds: float = FOLLOW_SECONDS):
+        """
+        Keep this worker's snapshot in step with the file written by the leader
+        (see app/core/leader.py). In the leader itself the reloaded payload is
+        the one just published, so it is a no-op.
+        """
+        mtime = None
+        while True:
+            mtime = await asyncio.to_thread(self.reload, mtime)
+            await asyncio.sleep(interval_seconds)
+
+    def subscribe(self) -> _Subscriber:
+        sub = _Subscriber(asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: _Subscriber):
+        with self._lock:
+            self._subscribers.discard(sub)
+
+
+dashboard_snapshot = DashboardSnapshot()
+
+metrics.gauge("dashboard_payload_age_seconds", "Seconds since the dashboard payload was last published",
+              fn=lambda: time.time() - dashboard_snapshot.published_at if dashboard_snapshot.published_at else None)
+
+
+def format_sse(event: str, version: int, data: dict) -> bytes:
+    return f"event: {event}\nid: {version}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode()
+
+
+async def event_stream(request: Request, last_event_id: str = None, keepalive: float = SSE_KEEPALIVE_SECONDS):
+    """
+    SSE body: a full `snapshot` event first (skipped if the client reconnects
+    already at the current version), then `delta` events as the drift loop
+    publishes, with keep-alive comments in between.
+    """
+    sub = dashboard_snapshot.subscribe()
+    try:
+        first = dashboard_snapshot.snapshot_event()
+        if first is not None and last_event_id != str(first[1]):
+            yield format_sse(*first)
+        while not await request.is_disconnected():
+            try:
+                event = await asyncio.wait_for(sub.queue.get(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                yield b": keep-alive\n\n"
+                continue
+            if event == "resync":
+                event = dashboard_snapshot.snapshot_event()
+            yield format_sse(*event)
+    finally:
+        dashboard_snapshot.unsubscribe(sub)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    # weak comparison: W/"x" matches "x"
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag in [t[2:] if t.startswith("W/") else t for t in tags]
+
+
 @router.get("/dashboard/data")
-def get_dashboard_data():
+def get_dashboard_data(request: Request):
     """
     Return the latest drift and prediction summary for the frontend dashboard.
+    Supports If-None-Match: repeat polls of an unchanged snapshot get a 304.
     """
-    if os.path.exists(DATA_FILE):
-        try:
-            with open(DATA_FILE, "r") as f:
-                data = json.load(f)
-            return JSONResponse({"status": "ok", "data": data})
-        except Exception as e:
-            return JSONResponse({"status": "error", "message": str(e)}, status_code=500)
-    else:
+    try:
+        body, etag = dashboard_snapshot.current()
+    except Exception as e:
+        return JSONResponse({"status": "error", "message": str(e)}, status_code=500)
+    if body is None:
         return JSONResponse({"status": "error", "message": "No data available"}, status_code=404)
+
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/dashboard/stream")
+async def stream_dashboard_data(request: Request):
+    """Server-Sent Events: full snapshot on connect, then prediction/drift deltas."""
+    try:
+        await asyncio.to_thread(dashboard_snapshot.current)  # seed from the file after a restart
+    except Exception as e:
+        print("Dashboard snapshot seed error:", e)
+    return StreamingResponse(
+        event_stream(request, request.headers.get("last-event-id")),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
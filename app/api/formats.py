@@ -0,0 +1,175 @@
+# app/api/formats.py
+# Request/response formats for /predict: CSV, Arrow IPC, Parquet, NDJSON, JSON
+import os
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.json as pa_json
+import pyarrow.parquet as pq
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+ARROW_FILE = "application/vnd.apache.arrow.file"
+PARQUET = "application/vnd.apache.parquet"
+NDJSON = "application/x-ndjson"
+CSV = "text/csv"
+JSON = "application/json"
+
+# media type (and common aliases) -> format name
+MEDIA_TYPES = {
+    ARROW_STREAM: "arrow",
+    ARROW_FILE: "arrow",
+    "application/x-arrow": "arrow",
+    PARQUET: "parquet",
+    "application/x-parquet": "parquet",
+    NDJSON: "ndjson",
+    "application/jsonlines": "ndjson",
+    CSV: "csv",
+    "application/csv": "csv",
+    JSON: "json",
+}
+EXTENSIONS = {
+    ".arrow": "arrow", ".arrows": "arrow", ".feather": "arrow",
+    ".parquet": "parquet",
+    ".ndjson": "ndjson", ".jsonl": "ndjson",
+    ".csv": "csv",
+}
+RESPONSE_MEDIA_TYPES = {"json": JSON, "arrow": ARROW_STREAM, "parquet": PARQUET, "ndjson": NDJSON, "csv": CSV}
+
+# Content-Encoding token -> pyarrow codec (both ship with pyarrow, no extra dependency)
+ENCODINGS = {"gzip": "gzip", "x-gzip": "gzip", "zstd": "zstd"}
+COMPRESSED_EXTENSIONS = {".gz": "gzip", ".zst": "zstd"}
+MIN_COMPRESS_BYTES = 1024
+
+
+class UnsupportedFormat(ValueError):
+    """Request body or Accept header names a format/encoding we do not handle."""
+
+
+def _media_type(value: str) -> str:
+    return (value or "").split(";")[0].strip().lower()
+
+
+def detect_input(content_type: str, filename: str = None, content_encoding: str = None):
+    """(format, encoding) of a request body from its Content-Type/Encoding or the upload's file name."""
+    encoding = None
+    if content_encoding and content_encoding.strip().lower() != "identity":
+        encoding = ENCODINGS.get(content_encoding.strip().lower())
+        if encoding is None:
+            raise UnsupportedFormat(f"Unsupported Content-Encoding {content_encoding!r}")
+
+    name = (filename or "").lower()
+    root, ext = os.path.splitext(name)
+    if ext in COMPRESSED_EXTENSIONS:
+        encoding = encoding or COMPRESSED_EXTENSIONS[ext]
+        root, ext = os.path.splitext(root)
+
+    fmt = MEDIA_TYPES.get(_media_type(content_type))
+    if fmt is None or fmt == "json":
+        fmt = EXTENSIONS.get(ext, "csv")  # octet-stream, missing type, ...: fall back to the extension
+    return fmt, encoding
+
+
+def _accepted(header: str) -> list:
+    """Media types of an Accept/Accept-Encoding header, highest q first (q=0 dropped)."""
+    items = []
+    for i, part in enumerate((header or "").split(",")):
+        value, _, params = part.partition(";")
+        q = 1.0
+        for p in params.split(";"):
+            key, _, val = p.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(val)
+                except ValueError:
+                    q = 0.0
+        if value.strip() and q > 0:
+            items.append((-q, i, value.strip().lower()))
+    return [v for _, _, v in sorted(items)]
+
+
+def negotiate_response(accept: str) -> str:
+    """Response format from the Accept header; JSON unless a columnar format is preferred."""
+    for media_type in _accepted(accept):
+        if media_type in ("*/*", "application/*"):
+            return "json"
+        fmt = MEDIA_TYPES.get(media_type)
+        if fmt is not None:
+            return fmt
+    if accept and _accepted(accept):
+        raise UnsupportedFormat(f"None of the accepted types are supported: {accept}")
+    return "json"
+
+
+def negotiate_encoding(accept_encoding: str):
+    for token in _accepted(accept_encoding):
+        if token in ENCODINGS:
+            return ENCODINGS[token]
+    return None
+
+
+# ---- Decoding ----
+def decompressed(fileobj, encoding: str = None):
+    if encoding is None:
+        return fileobj
+    return pa.CompressedInputStream(pa.PythonFile(fileobj, mode="r"), encoding)
+
+
+def read_table(source, fmt: str, columns: list = None) -> pa.Table:
+    """Typed columnar input as an Arrow table (no string parsing for Arrow/Parquet)."""
+    if fmt == "arrow":
+        data = source.read()
+        try:
+            return pa.ipc.open_stream(data).read_all()
+        except pa.ArrowInvalid:
+            return pa.ipc.open_file(pa.BufferReader(data)).read_all()
+    if fmt == "parquet":
+        # only the needed columns are decoded
+        data = source.read()
+        schema_names = pq.read_schema(pa.BufferReader(data)).names
+        wanted = [c for c in columns if c in schema_names] if columns is not None else None
+        return pq.read_table(pa.BufferReader(data), columns=wanted)
+    if fmt == "ndjson":
+        return pa_json.read_json(pa.BufferReader(source.read()))
+    raise UnsupportedFormat(f"Unsupported input format {fmt!r}")
+
+
+def feature_matrix(table: pa.Table, features: list) -> np.ndarray:
+    """(n_rows, n_features) float64 matrix in `features` order; nulls become NaN."""
+    X = np.empty((table.num_rows, len(features)), dtype=np.float64)
+    for j, f in enumerate(features):
+        X[:, j] = table.column(f).cast(pa.float64()).to_numpy(zero_copy_only=False)
+    return X
+
+
+# ---- Encoding ----
+def results_table(columns: dict) -> pa.Table:
+    """Arrow table from `app.inference.results.result_columns`."""
+    return pa.table({name: pa.array(values) for name, values in columns.items()})
+
+
+def encode_table(table: pa.Table, fmt: str) -> bytes:
+    if fmt == "arrow":
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+    if fmt == "parquet":
+        sink = pa.BufferOutputStream()
+        pq.write_table(table, sink)
+        return sink.getvalue().to_pybytes()
+    df = table.to_pandas()
+    if fmt == "ndjson":
+        return df.to_json(orient="records", lines=True).encode()
+    if fmt == "csv":
+        return df.to_csv(index=False).encode()
+    raise UnsupportedFormat(f"Unsupported response format {fmt!r}")
+
+
+def compress(body: bytes, encoding: str = None):
+    """(body, Content-Encoding or None); small bodies are sent as is."""
+    if encoding is None or len(body) < MIN_COMPRESS_BYTES:
+        return body, None
+    sink = pa.BufferOutputStream()
+    with pa.CompressedOutputStream(sink, encoding) as out:
+        out.write(body)
+    return sink.getvalue().to_pybytes(), encoding
@@ -0,0 +1,68 @@
+# app/api/metrics.py
+# GET /metrics and per-route request latency
+import time
+
+from fastapi import APIRouter
+from fastapi.responses import Response
+from starlette.routing import Mount
+
+from app.core.metrics import REQUEST_LATENCY, metrics
+
+router = APIRouter()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics")
+def get_metrics():
+    """All metrics of this process in the Prometheus text exposition format."""
+    return Response(content=metrics.render(), media_type=CONTENT_TYPE)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware timing every HTTP request until its last body chunk
+    is sent. Requests are labelled with their route template
+    ("/admin/models/{version}/activate", not the raw path) so the number of
+    series stays bounded; mounts are labelled with their prefix and unknown
+    paths with "unmatched".
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._templates = None
+
+    def _route(self, scope) -> str:
+        if self._templates is None:
+            routes = scope["app"].routes
+            self._templates = {getattr(r, "endpoint", None): r.path for r in routes if not isinstance(r, Mount)}
+            self._mounts = [r.path for r in routes if isinstance(r, Mount)]
+        template = self._templates.get(scope.get("endpoint"))
+        if template is not None:
+            return template
+        path = scope.get("path", "")
+        for prefix in self._mounts:
+            if path.startswith(prefix + "/"):
+                return prefix
+        return "unmatched"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUEST_LATENCY.labels(scope["method"], self._route(scope), status).observe(
+                time.perf_counter() - started
+            )
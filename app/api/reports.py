@@ -0,0 +1,33 @@
+# app/api/reports.py
+from fastapi import APIRouter
+from fastapi.responses import FileResponse, JSONResponse
+import os
+
+from app.core.executors import QueueFullError
+from app.monitoring.drift import REPORT_PATH
+from app.monitoring.report_cache import html_report_cache
+
+router = APIRouter()
+
+
+@router.get("/" + REPORT_PATH.replace(os.sep, "/"))
+async def drift_report_html():
+    """
+    Evidently HTML report of the latest drift window. Rendered on the drift
+    executor on the first request after the window changes, then served from
+    the cache. Before the first drift check, falls back to the report on disk.
+    """
+    try:
+        path = await html_report_cache.get()
+    except QueueFullError as e:
+        return JSONResponse({"status": "error", "message": f"Drift executor busy, retry later ({e})"},
+                            status_code=503, headers={"Retry-After": "5"})
+    except Exception as e:
+        print("Drift report render error:", e)
+        return JSONResponse({"status": "error", "message": str(e)}, status_code=500)
+
+    if path is None and os.path.exists(REPORT_PATH):
+        path = REPORT_PATH
+    if path is None:
+        return JSONResponse({"status": "error", "message": "No drift report available yet"}, status_code=404)
+    return FileResponse(path, media_type="text/html", headers={"Cache-Control": "no-cache"})
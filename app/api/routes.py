@@ -1,68 +1,88 @@
 # app/api/routes.py
-from fastapi import APIRouter, BackgroundTasks, UploadFile, File, Request, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, UploadFile, File, Request, HTTPException
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.templating import Jinja2Templates
+from typing import List, Union
 
-from app.inference.predictor import Predictor
-from app.monitoring.data_loader import load_production_data
+from app.api.admin import is_admin
+from app.api.schemas import PredictionRequest, PredictionResponse
+from app.api.formats import (
+    RESPONSE_MEDIA_TYPES,
+    UnsupportedFormat,
+    compress,
+    decompressed,
+    detect_input,
+    encode_table,
+    feature_matrix,
+    negotiate_encoding,
+    negotiate_response,
+    read_table,
+    results_table,
+)
+from app.inference.registry import model_registry
+from app.inference.batcher import MicroBatcher
+from app.inference.chunked import STREAM_FORMATS, ChunkedCsvScorer
+from app.inference.predictor import InvalidFeatureValues, check_finite
+from app.inference.results import LAYOUTS, dumps, result_columns, results_json, risk_levels
+from app.core.config import BATCHING_ENABLED, STREAM_CHUNK_ROWS
+from app.core.executors import QueueFullError, inference_executor, run_inference
+from app.core.metrics import PREDICT_PHASE
+from app.core.profiling import profile_schedule, sampling
 from app.monitoring.governance import run_governance_checks
+from app.monitoring.streaming import record_predictions
+from app.monitoring.log_writer import get_prediction_writer
 
+import asyncio
+import io
+import threading
 import pandas as pd
 import numpy as np
+import pyarrow as pa
 import json
 import os
 
 templates = Jinja2Templates(directory="app/templates")
 router = APIRouter()
-predictor = Predictor()
-
-# Production log file
-PROD_LOG = "data/production/predictions_log.csv"
-
-# ------------------------------------------------------------------
-# ENSURE production log exists at server startup
-# ------------------------------------------------------------------
-os.makedirs(os.path.dirname(PROD_LOG), exist_ok=True)
-
-if not os.path.exists(PROD_LOG):
-    base_cols = list(predictor.features)
-    extra_cols = [
-        "target",            # true label
-        "model_prediction",  # model output
-        "model_probability",
-        "model_risk_level",
-        "model_version",
-        "timestamp",
-    ]
-    empty_df = pd.DataFrame(columns=base_cols + extra_cols)
-    empty_df.to_csv(PROD_LOG, index=False)
-# ------------------------------------------------------------------
 
+# Production log (append-only Arrow segments, imports the legacy CSV once),
+# written behind the request by a background writer (see get_prediction_writer;
+# opened by the lifespan). Every model version shares it, so versions must
+# keep the same feature list.
 
-@router.post("/predict")
-async def predict_file(background_tasks: BackgroundTasks, file: UploadFile = File(...)):
-    df = pd.read_csv(file.file)
+# Request phases: parse, inference (scoring incl. batching), log_write (queueing
+# for the prediction log and the drift state), serialize
+PARSE_PHASE = PREDICT_PHASE.labels("parse")
+INFERENCE_PHASE = PREDICT_PHASE.labels("inference")
+LOG_WRITE_PHASE = PREDICT_PHASE.labels("log_write")
+SERIALIZE_PHASE = PREDICT_PHASE.labels("serialize")
+
+# One micro-batcher per (champion, challenger) version pair: a batch never mixes
+# models, and re-creating a ShadowScorer on every swap does not add entries
+batchers = {}
+
+
+def batcher_key(predictor) -> tuple:
+    challenger = getattr(predictor, "challenger", None)
+    return predictor.model_version, challenger.model_version if challenger is not None else None
 
-    # ---- STRICT MODE: schema enforcement ----
-    missing = set(predictor.features) - set(df.columns)
-    if missing:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid schema. Missing required columns: {sorted(missing)}",
-        )
 
-    # ---- Model inference ----
-    preds, probas = predictor.predict(df)
-    results = []
-    for i, (pred, proba) in enumerate(zip(preds, probas)):
-        results.append({
-            "row": i,
-            "probability": round(float(proba), 4),
-            "prediction": "Default" if pred == 1 else "No Default",
-            "risk_level": "High" if proba >= 0.75 else "Medium" if proba >= 0.5 else "Low"
-        })
-
-    # ---- Append predictions to production log (minimal, fast) ----
+def get_batcher(predictor) -> MicroBatcher:
+    key = batcher_key(predictor)
+    batcher = batchers.get(key)
+    if batcher is None or batcher.predictor is not predictor:
+        # the same pair activated again comes with a new scorer: drop the closed one
+        batcher = batchers[key] = MicroBatcher(predictor)
+    return batcher
+
+
+async def drain_batchers():
+    """Finish every micro-batch in flight (lifespan shutdown, before the executors stop)."""
+    for batcher in list(batchers.values()):
+        await batcher.drain()
+
+
+def log_predictions(predictor, df: pd.DataFrame, preds, probas):
+    """Queue a scored upload for the production log and update the drift state."""
     df_log = df.copy()
 
     # Keep true target if present
@@ -78,25 +98,274 @@ async def predict_file(background_tasks: BackgroundTasks, file: UploadFile = Fil
 
     df_log["model_prediction"] = preds
     df_log["model_probability"] = probas
-    df_log["model_risk_level"] = [
-        "High" if p >= 0.75 else "Medium" if p >= 0.5 else "Low"
-        for p in probas
-    ]
+    df_log["model_risk_level"] = risk_levels(probas)
     df_log["model_version"] = predictor.model_version
     df_log["timestamp"] = pd.Timestamp.utcnow()
 
-    df_log.to_csv(PROD_LOG, mode="a", header=False, index=False)
+    get_prediction_writer(predictor.features).submit(df_log)
+    record_predictions(df, predictor.model_version)
+
 
-    return JSONResponse({
-        "n_rows": len(results),
-        "results": results,
-    })
+def score_and_log_matrix(predictor, X: np.ndarray, target=None):
+    with INFERENCE_PHASE.time():
+        preds, probas = predictor.predict_matrix(X)
+    with LOG_WRITE_PHASE.time():
+        writer = get_prediction_writer(predictor.features)
+        writer.submit(
+            writer.log.from_arrays(X, preds, probas, risk_levels(probas), predictor.model_version, target=target)
+        )
+        record_predictions(X, predictor.model_version)
+    return preds, probas
+
+
+def read_columnar(predictor, source, fmt: str, encoding: str):
+    """Arrow/Parquet/NDJSON body -> (missing features, X, target), without string parsing."""
+    table = read_table(decompressed(source, encoding), fmt, columns=predictor.features + ["target"])
+    missing = set(predictor.features) - set(table.column_names)
+    if missing:
+        return missing, None, None
+    target = None
+    if "target" in table.column_names:
+        target = table.column("target").cast(pa.float64()).to_numpy(zero_copy_only=False)
+    return set(), feature_matrix(table, predictor.features), target
+
+
+def render_predictions(preds, probas, fmt: str, encoding: str, layout: str = "records") -> Response:
+    """Results in the negotiated format, compressed if the client accepts it."""
+    if fmt == "json":
+        body = results_json(preds, probas, layout)
+    else:
+        body = encode_table(results_table(result_columns(preds, probas)), fmt)
+
+    body, content_encoding = compress(body, encoding)
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    if content_encoding:
+        headers["Content-Encoding"] = content_encoding
+    return Response(content=body, media_type=RESPONSE_MEDIA_TYPES[fmt], headers=headers)
+
+
+def server_busy(e: QueueFullError) -> HTTPException:
+    return HTTPException(status_code=503, detail=f"Server busy, retry later ({e})")
+
+
+def invalid_values_error(e: InvalidFeatureValues) -> HTTPException:
+    return HTTPException(status_code=400, detail=f"Invalid input. {e}")
+
+
+def missing_columns_error(missing: set) -> HTTPException:
+    return HTTPException(
+        status_code=400,
+        detail=f"Invalid schema. Missing required columns: {sorted(missing)}",
+    )
+
+
+async def predict_csv(predictor, source):
+    """CSV path: pandas parsing, then the (optionally micro-batched) DataFrame predictor."""
+    with PARSE_PHASE.time():
+        df = await run_inference(pd.read_csv, source)
+
+    # ---- STRICT MODE: schema enforcement ----
+    missing = set(predictor.features) - set(df.columns)
+    if missing:
+        raise missing_columns_error(missing)
+
+    # ---- Model inference (off the event loop) ----
+    with INFERENCE_PHASE.time():
+        if BATCHING_ENABLED:
+            # checked before batching: one bad upload would fail the whole batch
+            check_finite(df[predictor.features].to_numpy(dtype=np.float64))
+            preds, probas = await get_batcher(predictor).predict(df)
+        else:
+            preds, probas = await run_inference(predictor.predict, df)
+
+    # ---- Queue predictions for the production log (written behind) ----
+    with LOG_WRITE_PHASE.time():
+        await run_inference(log_predictions, predictor, df, preds, probas)
+    return preds, probas
+
+
+def request_threads():
+    """
+    Threads a request's work runs on: the event loop (the caller) and the
+    inference pool. Sampled together when a request is profiled.
+    """
+    loop_thread = threading.get_ident()
+    prefix = inference_executor.name + "_"
+    return lambda: [loop_thread] + [t.ident for t in threading.enumerate() if t.name.startswith(prefix)]
+
+
+@router.post("/predict")
+async def predict_file(request: Request, file: UploadFile = File(None), layout: str = "records"):
+    """
+    Score a multipart file upload or a raw request body. The input format
+    comes from Content-Type (or the file name): CSV, Arrow IPC, Parquet or
+    NDJSON, optionally gzip/zstd compressed (Content-Encoding or .gz/.zst).
+    The response format follows Accept (JSON by default) and is compressed
+    per Accept-Encoding; layout=columns returns JSON results column-wise.
+    Armed through /admin/profile, or with "X-Profile: 1" plus a valid
+    X-Admin-Token, the request is profiled and X-Profile-Output names the file.
+    """
+    if profile_schedule.take_request() or (
+        request.headers.get("x-profile") == "1" and is_admin(request.headers.get("x-admin-token"))
+    ):
+        profiler = None
+        try:
+            with sampling("predict", threads=request_threads()) as profiler:
+                response = await score_request(request, file, layout)
+        finally:
+            if profiler is not None:
+                profile_schedule.record(profiler.path)  # failed requests are profiled too
+        response.headers["X-Profile-Output"] = profiler.path
+        return response
+    return await score_request(request, file, layout)
+
+
+async def score_request(request: Request, file, layout: str) -> Response:
+    if layout not in LAYOUTS:
+        raise HTTPException(status_code=400, detail=f"Unknown layout {layout!r}, expected one of {list(LAYOUTS)}")
+    try:
+        if file is not None:
+            fmt, encoding = detect_input(file.content_type, file.filename)
+            source = file.file
+        else:
+            fmt, encoding = detect_input(request.headers.get("content-type"), None,
+                                         request.headers.get("content-encoding"))
+            source = io.BytesIO(await request.body())
+    except UnsupportedFormat as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    try:
+        response_fmt = negotiate_response(request.headers.get("accept"))
+    except UnsupportedFormat as e:
+        raise HTTPException(status_code=406, detail=str(e))
+    response_encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+
+    # the model active now scores the whole request, even if a swap happens meanwhile
+    predictor = model_registry.active
+    try:
+        # one executor slot for parse, score, log and render: a request is refused (503)
+        # before any work, never after its predictions were logged
+        async with inference_executor.admit():
+            if fmt == "csv":
+                preds, probas = await predict_csv(predictor, decompressed(source, encoding))
+            else:
+                try:
+                    with PARSE_PHASE.time():
+                        missing, X, target = await run_inference(read_columnar, predictor, source, fmt, encoding)
+                except (pa.ArrowInvalid, OSError) as e:
+                    raise HTTPException(status_code=400, detail=f"Could not read {fmt} body: {e}")
+                if missing:
+                    raise missing_columns_error(missing)
+                # ---- Typed input goes straight to the feature matrix (inference + log_write in one hop) ----
+                preds, probas = await run_inference(score_and_log_matrix, predictor, X, target)
+
+            with SERIALIZE_PHASE.time():
+                return await run_inference(render_predictions, preds, probas, response_fmt, response_encoding, layout)
+    except InvalidFeatureValues as e:
+        raise invalid_values_error(e)
+    except QueueFullError as e:
+        raise server_busy(e)
+
+
+@router.post("/predict/stream")
+async def predict_stream(file: UploadFile = File(...), format: str = "ndjson", chunk_rows: int = STREAM_CHUNK_ROWS):
+    """
+    Score a large CSV upload chunk by chunk and stream the results back as
+    NDJSON (default) or CSV. Each chunk is logged as soon as it is scored.
+    """
+    if format not in STREAM_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown format {format!r}, expected one of {sorted(STREAM_FORMATS)}")
+    if chunk_rows < 1:
+        raise HTTPException(status_code=400, detail="chunk_rows must be positive")
+
+    predictor = model_registry.active
+    try:
+        scorer = await run_inference(
+            ChunkedCsvScorer, predictor, get_prediction_writer(predictor.features), file.file, format, chunk_rows
+        )
+    except QueueFullError as e:
+        raise server_busy(e)
+    except pd.errors.EmptyDataError:
+        raise HTTPException(status_code=400, detail="Empty CSV upload")
+
+    # ---- STRICT MODE: schema enforcement (on the header, before streaming) ----
+    missing = scorer.missing_columns()
+    if missing:
+        raise missing_columns_error(missing)
+
+    async def body():
+        while True:
+            try:
+                chunk = await run_inference(scorer.next_chunk)
+            except QueueFullError:
+                # an upload already in progress waits for a free worker instead of failing
+                await asyncio.sleep(0.01)
+                continue
+            except Exception as e:
+                # the status line is already sent: report the failure in-band and stop
+                print("Streaming predict error:", e)
+                if format == "ndjson":
+                    yield (json.dumps({"error": str(e), "rows_scored": scorer.rows}) + "\n").encode()
+                return
+            if chunk is None:
+                return
+            yield chunk
+
+    return StreamingResponse(body(), media_type=scorer.media_type)
+
+
+@router.post("/predict/json", response_model=Union[PredictionResponse, List[PredictionResponse]])
+async def predict_json(payload: Union[List[PredictionRequest], PredictionRequest]):
+    """
+    Low-latency scoring of one record or a list of records. The feature matrix
+    is built straight from the validated payload, without pandas.
+    """
+    records = payload if isinstance(payload, list) else [payload]
+    if not records:
+        raise HTTPException(status_code=400, detail="Empty batch")
+
+    predictor = model_registry.active
+    X = np.array([[getattr(r, f) for f in predictor.features] for r in records], dtype=np.float64)
+    try:
+        # scoring and logging in one executor hop
+        preds, probas = await run_inference(score_and_log_matrix, predictor, X)
+    except InvalidFeatureValues as e:
+        raise invalid_values_error(e)
+    except QueueFullError as e:
+        raise server_busy(e)
+
+    results = [
+        {"prediction": pred, "probability": proba}
+        for pred, proba in zip(preds.tolist(), np.round(probas, 4).tolist())
+    ]
+    return Response(content=dumps(results if isinstance(payload, list) else results[0]), media_type="application/json")
+
+
+@router.get("/predict/batching")
+def batching_stats():
+    """Batch sizes achieved by the micro-batcher."""
+    return {"enabled": BATCHING_ENABLED, **get_batcher(model_registry.active).stats()}
+
+
+@router.get("/predict/log")
+def prediction_log_stats():
+    """Write-behind queue depth and flush counters of the prediction log."""
+    return get_prediction_writer(model_registry.active.features).stats()
 
 
 @router.get("/health")
 def health():
+    """Liveness: the process is up (the model may still be loading)."""
     return {"status": "ok"}
 
+
+@router.get("/ready")
+def ready(request: Request):
+    """Readiness: the model is loaded and a warm-up prediction has succeeded."""
+    state = request.app.state
+    if not getattr(state, "ready", False):
+        return JSONResponse(status_code=503, content={"status": "starting"})
+    return {"status": "ready", "startup_seconds": state.startup_seconds}
+
 @router.get("/")
 def dashboard(request: Request):
     return templates.TemplateResponse("dashboard.html", {"request": request})
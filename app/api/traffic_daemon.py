@@ -14,6 +14,13 @@ MIN_BATCH = 1
 MAX_BATCH = 5
 STARTUP_DELAY = 7
 
+
+def sample_batch_csv(df: pd.DataFrame, batch_size: int, random_state=None) -> bytes:
+    """`batch_size` random rows of the source data as a CSV request body."""
+    sample = df.sample(batch_size, replace=batch_size > len(df), random_state=random_state)
+    return sample.to_csv(index=False).encode("utf-8")
+
+
 async def traffic_loop():
     await asyncio.sleep(STARTUP_DELAY)
 
@@ -28,8 +35,7 @@ async def traffic_loop():
         while True:
             try:
                 batch_size = random.randint(MIN_BATCH, MAX_BATCH)
-                sample = df.sample(batch_size)
-                csv_bytes = sample.to_csv(index=False).encode("utf-8")
+                csv_bytes = sample_batch_csv(df, batch_size)
 
                 resp = await client.post(
                     API_URL,
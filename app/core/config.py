@@ -1,13 +1,118 @@
 # env vars, paths, thresholds
 import os
 
-MODEL_VERSION = "v1"
-MODEL_PATH = "models/v1/model.pkl"
-FEATURES_PATH = "models/v1/features.json"
+# Model versions live in MODELS_DIR/<version>/; MODEL_VERSION is the one
+# active at startup (the registry can switch it at runtime, see ACTIVE_MODEL_FILE)
+MODELS_DIR = "models"
+MODEL_VERSION = os.environ.get("MODEL_VERSION", "v1")
+MODEL_FILENAME = "model.pkl"
+FEATURES_FILENAME = "features.json"
+LINEAR_MODEL_FILENAME = "linear_model.json"
+MODEL_PATH = os.path.join(MODELS_DIR, MODEL_VERSION, MODEL_FILENAME)
+FEATURES_PATH = os.path.join(MODELS_DIR, MODEL_VERSION, FEATURES_FILENAME)
+LINEAR_MODEL_PATH = os.path.join(MODELS_DIR, MODEL_VERSION, LINEAR_MODEL_FILENAME)
+
+# Writing a version name into this file activates it (checked every
+# MODEL_WATCH_SECONDS, 0 disables the watch)
+ACTIVE_MODEL_FILE = os.path.join(MODELS_DIR, "ACTIVE")
+MODEL_WATCH_SECONDS = float(os.environ.get("MODEL_WATCH_SECONDS", 5))
+
+# Shadow scoring: every scored batch is also scored by this challenger version
+# (unset: off). Only the champion's output is returned; challenger predictions
+# go to their own log under SHADOW_LOG_DIR. Comparisons queue up to
+# SHADOW_QUEUE_BATCHES batches off the request path and are dropped beyond that
+SHADOW_MODEL_VERSION = os.environ.get("SHADOW_MODEL_VERSION") or None
+SHADOW_QUEUE_BATCHES = int(os.environ.get("SHADOW_QUEUE_BATCHES", 256))
+SHADOW_LOG_DIR = os.environ.get("SHADOW_LOG_DIR", "data/production/shadow")
+
+# Multi-worker deployments (uvicorn --workers / WEB_CONCURRENCY): the worker
+# holding LEADER_LOCK_FILE runs the background loops (traffic, drift); the
+# others retry every LEADER_RETRY_SECONDS and take over if the leader exits.
+# Workers register next to the lock; while more than one is alive the
+# streaming drift backend (per-process state) falls back to recomputing
+# drift from the shared prediction log
+LEADER_LOCK_FILE = os.environ.get("LEADER_LOCK_FILE", "data/production/leader.lock")
+LEADER_RETRY_SECONDS = float(os.environ.get("LEADER_RETRY_SECONDS", 5))
+
+# sklearn models are loaded with their NumPy arrays memory-mapped read-only, so
+# workers share one copy of the weights through the page cache
+MODEL_MMAP = os.environ.get("MODEL_MMAP", "1") == "1"
+
+# Admin endpoints (/admin/...) require this token in the X-Admin-Token header;
+# they are disabled when it is not set
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
+
+# On-demand profiling (armed through /admin/profile or the X-Profile header):
+# stacks are sampled every PROFILE_INTERVAL_MS and written as collapsed stacks
+# (flamegraph.pl / speedscope input) under PROFILE_DIR. One arming covers at
+# most PROFILE_MAX_REQUESTS requests
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "reports/profiles")
+PROFILE_INTERVAL_MS = float(os.environ.get("PROFILE_INTERVAL_MS", 5))
+PROFILE_MAX_REQUESTS = int(os.environ.get("PROFILE_MAX_REQUESTS", 100))
 DB_PATH = "database/app.db"
 
+# "compiled": score from exported coefficients (NumPy only, no sklearn import);
+# "sklearn": load model.pkl with joblib. Compiled falls back to sklearn if the artifact is missing.
+SCORING_MODE = os.environ.get("SCORING_MODE", "compiled")
+
+# Micro-batching of concurrent /predict calls (opt-in): a batch is scored when
+# it reaches BATCH_MAX_ROWS rows or after BATCH_MAX_WAIT_MS, trading latency for throughput
+BATCHING_ENABLED = os.environ.get("BATCHING_ENABLED", "0") == "1"
+BATCH_MAX_ROWS = int(os.environ.get("BATCH_MAX_ROWS", 1024))
+BATCH_MAX_WAIT_MS = float(os.environ.get("BATCH_MAX_WAIT_MS", 5))
+
+# /predict/stream: rows parsed, scored and logged per chunk (bounds peak memory)
+STREAM_CHUNK_ROWS = int(os.environ.get("STREAM_CHUNK_ROWS", 10000))
+
+# Executors: inference (parse/score/log) on a thread pool, drift computation
+# on a process pool ("process", "thread" or "inline"); in-flight jobs are
+# bounded to workers + queue size, beyond that requests get a 503
+INFERENCE_WORKERS = int(os.environ.get("INFERENCE_WORKERS", 4))
+INFERENCE_QUEUE_SIZE = int(os.environ.get("INFERENCE_QUEUE_SIZE", 64))
+DRIFT_EXECUTOR = os.environ.get("DRIFT_EXECUTOR", "process")
+DRIFT_WORKERS = int(os.environ.get("DRIFT_WORKERS", 1))
+DRIFT_QUEUE_SIZE = int(os.environ.get("DRIFT_QUEUE_SIZE", 1))
+
+# Drift backend: "evidently" (full Report), "native" (NumPy/SciPy engine)
+# or "streaming" (incremental histograms updated at prediction time)
+DRIFT_BACKEND = os.environ.get("DRIFT_BACKEND", "evidently")
+
+# Evidently HTML drift reports are rendered only when requested under /reports,
+# from the window of the latest drift check, and cached in DRIFT_REPORT_CACHE_DIR
+# by a hash of that window and the model version (the newest FILES are kept)
+DRIFT_REPORT_CACHE_DIR = os.environ.get("DRIFT_REPORT_CACHE_DIR", "reports/evidently/cache")
+DRIFT_REPORT_CACHE_FILES = int(os.environ.get("DRIFT_REPORT_CACHE_FILES", 4))
+
+# Drift-loop watermark: a cycle is skipped unless at least MIN_NEW_ROWS rows
+# reached the prediction log since the last check, or the last check is older
+# than MAX_STALENESS_SECONDS (0: never refresh an unchanged log)
+DRIFT_MIN_NEW_ROWS = int(os.environ.get("DRIFT_MIN_NEW_ROWS", 1))
+DRIFT_MAX_STALENESS_SECONDS = float(os.environ.get("DRIFT_MAX_STALENESS_SECONDS", 600))
+
+# Streaming drift window: rows kept, buckets they expire in, optional max age (s)
+DRIFT_WINDOW_ROWS = int(os.environ.get("DRIFT_WINDOW_ROWS", 9000))
+DRIFT_WINDOW_BUCKETS = int(os.environ.get("DRIFT_WINDOW_BUCKETS", 30))
+DRIFT_WINDOW_MAX_AGE = float(os.environ.get("DRIFT_WINDOW_MAX_AGE", 0))
+
+# Production prediction log: Arrow IPC segments, sealed by size/age,
+# retention drops whole segments beyond the drift window
+PREDICTION_LOG_DIR = os.environ.get("PREDICTION_LOG_DIR", "data/production/segments")
+PREDICTION_LOG_SEGMENT_ROWS = int(os.environ.get("PREDICTION_LOG_SEGMENT_ROWS", 1000))
+PREDICTION_LOG_SEGMENT_SECONDS = float(os.environ.get("PREDICTION_LOG_SEGMENT_SECONDS", 3600))
+PREDICTION_LOG_RETENTION_ROWS = int(os.environ.get("PREDICTION_LOG_RETENTION_ROWS", 9000))
+LEGACY_PREDICTION_LOG = "data/production/predictions_log.csv"
+
+# Write-behind for the prediction log: requests enqueue rows, a background
+# writer appends them in bulk every FLUSH_MS or FLUSH_ROWS rows. FSYNC=1 also
+# fsyncs each write. When QUEUE_ROWS rows are pending, producers wait up to
+# BLOCK_MS and are then rejected (503)
+PREDICTION_LOG_FLUSH_ROWS = int(os.environ.get("PREDICTION_LOG_FLUSH_ROWS", 500))
+PREDICTION_LOG_FLUSH_MS = float(os.environ.get("PREDICTION_LOG_FLUSH_MS", 250))
+PREDICTION_LOG_QUEUE_ROWS = int(os.environ.get("PREDICTION_LOG_QUEUE_ROWS", 50000))
+PREDICTION_LOG_BLOCK_MS = float(os.environ.get("PREDICTION_LOG_BLOCK_MS", 50))
+PREDICTION_LOG_FSYNC = os.environ.get("PREDICTION_LOG_FSYNC", "0") == "1"
+
 # Governance logs path
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 LOGS_PATH = os.environ.get("LOGS_PATH", os.path.join(PROJECT_ROOT, "logs"))
-os.makedirs(LOGS_PATH, exist_ok=True)
 
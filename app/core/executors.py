@@ -0,0 +1,122 @@
+# app/core/executors.py
+# Executors that keep CPU-bound work off the asyncio event loop
+import asyncio
+import contextvars
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+
+from app.core.config import (
+    INFERENCE_WORKERS,
+    INFERENCE_QUEUE_SIZE,
+    DRIFT_EXECUTOR,
+    DRIFT_WORKERS,
+    DRIFT_QUEUE_SIZE,
+)
+
+
+class QueueFullError(RuntimeError):
+    """Raised when an executor already has `workers + queue_size` jobs in flight."""
+
+
+# the executor the current request was admitted to (see BoundedExecutor.admit)
+_admitted = contextvars.ContextVar("admitted", default=None)
+
+
+class BoundedExecutor:
+    """
+    Thread or process pool with a bounded number of in-flight jobs.
+    kind: "thread", "process" or "inline" (run on the caller, e.g. for debugging).
+    """
+
+    def __init__(self, name: str, kind: str, workers: int, queue_size: int):
+        if kind not in ("thread", "process", "inline"):
+            raise ValueError(f"Unknown executor kind for {name}: {kind!r}")
+        self.name = name
+        self.kind = kind
+        self.workers = max(1, workers)
+        self.queue_size = max(0, queue_size)
+        self.in_flight = 0
+        self._pool = None
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.queue_size
+
+    def start(self):
+        if self._pool is not None or self.kind == "inline":
+            return
+        if self.kind == "thread":
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=self.name)
+        else:
+            # spawn: no inherited locks/threads from the server process
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _check_capacity(self):
+        if self.in_flight >= self.capacity:
+            raise QueueFullError(f"{self.name} executor is full ({self.in_flight} jobs in flight)")
+
+    @asynccontextmanager
+    async def admit(self):
+        """
+        Hold one slot for a whole request. `run` calls inside the block are
+        neither counted nor rejected again, so a request is either refused
+        up front (QueueFullError) or runs all of its steps.
+        """
+        self._check_capacity()
+        self.in_flight += 1
+        token = _admitted.set(self)
+        try:
+            yield
+        finally:
+            _admitted.reset(token)
+            self.in_flight -= 1
+
+    async def run(self, fn, *args, **kwargs):
+        admitted = _admitted.get() is self
+        if not admitted:
+            self._check_capacity()
+        call = partial(fn, *args, **kwargs)
+        if self.kind == "inline":
+            return call()
+
+        self.start()
+        if admitted:
+            return await asyncio.get_running_loop().run_in_executor(self._pool, call)
+        self.in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._pool, call)
+        finally:
+            self.in_flight -= 1
+
+
+inference_executor = BoundedExecutor("inference", "thread", INFERENCE_WORKERS, INFERENCE_QUEUE_SIZE)
+drift_executor = BoundedExecutor("drift", DRIFT_EXECUTOR, DRIFT_WORKERS, DRIFT_QUEUE_SIZE)
+
+
+async def run_inference(fn, *args, **kwargs):
+    """Run parsing/scoring/logging work on the inference thread pool."""
+    return await inference_executor.run(fn, *args, **kwargs)
+
+
+async def run_drift(fn, *args, **kwargs):
+    """Run a drift computation on the drift pool (a process pool by default)."""
+    return await drift_executor.run(fn, *args, **kwargs)
+
+
+def start_executors():
+    inference_executor.start()
+    drift_executor.start()
+
+
+def shutdown_executors():
+    inference_executor.shutdown()
+    drift_executor.shutdown()
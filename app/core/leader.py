@@ -0,0 +1,130 @@
+# app/core/leader.py
+# File-lock leader election between the worker processes of one deployment
+import asyncio
+import os
+
+try:
+    import fcntl
+except ImportError:  # not POSIX: no multi-worker deployment, every process leads
+    fcntl = None
+
+from app.core.config import LEADER_LOCK_FILE, LEADER_RETRY_SECONDS
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass
+    return True
+
+
+class LeaderLock:
+    """
+    Exclusive, non-blocking flock on `path`. The kernel drops the lock when
+    the holding process exits, however it exits, so a follower can take over
+    on its next attempt without stale-lock cleanup.
+    """
+
+    def __init__(self, path: str = LEADER_LOCK_FILE):
+        self.path = path
+        self._fd = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._fd is not None
+
+    def try_acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is not None:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                os.close(fd)
+                return False
+        # holder's pid, for operators only
+        os.ftruncate(fd, 0)
+        os.write(fd, f"{os.getpid()}\n".encode())
+        self._fd = fd
+        return True
+
+    # ---- Worker registry (how many processes share this lock) ----
+    @property
+    def workers_dir(self) -> str:
+        return self.path + ".workers"
+
+    def register(self):
+        """Announce this worker with a pid file next to the lock (leaders and followers alike)."""
+        os.makedirs(self.workers_dir, exist_ok=True)
+        open(os.path.join(self.workers_dir, str(os.getpid())), "w").close()
+
+    def unregister(self):
+        try:
+            os.remove(os.path.join(self.workers_dir, str(os.getpid())))
+        except OSError:
+            pass
+
+    def worker_count(self) -> int:
+        """Registered workers that are still alive (at least 1: this one); stale pid files are removed."""
+        try:
+            names = os.listdir(self.workers_dir)
+        except OSError:
+            return 1
+        alive = 0
+        for name in names:
+            if not name.isdigit():
+                continue
+            if _pid_alive(int(name)):
+                alive += 1
+            else:
+                try:
+                    os.remove(os.path.join(self.workers_dir, name))
+                except OSError:
+                    pass
+        return max(alive, 1)
+
+    def holder_pid(self):
+        """Pid the current leader wrote into the lock file, or None."""
+        try:
+            with open(self.path, "r") as f:
+                return int(f.read().strip() or 0) or None
+        except (OSError, ValueError):
+            return None
+
+    def release(self):
+        if self._fd is not None:
+            fd, self._fd = self._fd, None
+            os.close(fd)  # closing the descriptor releases the flock
+
+
+leader_lock = LeaderLock()
+
+
+async def run_as_leader(jobs: list, lock: LeaderLock = leader_lock, retry_seconds: float = LEADER_RETRY_SECONDS):
+    """
+    Wait until this process holds the leader lock, then run `jobs` (coroutine
+    functions) until cancelled. Followers keep retrying, so another worker
+    takes the jobs over if the leader dies. Every worker registers itself
+    while it runs, so the leader knows whether it is alone (`worker_count`).
+    """
+    lock.register()
+    try:
+        while not lock.try_acquire():
+            await asyncio.sleep(retry_seconds)
+        print(f"Worker {os.getpid()} is the leader: running background jobs.")
+
+        tasks = [asyncio.create_task(job()) for job in jobs]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            lock.release()
+    finally:
+        lock.unregister()
@@ -0,0 +1,283 @@
+# app/core/metrics.py
+# In-process metrics in the Prometheus text format (served at /metrics)
+import bisect
+import math
+import threading
+import time
+
+# seconds; request phases are sub-millisecond to seconds
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# seconds; drift checks run from milliseconds (streaming) to a minute (Evidently on a large window)
+DRIFT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class _Shards:
+    """
+    Per-thread copies of a metric's state. Recording touches only the calling
+    thread's copy, so it takes no lock (one dict lookup after a thread's first
+    use); a scrape sums the copies.
+    """
+
+    def __init__(self, new):
+        self._new = new
+        self._shards = {}
+        self._lock = threading.Lock()  # only taken to add a thread's shard
+
+    def local(self):
+        ident = threading.get_ident()
+        shard = self._shards.get(ident)
+        if shard is None:
+            with self._lock:
+                shard = self._shards.setdefault(ident, self._new())
+        return shard
+
+    def all(self) -> list:
+        with self._lock:
+            return list(self._shards.values())
+
+
+class _Timer:
+    __slots__ = ("_observe", "_start")
+
+    def __init__(self, observe):
+        self._observe = observe
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._observe(time.perf_counter() - self._start)
+
+
+class _CounterChild:
+    def __init__(self):
+        self._shards = _Shards(lambda: [0.0])
+
+    def inc(self, amount: float = 1.0):
+        self._shards.local()[0] += amount
+
+    def value(self) -> float:
+        return sum(s[0] for s in self._shards.all())
+
+
+class _GaugeChild:
+    def __init__(self):
+        self._value = 0.0
+
+    def set(self, value: float):
+        self._value = float(value)  # a single assignment: no lock needed
+
+    def value(self) -> float:
+        return self._value
+
+
+class _HistogramChild:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        # [count per bucket (+Inf last)..., sum]
+        self._shards = _Shards(lambda: [0] * (len(buckets) + 1) + [0.0])
+
+    def observe(self, value: float):
+        shard = self._shards.local()
+        shard[bisect.bisect_left(self.buckets, value)] += 1
+        shard[-1] += value
+
+    def time(self) -> _Timer:
+        """Context manager that observes the elapsed seconds of its block."""
+        return _Timer(self.observe)
+
+    def totals(self):
+        counts = [0] * (len(self.buckets) + 1)
+        total_sum = 0.0
+        for shard in self._shards.all():
+            for i in range(len(counts)):
+                counts[i] += shard[i]
+            total_sum += shard[-1]
+        return counts, total_sum
+
+
+class Metric:
+    """
+    A named metric with optional label names. `labels(*values)` returns the
+    child for one label combination (cached; keep label values low-cardinality).
+    Unlabelled metrics record directly. `fn` makes a counter or gauge read
+    its value at scrape time instead, which costs nothing on the hot path.
+    """
+
+    kind = None
+
+    def __init__(self, name: str, documentation: str, labelnames=(), fn=None, **child_args):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.fn = fn
+        self._child_args = child_args
+        self._children = {}
+        self._lock = threading.Lock()
+        if not self.labelnames and fn is None:
+            self._default = self.labels()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            with self._lock:
+                child = self._children.setdefault(tuple(str(v) for v in values), self._new_child())
+                self._children[values] = child
+        return child
+
+    def _items(self):
+        with self._lock:
+            seen, items = set(), []
+            for values, child in self._children.items():
+                if id(child) not in seen:
+                    seen.add(id(child))
+                    items.append((tuple(str(v) for v in values), child))
+        return sorted(items, key=lambda item: item[0])
+
+    def _label_str(self, values, extra=()) -> str:
+        pairs = list(zip(self.labelnames, values)) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+    def samples(self) -> list:
+        if self.fn is not None:
+            return [(self.name, "", self.fn())]
+        return [(self.name, self._label_str(values), child.value()) for values, child in self._items()]
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for name, labels, value in self.samples():
+            lines.append(f"{name}{labels} {_format(value)}")
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self._default.inc(amount)
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float):
+        self._default.set(value)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames, buckets=tuple(sorted(buckets)))
+
+    def _new_child(self):
+        return _HistogramChild(**self._child_args)
+
+    def observe(self, value: float):
+        self._default.observe(value)
+
+    def time(self) -> _Timer:
+        return self._default.time()
+
+    def samples(self) -> list:
+        out = []
+        for values, child in self._items():
+            counts, total_sum = child.totals()
+            cumulative = 0
+            for bound, count in zip(list(child.buckets) + [math.inf], counts):
+                cumulative += count
+                out.append((f"{self.name}_bucket", self._label_str(values, [("le", _format(bound))]), cumulative))
+            out.append((f"{self.name}_sum", self._label_str(values), total_sum))
+            out.append((f"{self.name}_count", self._label_str(values), cumulative))
+        return out
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format(value) -> str:
+    if value is None or value != value:
+        return "NaN"
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing  # module reloads in tests
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames=(), fn=None) -> Counter:
+        return self.register(Counter(name, documentation, labelnames, fn=fn))
+
+    def gauge(self, name: str, documentation: str, labelnames=(), fn=None) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames, fn=fn))
+
+    def histogram(self, name: str, documentation: str, labelnames=(), buckets=LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def get(self, name: str):
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        blocks = []
+        for metric in metrics:
+            try:
+                blocks.append(metric.render())
+            except Exception as e:  # a failing callback must not break the scrape
+                print(f"Metrics error ({metric.name}):", e)
+        return "\n".join(blocks) + "\n"
+
+
+metrics = MetricsRegistry()
+
+# ---- Requests ----
+REQUEST_LATENCY = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route", "status"))
+PREDICT_PHASE = metrics.histogram(
+    "predict_phase_seconds", "Time in each phase of a prediction request (parse, inference, log_write, serialize)",
+    ("phase",))
+
+# ---- Model ----
+MODEL_SCORING = metrics.histogram(
+    "model_scoring_seconds", "Model scoring time per batch", ("model_version",))
+MODEL_ROWS = metrics.counter(
+    "model_scored_rows_total", "Rows scored by the model (rate() gives rows/sec)", ("model_version",))
+
+# ---- Drift ----
+DRIFT_PHASE = metrics.histogram(
+    "drift_phase_seconds",
+    "Time in each phase of a drift check (load_log, load_reference, compute, governance, publish, write_json; render_html on request)",
+    ("phase",), buckets=DRIFT_BUCKETS)
+DRIFT_CYCLE = metrics.histogram(
+    "drift_cycle_seconds", "Duration of a whole drift-loop cycle", buckets=DRIFT_BUCKETS)
+DRIFT_CYCLES_SKIPPED = metrics.counter(
+    "drift_cycles_skipped_total", "Drift-loop cycles skipped because too few new rows were logged")
@@ -0,0 +1,182 @@
+# app/core/profiling.py
+# On-demand profiling of requests and drift checks; nothing runs until armed
+import cProfile
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from app.core.config import PROFILE_DIR, PROFILE_INTERVAL_MS
+
+# "sampling": stack samples as collapsed stacks (.folded);
+# "cprofile": deterministic cProfile of the calling thread (.pstats)
+MODES = ("sampling", "cprofile")
+
+_sequence = itertools.count(1)
+
+
+def frame_label(code) -> str:
+    # ";" separates frames in the collapsed format
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ",")
+
+
+def collapse(frame) -> list:
+    """Labels of `frame` and its callers, outermost first."""
+    stack = []
+    while frame is not None:
+        stack.append(frame_label(frame.f_code))
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+class SamplingProfiler:
+    """
+    Samples the Python stacks of some threads every `interval_ms` from a
+    background thread and counts identical stacks, rooted at the thread name.
+    `threads` returns the idents to sample on each tick (default: the thread
+    that called `start`), so work handed to a pool can be followed too.
+    """
+
+    def __init__(self, interval_ms: float = PROFILE_INTERVAL_MS, threads=None):
+        self.interval = interval_ms / 1000.0
+        self.threads = threads
+        self.stacks = Counter()
+        self.samples = 0
+        self.elapsed = 0.0
+        self.path = None
+        self._started = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self.threads is None:
+            ident = threading.get_ident()
+            self.threads = lambda: (ident,)
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def sample(self):
+        frames = sys._current_frames()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident in self.threads():
+            frame = frames.get(ident)
+            if frame is not None:
+                self.stacks[";".join([names.get(ident, str(ident))] + collapse(frame))] += 1
+        self.samples += 1
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.elapsed = time.perf_counter() - self._started
+
+    def write(self, path: str) -> str:
+        """Collapsed stacks ("frame;frame;frame count" per line), most frequent first."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        self.path = path
+        return path
+
+
+def output_path(name: str, extension: str, directory: str = None) -> str:
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    return os.path.join(directory or PROFILE_DIR, f"{name}-{stamp}-{os.getpid()}-{next(_sequence)}{extension}")
+
+
+@contextmanager
+def sampling(name: str, threads=None, directory: str = None):
+    """Sample stacks while the block runs, then write them; yields the profiler."""
+    profiler = SamplingProfiler(threads=threads)
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        profiler.write(output_path(name, ".folded", directory))
+
+
+def run_profiled(name: str, mode: str, fn, *args, **kwargs):
+    """Call `fn` under the profiler of `mode` (on this thread); returns (result, output path)."""
+    if mode not in MODES:
+        raise ValueError(f"Unknown profiling mode {mode!r}, expected one of {list(MODES)}")
+    if mode == "cprofile":
+        profiler = cProfile.Profile()
+        path = output_path(name, ".pstats")
+        try:
+            result = profiler.runcall(fn, *args, **kwargs)
+        finally:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            profiler.dump_stats(path)
+        return result, path
+    with sampling(name) as profiler:
+        result = fn(*args, **kwargs)
+    return result, profiler.path
+
+
+class ProfileSchedule:
+    """
+    What to profile next: the next `requests` prediction requests and the
+    next `drift_cycles` drift checks. Every request asks `take_request`; while
+    nothing is armed that is a single attribute read.
+    """
+
+    def __init__(self, history: int = 50):
+        self.requests = 0
+        self.drift_cycles = 0
+        self.drift_mode = "sampling"
+        self.outputs = deque(maxlen=history)  # most recent output files
+        self._lock = threading.Lock()
+
+    def arm(self, requests: int = 0, drift_cycles: int = 0, drift_mode: str = "sampling"):
+        if drift_mode not in MODES:
+            raise ValueError(f"Unknown profiling mode {drift_mode!r}, expected one of {list(MODES)}")
+        with self._lock:
+            self.requests = max(0, requests)
+            self.drift_cycles = max(0, drift_cycles)
+            self.drift_mode = drift_mode
+
+    def take_request(self) -> bool:
+        if self.requests <= 0:
+            return False
+        with self._lock:
+            if self.requests <= 0:
+                return False
+            self.requests -= 1
+            return True
+
+    def take_drift_cycle(self):
+        """The mode to profile this drift cycle with, or None."""
+        if self.drift_cycles <= 0:
+            return None
+        with self._lock:
+            if self.drift_cycles <= 0:
+                return None
+            self.drift_cycles -= 1
+            return self.drift_mode
+
+    def record(self, path: str):
+        if path:
+            self.outputs.append(path)
+
+    def status(self) -> dict:
+        return {
+            "requests_remaining": self.requests,
+            "drift_cycles_remaining": self.drift_cycles,
+            "drift_mode": self.drift_mode,
+            "outputs": list(self.outputs),
+        }
+
+
+profile_schedule = ProfileSchedule()
@@ -0,0 +1,118 @@
+# app/inference/batcher.py
+
+# Dynamic micro-batching in front of Predictor.predict
+import asyncio
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import BATCH_MAX_ROWS, BATCH_MAX_WAIT_MS
+from app.core.executors import run_inference
+
+# Upper bounds of the batch-size histogram buckets (rows per scored batch)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, float("inf"))
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent predict calls into one vectorized Predictor.predict.
+    A batch is scored when it reaches `max_batch_rows` rows or when the oldest
+    pending request has waited `max_wait_ms`, whichever comes first; results
+    are then sliced back to each caller.
+    """
+
+    def __init__(self, predictor, max_batch_rows: int = BATCH_MAX_ROWS, max_wait_ms: float = BATCH_MAX_WAIT_MS):
+        self.predictor = predictor
+        self.max_batch_rows = max_batch_rows
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._pending = []  # (features df, future, queued_at)
+        self._pending_rows = 0
+        self._timer = None
+        self._tasks = set()  # scoring tasks in flight (asyncio only keeps weak references)
+
+        # stats
+        self.batches = 0
+        self.requests = 0
+        self.rows = 0
+        self.size_histogram = [0] * len(BATCH_SIZE_BUCKETS)
+        self.wait_seconds = 0.0
+
+    async def predict(self, df: pd.DataFrame):
+        """Same contract as Predictor.predict: returns (preds, probas) lists."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((df[self.predictor.features], future, time.perf_counter()))
+        self._pending_rows += len(df)
+
+        if self._pending_rows >= self.max_batch_rows:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending, self._pending_rows = self._pending, [], 0
+        if pending:
+            # time spent waiting for the batch to fill, not for it to be scored
+            now = time.perf_counter()
+            waited = sum(now - queued_at for _, _, queued_at in pending)
+            # score on the inference executor; the loop keeps collecting the next batch
+            task = asyncio.get_running_loop().create_task(self._score(pending, waited))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def drain(self):
+        """Score whatever is pending and wait for all batches in flight (shutdown)."""
+        self._flush()
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks))
+
+    async def _score(self, pending: list, waited: float):
+        frames = [p[0] for p in pending]
+        try:
+            X = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+            preds, probas = await run_inference(self.predictor.predict, X)
+        except Exception as e:
+            for _, future, _ in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        offsets = np.cumsum([0] + [len(f) for f in frames])
+        for (_, future, _), start, stop in zip(pending, offsets[:-1], offsets[1:]):
+            if not future.done():
+                future.set_result((preds[start:stop], probas[start:stop]))
+        self._record(len(pending), int(offsets[-1]), waited)
+
+    def _record(self, n_requests: int, n_rows: int, waited: float = 0.0):
+        self.batches += 1
+        self.wait_seconds += waited
+        self.requests += n_requests
+        self.rows += n_rows
+        for i, bound in enumerate(BATCH_SIZE_BUCKETS):
+            if n_rows <= bound:
+                self.size_histogram[i] += 1
+                break
+
+    def stats(self) -> dict:
+        batches = max(self.batches, 1)
+        return {
+            "max_batch_rows": self.max_batch_rows,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "batches": self.batches,
+            "requests": self.requests,
+            "rows": self.rows,
+            "mean_requests_per_batch": self.requests / batches,
+            "mean_rows_per_batch": self.rows / batches,
+            "mean_wait_ms": 1000.0 * self.wait_seconds / max(self.requests, 1),
+            "batch_rows_histogram": {
+                ("+Inf" if bound == float("inf") else str(bound)): count
+                for bound, count in zip(BATCH_SIZE_BUCKETS, self.size_histogram)
+            },
+        }
@@ -0,0 +1,67 @@
+# app/inference/chunked.py
+
+# Chunked CSV scoring for large uploads (bounded memory)
+import numpy as np
+import pandas as pd
+
+from app.core.config import STREAM_CHUNK_ROWS
+from app.inference.results import columns_to_records, dumps, result_columns
+from app.monitoring.streaming import record_predictions
+
+STREAM_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+class ChunkedCsvScorer:
+    """
+    Parses a CSV upload `chunk_rows` rows at a time and scores, logs and
+    serializes each chunk before reading the next, so peak memory depends on
+    the chunk size rather than the file size. `next_chunk` is blocking and is
+    meant to run on the inference executor, one call per response chunk.
+    """
+
+    def __init__(self, predictor, writer, fileobj, fmt: str = "ndjson", chunk_rows: int = STREAM_CHUNK_ROWS):
+        if fmt not in STREAM_FORMATS:
+            raise ValueError(f"Unknown stream format {fmt!r}, expected one of {sorted(STREAM_FORMATS)}")
+        self.predictor = predictor
+        self.writer = writer
+        self.fmt = fmt
+        self.media_type = STREAM_FORMATS[fmt]
+        self.rows = 0
+        self._reader = pd.read_csv(fileobj, chunksize=max(1, chunk_rows))
+        self._first = next(self._reader, None)
+
+    def missing_columns(self) -> set:
+        """Required features absent from the header (checked before streaming starts)."""
+        columns = self._first.columns if self._first is not None else []
+        return set(self.predictor.features) - set(columns)
+
+    def next_chunk(self):
+        """Serialized results of the next chunk, or None once the upload is exhausted."""
+        if self._first is not None:
+            chunk, self._first = self._first, None
+        else:
+            chunk = next(self._reader, None)
+        if chunk is None:
+            self._reader.close()
+            return None
+
+        X = np.ascontiguousarray(chunk[self.predictor.features].to_numpy(dtype=np.float64))
+        preds, probas = self.predictor.predict_matrix(X)
+        results = result_columns(preds, probas, start=self.rows)
+
+        # ---- Log the chunk (blocks on a full log queue rather than failing the upload) ----
+        target = chunk["target"].to_numpy(dtype=np.float64) if "target" in chunk.columns else None
+        log = self.writer.log
+        self.writer.submit(
+            log.from_arrays(X, preds, probas, results["risk_level"], self.predictor.model_version, target=target), wait=True
+        )
+        record_predictions(X, self.predictor.model_version)
+
+        header = self.rows == 0
+        self.rows += len(chunk)
+        if self.fmt == "csv":
+            return pd.DataFrame(results).to_csv(index=False, header=header).encode()
+        return b"".join(dumps(record) + b"\n" for record in columns_to_records(results))
@@ -0,0 +1,84 @@
+# app/inference/compiled.py
+
+# Sklearn-free scorer for linear (logistic regression) models
+import json
+import os
+
+import numpy as np
+
+ARTIFACT_FORMAT_VERSION = 1
+
+
+def sigmoid(z: np.ndarray) -> np.ndarray:
+    # numerically stable 1 / (1 + exp(-z))
+    return np.exp(-np.logaddexp(0.0, -z))
+
+
+class LinearScorer:
+    """
+    Logistic regression as plain arrays: P(y=1) = sigmoid(X @ coef + intercept).
+    Loaded from a small JSON artifact, so serving never imports sklearn.
+    """
+
+    def __init__(self, features: list, coef, intercept: float):
+        self.features = list(features)
+        self.coef = np.ascontiguousarray(coef, dtype=np.float64)
+        self.intercept = float(intercept)
+
+    @classmethod
+    def load(cls, path: str):
+        with open(path, "r") as f:
+            artifact = json.load(f)
+        if artifact.get("format_version") != ARTIFACT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported linear model artifact format in {path}")
+        return cls(artifact["features"], artifact["coef"], artifact["intercept"])
+
+    def decision_function(self, X: np.ndarray) -> np.ndarray:
+        return X @ self.coef + self.intercept
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Positive-class probability for a (n_rows, n_features) float64 matrix."""
+        return sigmoid(self.decision_function(X))
+
+
+class StackedLinearScorer:
+    """
+    Several linear models over the same features as one (n_features, n_models)
+    coefficient matrix, so scoring all of them is a single X @ W pass.
+    """
+
+    def __init__(self, scorers: list):
+        features = scorers[0].features
+        if any(s.features != features for s in scorers):
+            raise ValueError("Stacked linear models must share the same feature order")
+        self.features = list(features)
+        self.coef = np.ascontiguousarray(np.column_stack([s.coef for s in scorers]), dtype=np.float64)
+        self.intercept = np.array([s.intercept for s in scorers], dtype=np.float64)
+
+    def decision_function(self, X: np.ndarray) -> np.ndarray:
+        """(n_rows, n_models) logits, one column per model."""
+        return X @ self.coef + self.intercept
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        return sigmoid(self.decision_function(X))
+
+
+def export_linear_model(model, features: list, path: str):
+    """
+    Write coefficients, intercept and feature order of a fitted binary
+    LogisticRegression to a JSON artifact (called at train time).
+    """
+    if len(getattr(model, "classes_", [])) != 2:
+        raise ValueError("Only binary linear classifiers can be exported")
+
+    artifact = {
+        "format_version": ARTIFACT_FORMAT_VERSION,
+        "model_type": type(model).__name__,
+        "features": list(features),
+        "classes": [int(c) for c in model.classes_],
+        "coef": [float(c) for c in np.ravel(model.coef_)],
+        "intercept": float(np.ravel(model.intercept_)[0]),
+    }
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(artifact, f, indent=2)
@@ -2,21 +2,100 @@
 
 # model.predict wrapper
 import json
-import joblib
+import os
+import time
 import numpy as np
-from app.core.config import MODEL_PATH, FEATURES_PATH
+from app.core.metrics import MODEL_ROWS, MODEL_SCORING
+from app.core.config import (
+    MODELS_DIR,
+    MODEL_VERSION,
+    MODEL_FILENAME,
+    FEATURES_FILENAME,
+    LINEAR_MODEL_FILENAME,
+    SCORING_MODE,
+    MODEL_MMAP,
+)
+
+
+def model_paths(version: str, models_dir: str = MODELS_DIR) -> dict:
+    version_dir = os.path.join(models_dir, version)
+    return {
+        "model": os.path.join(version_dir, MODEL_FILENAME),
+        "features": os.path.join(version_dir, FEATURES_FILENAME),
+        "linear_model": os.path.join(version_dir, LINEAR_MODEL_FILENAME),
+    }
+
+
+class InvalidFeatureValues(ValueError):
+    """Rows with missing (NaN) or infinite feature values; they cannot be scored."""
+
+    def __init__(self, rows: list):
+        self.rows = rows
+        shown = ", ".join(map(str, rows[:10])) + (", ..." if len(rows) > 10 else "")
+        super().__init__(f"Missing or non-finite feature values in {len(rows)} row(s): {shown}")
+
+
+def check_finite(X: np.ndarray):
+    """Raise InvalidFeatureValues naming the rows (0-based) of X with NaN/inf features."""
+    finite = np.isfinite(X)
+    if not finite.all():
+        raise InvalidFeatureValues(np.flatnonzero(~finite.all(axis=1)).tolist())
 
 
 class Predictor:
-    def __init__(self):
-        self.model = joblib.load(MODEL_PATH)
-        with open(FEATURES_PATH, "r") as f:
+    def __init__(self, scoring_mode: str = SCORING_MODE, version: str = MODEL_VERSION, models_dir: str = MODELS_DIR):
+        paths = model_paths(version, models_dir)
+        with open(paths["features"], "r") as f:
             self.features = json.load(f)
 
-        self.model_version = "v1"
+        self.model = None
+        self.scorer = None
+        if scoring_mode == "compiled" and os.path.exists(paths["linear_model"]):
+            # Coefficients only: no joblib/sklearn import in the serving process
+            from app.inference.compiled import LinearScorer
+            self.scorer = LinearScorer.load(paths["linear_model"])
+            if self.scorer.features != self.features:
+                raise ValueError(f"{paths['linear_model']} feature order does not match {paths['features']}")
+        else:
+            if scoring_mode == "compiled":
+                print(f"Compiled scorer artifact not found ({paths['linear_model']}), falling back to sklearn.")
+            import joblib
+            # uncompressed joblib dumps map their arrays from the file (shared by all workers)
+            self.model = joblib.load(paths["model"], mmap_mode="r" if MODEL_MMAP else None)
 
-    def predict(self, df):
-        X = df[self.features]
-        probas = self.model.predict_proba(X)[:, 1]
+        self.scoring_mode = "compiled" if self.scorer is not None else "sklearn"
+        self.model_version = version
+        self.scoring_seconds = MODEL_SCORING.labels(version)
+        self.scored_rows = MODEL_ROWS.labels(version)
+
+    def observe_scoring(self, started: float, n_rows: int):
+        """Record one scored batch (started: time.perf_counter() before scoring)."""
+        self.scoring_seconds.observe(time.perf_counter() - started)
+        self.scored_rows.inc(n_rows)
+
+    def predict_matrix(self, X: np.ndarray):
+        """Score a (n_rows, n_features) float64 matrix in `self.features` order."""
+        # a NaN would score as a confident "No Default"; sklearn rejects it too
+        check_finite(X)
+        started = time.perf_counter()
+        if self.scorer is not None:
+            probas = self.scorer.predict_proba(X)
+        else:
+            import pandas as pd
+            probas = self.model.predict_proba(pd.DataFrame(X, columns=self.features))[:, 1]
         preds = (probas >= 0.5).astype(int)
+        self.observe_scoring(started, len(X))
+        return preds, probas
+
+    def predict(self, df):
+        if self.scorer is not None:
+            X = np.ascontiguousarray(df[self.features].to_numpy(dtype=np.float64))
+            preds, probas = self.predict_matrix(X)
+        else:
+            X = df[self.features]
+            check_finite(X.to_numpy(dtype=np.float64))
+            started = time.perf_counter()
+            probas = self.model.predict_proba(X)[:, 1]
+            preds = (probas >= 0.5).astype(int)
+            self.observe_scoring(started, len(X))
         return preds.tolist(), probas.tolist()
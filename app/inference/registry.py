@@ -0,0 +1,200 @@
+# app/inference/registry.py
+
+# Model versions on disk, loaded lazily, with an atomically swappable active one
+import asyncio
+import os
+import threading
+
+from app.core.config import (
+    MODELS_DIR,
+    MODEL_VERSION,
+    SCORING_MODE,
+    ACTIVE_MODEL_FILE,
+    MODEL_WATCH_SECONDS,
+    SHADOW_MODEL_VERSION,
+)
+from app.inference.predictor import Predictor, model_paths
+from app.inference.shadow import ShadowScorer
+
+
+class ModelRegistry:
+    """
+    Discovers version directories under `models_dir` and builds a Predictor
+    for a version on first use. `active` is a plain attribute read, so a
+    request takes the active Predictor once and keeps it for its whole
+    lifetime; `activate` loads the new version first and then swaps the
+    reference, so in-flight requests finish on the model they started with.
+    With a challenger set, `active` is a ShadowScorer wrapping the champion.
+    """
+
+    def __init__(self, models_dir: str = MODELS_DIR, default_version: str = MODEL_VERSION,
+                 scoring_mode: str = SCORING_MODE, shadow_version: str = SHADOW_MODEL_VERSION,
+                 active_file: str = ACTIVE_MODEL_FILE):
+        self.models_dir = models_dir
+        self.active_file = active_file
+        self.scoring_mode = scoring_mode
+        self._default_version = default_version
+        self._shadow_version = shadow_version
+        self._champion = None
+        self._challenger = None
+        self._active = None
+        self._loaded = {}
+        self._lock = threading.Lock()  # loading
+        # activate/set_challenger/close: admin calls and the ACTIVE-file watch
+        # run in different threads, and each swap must see the previous one
+        self._swap_lock = threading.Lock()
+
+    def versions(self) -> list:
+        """Version directories that hold a feature list and a model artifact."""
+        if not os.path.isdir(self.models_dir):
+            return []
+        found = []
+        for name in sorted(os.listdir(self.models_dir)):
+            paths = model_paths(name, self.models_dir)
+            if os.path.exists(paths["features"]) and (
+                    os.path.exists(paths["linear_model"]) or os.path.exists(paths["model"])):
+                found.append(name)
+        return found
+
+    def get(self, version: str) -> Predictor:
+        """Predictor for `version`, loaded on first use and kept for later swaps back."""
+        predictor = self._loaded.get(version)
+        if predictor is not None:
+            return predictor
+        with self._lock:
+            return self._loaded.get(version) or self._load(version)
+
+    def _ensure_started(self):
+        if self._active is None:
+            with self._lock:
+                if self._active is None:
+                    self._startup()
+
+    @property
+    def active(self):
+        """What requests score with: the champion Predictor, or its ShadowScorer."""
+        self._ensure_started()
+        return self._active
+
+    @property
+    def champion(self) -> Predictor:
+        self._ensure_started()
+        return self._champion
+
+    @property
+    def active_version(self) -> str:
+        return self.active.model_version
+
+    def _startup(self):
+        champion = self._loaded.get(self._default_version) or self._load(self._default_version)
+        challenger = None
+        if self._shadow_version and self._shadow_version != self._default_version:
+            try:
+                challenger = self._loaded.get(self._shadow_version) or self._load(self._shadow_version)
+            except Exception as e:
+                print(f"Shadow model {self._shadow_version} not loaded:", e)
+        self._swap(champion, challenger)
+
+    def _load(self, version: str) -> Predictor:
+        # caller holds self._lock
+        if version not in self.versions():
+            raise KeyError(f"Unknown model version {version!r} in {self.models_dir}")
+        self._loaded[version] = Predictor(self.scoring_mode, version, self.models_dir)
+        return self._loaded[version]
+
+    def _check_features(self, predictor: Predictor):
+        current = self.champion
+        if predictor.features != current.features:
+            raise ValueError(
+                f"Model {predictor.model_version} uses different features than {current.model_version}; "
+                "restart the service with MODEL_VERSION to switch"
+            )
+
+    def _swap(self, champion: Predictor, challenger):
+        # caller holds self._swap_lock (or self._lock at startup, before any swap)
+        previous = self._active
+        self._champion, self._challenger = champion, challenger
+        self._active = ShadowScorer(champion, challenger) if challenger is not None else champion
+        if isinstance(previous, ShadowScorer):
+            previous.close()
+
+    def activate(self, version: str) -> Predictor:
+        """
+        Load `version` and make it the active model. The prediction log has a
+        fixed feature schema, so a version with a different feature list needs
+        a restart (with MODEL_VERSION set) instead. Promoting the challenger
+        ends shadow scoring.
+        """
+        predictor = self.get(version)
+        self._ensure_started()
+        with self._swap_lock:
+            self._check_features(predictor)
+            challenger = self._challenger
+            if challenger is not None and challenger.model_version == version:
+                challenger = None
+            if predictor is not self._champion or challenger is not self._challenger:
+                self._swap(predictor, challenger)
+        return predictor
+
+    def set_challenger(self, version):
+        """Shadow-score traffic with `version` (None stops shadow scoring)."""
+        challenger = self.get(version) if version is not None else None
+        self._ensure_started()
+        with self._swap_lock:
+            if challenger is not None:
+                self._check_features(challenger)
+                if version == self._champion.model_version:
+                    raise ValueError(f"Model {version} is already the champion")
+            self._swap(self._champion, challenger)
+
+    def shadow_stats(self):
+        active = self.active
+        return active.stats() if isinstance(active, ShadowScorer) else None
+
+    def close(self):
+        """Stop shadow scoring (lifespan shutdown)."""
+        with self._swap_lock:
+            if isinstance(self._active, ShadowScorer):
+                self._active.close()
+                self._active.writer.close()
+
+    def status(self) -> dict:
+        return {
+            "active": self.active_version,
+            "challenger": self._challenger.model_version if self._challenger is not None else None,
+            "available": self.versions(),
+            "loaded": sorted(self._loaded),
+            "scoring_mode": self.active.scoring_mode,
+            "shadow": self.shadow_stats(),
+        }
+
+    # ---- File watch ----
+    def write_active_file(self, version: str):
+        """Record `version` in the ACTIVE file, so every worker (and a restart) follows it."""
+        tmp_path = self.active_file + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(version + "\n")
+        os.replace(tmp_path, self.active_file)
+
+    async def watch(self, path: str = None, interval_seconds: float = MODEL_WATCH_SECONDS):
+        """Activate the version named in `path` (the ACTIVE file) whenever it changes."""
+        path = path or self.active_file
+        last_mtime = None
+        while True:
+            try:
+                mtime = os.path.getmtime(path) if os.path.exists(path) else None
+                if mtime is not None and mtime != last_mtime:
+                    last_mtime = mtime
+                    with open(path, "r") as f:
+                        version = f.read().strip()
+                    # activate re-checks under the swap lock: an admin call may have won meanwhile
+                    if version and version != self.active_version:
+                        await asyncio.to_thread(self.activate, version)
+                        print(f"Model registry: activated {version} from {path}")
+            except Exception as e:
+                print("Model watch error:", e)
+
+            await asyncio.sleep(interval_seconds)
+
+
+model_registry = ModelRegistry()
@@ -0,0 +1,76 @@
+# app/inference/results.py
+
+# Vectorized prediction labels, risk bands and result serialization
+import numpy as np
+import orjson
+
+HIGH_RISK = 0.75
+MEDIUM_RISK = 0.5
+
+# object arrays: indexing reuses these str objects instead of creating one per row
+PREDICTION_LABELS = np.array(["No Default", "Default"], dtype=object)
+RISK_LEVELS = np.array(["Low", "Medium", "High"], dtype=object)
+
+RESULT_FIELDS = ("row", "probability", "prediction", "risk_level")
+LAYOUTS = ("records", "columns")
+
+
+def risk_levels(probas) -> np.ndarray:
+    """'Low' / 'Medium' (>= 0.5) / 'High' (>= 0.75) per probability."""
+    probas = np.asarray(probas, dtype=np.float64)
+    band = (probas >= MEDIUM_RISK).astype(np.intp) + (probas >= HIGH_RISK)
+    return RISK_LEVELS[band]
+
+
+def prediction_labels(preds) -> np.ndarray:
+    return PREDICTION_LABELS[np.asarray(preds, dtype=np.intp)]
+
+
+def result_columns(preds, probas, start: int = 0) -> dict:
+    """The per-row result fields as columns (row numbers start at `start`)."""
+    probas = np.asarray(probas, dtype=np.float64)
+    return {
+        "row": np.arange(start, start + len(probas)),
+        "probability": np.round(probas, 4),
+        "prediction": prediction_labels(preds),
+        "risk_level": risk_levels(probas),
+    }
+
+
+def columns_to_records(columns: dict) -> list:
+    """[{field: value, ...}, ...] from equal-length columns, in column order."""
+    names = list(columns)
+    values = [c.tolist() if isinstance(c, np.ndarray) else list(c) for c in columns.values()]
+    return [dict(zip(names, row)) for row in zip(*values)]
+
+
+def results_records(preds, probas) -> list:
+    cols = result_columns(preds, probas)
+    return [
+        {"row": i, "probability": p, "prediction": label, "risk_level": risk}
+        for i, p, label, risk in zip(
+            cols["row"].tolist(), cols["probability"].tolist(), cols["prediction"].tolist(), cols["risk_level"].tolist()
+        )
+    ]
+
+
+def dumps(obj) -> bytes:
+    """Compact JSON bytes; NumPy arrays and scalars are serialized natively."""
+    return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def results_json(preds, probas, layout: str = "records") -> bytes:
+    """
+    /predict JSON body: {"n_rows": n, "results": [...]}. The "columns" layout
+    returns results as {"row": [...], "probability": [...], ...} instead,
+    which skips building one dict per row.
+    """
+    if layout == "columns":
+        cols = result_columns(preds, probas)
+        cols["prediction"] = cols["prediction"].tolist()
+        cols["risk_level"] = cols["risk_level"].tolist()
+        return dumps({"n_rows": len(cols["row"]), "results": cols})
+    if layout != "records":
+        raise ValueError(f"Unknown results layout {layout!r}, expected one of {LAYOUTS}")
+    results = results_records(preds, probas)
+    return dumps({"n_rows": len(results), "results": results})
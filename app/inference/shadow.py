@@ -0,0 +1,166 @@
+# app/inference/shadow.py
+
+# Shadow scoring: a challenger model scores the same traffic as the champion
+import queue
+import threading
+import time
+
+import numpy as np
+
+from app.core.config import SHADOW_QUEUE_BATCHES
+from app.core.executors import QueueFullError
+from app.inference.compiled import StackedLinearScorer, sigmoid
+from app.inference.predictor import check_finite
+from app.inference.results import risk_levels
+from app.monitoring.drift_engine import psi
+from app.monitoring.log_writer import get_shadow_writer
+
+SCORE_BINS = np.linspace(0.0, 1.0, 11)
+
+
+class ShadowComparison:
+    """Running champion/challenger agreement and score-distribution shift."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.n_rows = 0
+        self.agreements = 0
+        self.abs_diff_sum = 0.0
+        self.champion_hist = np.zeros(len(SCORE_BINS) - 1, dtype=np.int64)
+        self.challenger_hist = np.zeros(len(SCORE_BINS) - 1, dtype=np.int64)
+
+    def update(self, champion_probas: np.ndarray, challenger_probas: np.ndarray):
+        agree = int(np.count_nonzero((champion_probas >= 0.5) == (challenger_probas >= 0.5)))
+        abs_diff = float(np.abs(champion_probas - challenger_probas).sum())
+        champion_hist = np.histogram(champion_probas, SCORE_BINS)[0]
+        challenger_hist = np.histogram(challenger_probas, SCORE_BINS)[0]
+        with self._lock:
+            self.n_rows += len(champion_probas)
+            self.agreements += agree
+            self.abs_diff_sum += abs_diff
+            self.champion_hist += champion_hist
+            self.challenger_hist += challenger_hist
+
+    def stats(self) -> dict:
+        with self._lock:
+            if self.n_rows == 0:
+                return {"n_rows": 0, "agreement": None, "mean_abs_diff": None, "score_psi": None}
+            return {
+                "n_rows": self.n_rows,
+                "agreement": round(self.agreements / self.n_rows, 4),
+                "mean_abs_diff": round(self.abs_diff_sum / self.n_rows, 4),
+                "score_psi": round(psi(self.champion_hist / self.n_rows, self.challenger_hist / self.n_rows), 4),
+            }
+
+
+class ShadowScorer:
+    """
+    Drop-in for a Predictor that also scores every batch with a challenger.
+    Callers only get the champion's output. When both models are compiled
+    linear scorers they are fused into one stacked coefficient matrix, so the
+    challenger costs an extra column in the same matmul and its sigmoid is
+    left to a background thread; otherwise the challenger scores entirely on
+    that thread. Comparison and challenger logging always happen there too,
+    off the request path.
+    """
+
+    def __init__(self, champion, challenger, queue_batches: int = SHADOW_QUEUE_BATCHES):
+        if challenger.features != champion.features:
+            raise ValueError(f"Challenger {challenger.model_version} uses different features than "
+                             f"{champion.model_version}")
+        self.champion = champion
+        self.challenger = challenger
+        self.features = champion.features
+        self.model_version = champion.model_version
+        self.scoring_mode = champion.scoring_mode
+        self.stacked = None
+        if champion.scorer is not None and challenger.scorer is not None:
+            self.stacked = StackedLinearScorer([champion.scorer, challenger.scorer])
+
+        self.comparison = ShadowComparison()
+        self.writer = get_shadow_writer(self.features)
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max(1, queue_batches))
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="shadow-scorer", daemon=True)
+        self._thread.start()
+        self.writer.start()
+
+    # ---- Request path ----
+    def predict_matrix(self, X: np.ndarray):
+        if self.stacked is not None:
+            check_finite(X)
+            started = time.perf_counter()
+            z = self.stacked.decision_function(X)
+            champion_probas, challenger_logits = sigmoid(z[:, 0]), z[:, 1]
+            self.champion.observe_scoring(started, len(X))
+        else:
+            _, champion_probas = self.champion.predict_matrix(X)
+            challenger_logits = None
+        self._offer(X, champion_probas, challenger_logits)
+        return (champion_probas >= 0.5).astype(int), champion_probas
+
+    def predict(self, df):
+        X = np.ascontiguousarray(df[self.features].to_numpy(dtype=np.float64))
+        if self.stacked is not None:
+            preds, probas = self.predict_matrix(X)
+            return preds.tolist(), probas.tolist()
+        preds, probas = self.champion.predict(df)
+        self._offer(X, np.asarray(probas, dtype=np.float64), None)
+        return preds, probas
+
+    def _offer(self, X, champion_probas, challenger_logits):
+        if self._closed:
+            return
+        try:
+            self._queue.put_nowait((X, champion_probas, challenger_logits))
+        except queue.Full:
+            self.dropped += 1
+
+    # ---- Background thread ----
+    def _record(self, X, champion_probas, challenger_logits):
+        if challenger_logits is None:
+            _, challenger_probas = self.challenger.predict_matrix(X)
+        else:
+            challenger_probas = sigmoid(challenger_logits)
+        self.comparison.update(champion_probas, challenger_probas)
+        preds = (challenger_probas >= 0.5).astype(int)
+        try:
+            self.writer.submit(self.writer.log.from_arrays(
+                X, preds, challenger_probas, risk_levels(challenger_probas), self.challenger.model_version
+            ))
+        except QueueFullError:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._record(*item)
+            except Exception as e:
+                print("Shadow scoring error:", e)
+            finally:
+                self._queue.task_done()
+
+    def join(self):
+        """Wait until every offered batch has been compared (tests, shutdown)."""
+        self._queue.join()
+
+    def close(self):
+        """Finish queued comparisons and stop the thread; later offers are ignored."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+    def stats(self) -> dict:
+        return {
+            "champion": self.champion.model_version,
+            "challenger": self.challenger.model_version,
+            "fused": self.stacked is not None,
+            "dropped_batches": self.dropped,
+            **self.comparison.stats(),
+        }
@@ -2,21 +2,27 @@
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 import asyncio
+import io
 import os
 import pandas as pd
 import random
-import json
-from datetime import datetime
-
-from app.api.routes import router
-from app.api.dashboard_data import router as dashboard_data_router
-from app.inference.predictor import Predictor
-from app.monitoring.drift import run_drift_check
-from app.core.logging import init_db
+import time
+
+from app.api.routes import drain_batchers, router
+from app.api.dashboard_data import router as dashboard_data_router, dashboard_snapshot
+from app.api.admin import router as admin_router
+from app.api.metrics import MetricsMiddleware, router as metrics_router
+from app.api.reports import router as reports_router
+from app.api import background_drift
+from app.core.executors import run_inference, start_executors, shutdown_executors
+from app.core.leader import run_as_leader
+from app.inference.registry import model_registry
+from app.inference.results import results_json, risk_levels
+from app.monitoring.streaming import STREAMING_ENABLED, get_drift_state, record_predictions
+from app.monitoring.log_writer import get_prediction_writer
+from app.core.config import MODEL_WATCH_SECONDS
 
 # ---- Constants ----
-PROD_LOG_PATH = "data/production/predictions_log.csv"
-REFERENCE_PATH = "models/v1/reference_data.csv"
 DASHBOARD_JSON = "reports/evidently/drift_report.json"
 SOURCE_DATA = "data/processed/current_data.csv"
 
@@ -29,10 +35,45 @@ MAX_BATCH = 5
 MAX_DRIFT_ROWS = 9000
 MAX_DISPLAY = 101  # last N predictions for dashboard
 
-predictor = Predictor()
-os.makedirs(os.path.dirname(DASHBOARD_JSON), exist_ok=True)
+
+# ---- Startup (once, from the lifespan; importing this module has no side effects) ----
+def warm_up(predictor):
+    """
+    One throwaway prediction through the request-path code (CSV parsing,
+    scoring, result serialization) so the first real request does not pay
+    for lazy imports and first-call setup. Nothing is logged.
+    """
+    csv = ",".join(predictor.features) + "\n" + ",".join("0" for _ in predictor.features) + "\n"
+    df = pd.read_csv(io.StringIO(csv))
+    preds, probas = predictor.predict(df)
+    results_json(preds, probas)
+
+
+def initialize():
+    """Load the active model, open the prediction log (and seed streaming drift) and warm up (blocking)."""
+    os.makedirs(os.path.dirname(DASHBOARD_JSON), exist_ok=True)
+    predictor = model_registry.champion
+    get_prediction_writer(predictor.features).start()
+    if STREAMING_ENABLED:
+        # seed the accumulator from the log before the first prediction updates it
+        get_drift_state(predictor.model_version)
+    warm_up(predictor)
+
 
 # ---- Traffic daemon in-process (no HTTP call) ----
+def score_sample(sample: pd.DataFrame):
+    predictor = model_registry.active
+    preds, probas = predictor.predict(sample)
+    df_log = sample.copy()
+    df_log["model_prediction"] = preds
+    df_log["model_probability"] = probas
+    df_log["model_risk_level"] = risk_levels(probas)
+    df_log["model_version"] = predictor.model_version
+    df_log["timestamp"] = pd.Timestamp.utcnow()
+    get_prediction_writer(predictor.features).submit(df_log)
+    record_predictions(sample, predictor.model_version)
+
+
 async def traffic_loop():
     await asyncio.sleep(STARTUP_DELAY)
     if not os.path.exists(SOURCE_DATA):
@@ -47,17 +88,7 @@ async def traffic_loop():
             batch_size = random.randint(MIN_BATCH, MAX_BATCH)
             sample = df_source.sample(batch_size)
             # In-process prediction instead of requests.post
-            preds, probas = predictor.predict(sample)
-            df_log = sample.copy()
-            df_log["model_prediction"] = preds
-            df_log["model_probability"] = probas
-            df_log["model_risk_level"] = [
-                "High" if p >= 0.75 else "Medium" if p >= 0.5 else "Low"
-                for p in probas
-            ]
-            df_log["model_version"] = predictor.model_version
-            df_log["timestamp"] = pd.Timestamp.utcnow()
-            df_log.to_csv(PROD_LOG_PATH, mode="a", header=not os.path.exists(PROD_LOG_PATH), index=False)
+            await run_inference(score_sample, sample)
 
         except Exception as e:
             print("Traffic daemon error:", e)
@@ -67,64 +98,7 @@ async def traffic_loop():
 
 # ---- Drift loop ----
 async def drift_loop(interval_seconds: int = 10):
-    while True:
-        try:
-            if not os.path.exists(PROD_LOG_PATH):
-                await asyncio.sleep(interval_seconds)
-                continue
-
-            prod_df = pd.read_csv(PROD_LOG_PATH)
-            if len(prod_df) > MAX_DRIFT_ROWS:
-                prod_df = prod_df.tail(MAX_DRIFT_ROWS)
-                prod_df.to_csv(PROD_LOG_PATH, index=False)
-
-            missing_features = set(predictor.features) - set(prod_df.columns)
-            if missing_features:
-                await asyncio.sleep(interval_seconds)
-                continue
-
-            prod_df = prod_df.dropna(subset=predictor.features)
-            if prod_df.empty:
-                await asyncio.sleep(interval_seconds)
-                continue
-
-            reference_df = pd.read_csv(REFERENCE_PATH)
-            _, drift_dict = run_drift_check(
-                prod_df[predictor.features],
-                reference_df[predictor.features],
-                model_version="v1"
-            )
-
-            # Prepare last N predictions for dashboard
-            results = []
-            log_cols = ["model_prediction", "model_probability", "model_risk_level"]
-            if all(c in prod_df.columns for c in log_cols):
-                for i, row in prod_df.tail(MAX_DISPLAY).iterrows():
-                    results.append({
-                        "row": i,
-                        "prediction": "Default" if row["model_prediction"] == 1 else "No Default",
-                        "probability": round(float(row["model_probability"]), 4),
-                        "risk_level": row.get("model_risk_level", "Unknown")
-                    })
-
-            dashboard_payload = {
-                "n_rows": len(prod_df),
-                "results": results,
-                "drift": [
-                    {"column": col, "score": float(score)}
-                    for col, score in drift_dict.items()
-                ],
-            }
-
-            tmp_path = DASHBOARD_JSON + ".tmp"
-            with open(tmp_path, "w") as f:
-                json.dump(dashboard_payload, f, indent=2)
-            os.replace(tmp_path, DASHBOARD_JSON)
-
-        except Exception as e:
-            print("Drift loop error:", e)
-
-        await asyncio.sleep(interval_seconds)
+    await background_drift.drift_loop(interval_seconds, max_rows=MAX_DRIFT_ROWS, max_display=MAX_DISPLAY)
 
 
 # ---- HF-compatible lifespan ----
@@ -132,22 +106,45 @@ from contextlib import asynccontextmanager
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    started = time.perf_counter()
+    app.state.ready = False
+    await asyncio.to_thread(initialize)
+    start_executors()
+    # with several workers only the leader runs the traffic and drift loops;
+    # every worker follows the published dashboard and the ACTIVE model file
     tasks = [
-        asyncio.create_task(traffic_loop()),
-        asyncio.create_task(drift_loop(10))
+        asyncio.create_task(run_as_leader([traffic_loop, lambda: drift_loop(10)])),
+        asyncio.create_task(dashboard_snapshot.follow()),
     ]
+    if MODEL_WATCH_SECONDS > 0:
+        tasks.append(asyncio.create_task(model_registry.watch(interval_seconds=MODEL_WATCH_SECONDS)))
+    app.state.startup_seconds = round(time.perf_counter() - started, 3)
+    app.state.ready = True
     yield
+    app.state.ready = False
     for t in tasks:
         t.cancel()
         try:
             await t
         except asyncio.CancelledError:
             pass
+    await drain_batchers()
+    shutdown_executors()
+    model_registry.close()
+    # flush queued predictions, then seal the active segment
+    prediction_writer = get_prediction_writer(model_registry.champion.features)
+    prediction_writer.close()
+    prediction_writer.log.rotate()
 
 
 # ---- FastAPI app ----
 app = FastAPI(title="ML Inference Service", lifespan=lifespan)
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
+# registered before the /reports mount, which serves every other file under reports/
+app.include_router(reports_router)
 app.mount("/reports", StaticFiles(directory="reports"), name="reports")
 app.include_router(router)
 app.include_router(dashboard_data_router)
+app.include_router(admin_router)
+app.include_router(metrics_router)
+app.add_middleware(MetricsMiddleware)
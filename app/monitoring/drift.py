@@ -1,11 +1,12 @@
 # app/monitoring/drift.py
 import os
+import time
 import pandas as pd
-from evidently.report import Report
-from evidently.metric_preset import DataDriftPreset
 from app.monitoring.governance import Governance
+from app.monitoring.drift_engine import compute_drift, compute_drift_from_profile
+from app.monitoring.reference_profile import ReferenceProfile, load_reference_profile
+from app.core.config import DRIFT_BACKEND
 
-REFERENCE_DATA_PATH = "models/v1/reference_data.csv"
 REPORT_DIR = "reports/evidently"
 REPORT_PATH = os.path.join(REPORT_DIR, "drift_report.html")
 
@@ -19,20 +20,65 @@ thresholds = {
 governance = Governance(thresholds=thresholds)
 
 
-def run_drift_check(current_data: pd.DataFrame, reference_data: pd.DataFrame, model_version="v1"):
-    """
-    Run Evidently DataDriftPreset on current vs reference data,
-    save HTML report, and run governance checks.
-    Returns a tuple: (alerts, drift_scores)
-    """
-    os.makedirs(REPORT_DIR, exist_ok=True)
+# Last Evidently report computed in this process, so rendering its HTML on
+# request does not rerun it (see render_report_html)
+_last_report = None
+
+
+def _evidently_report(current_data: pd.DataFrame, reference_data) -> dict:
+    """Run Evidently DataDriftPreset and return `as_dict()` (the HTML is rendered on request)."""
+    global _last_report
+    # Imported here: Evidently pulls in sklearn and plotly
+    from evidently.report import Report
+    from evidently.metric_preset import DataDriftPreset
+
+    if isinstance(reference_data, ReferenceProfile):
+        reference_data = reference_data.to_frame()
 
     report = Report(metrics=[DataDriftPreset()])
     report.run(current_data=current_data, reference_data=reference_data)
-    report.save_html(REPORT_PATH)
+    _last_report = (current_data, report)
+
+    return report.as_dict() if hasattr(report, "as_dict") else {}
+
+
+def render_report_html(current_data: pd.DataFrame, model_version: str, path: str) -> str:
+    """
+    Write the Evidently HTML report of `current_data` against the reference
+    of `model_version` to `path`. Drift-executor entry point: reuses the
+    report of the last drift check when it ran on the same window.
+    """
+    if _last_report is not None and _last_report[0].equals(current_data):
+        report = _last_report[1]
+    else:
+        from evidently.report import Report
+        from evidently.metric_preset import DataDriftPreset
+
+        report = Report(metrics=[DataDriftPreset()])
+        report.run(current_data=current_data, reference_data=load_reference_profile(model_version).to_frame())
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    report.save_html(tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+
+def _native_report(current_data: pd.DataFrame, reference_data) -> dict:
+    """Compute the same per-column drift with the NumPy/SciPy engine (no HTML)."""
+    if isinstance(reference_data, ReferenceProfile):
+        return compute_drift_from_profile(current_data, reference_data)
+    return compute_drift(current_data, reference_data)
+
+
+DRIFT_BACKENDS = {
+    "evidently": _evidently_report,
+    "native": _native_report,
+}
+
 
-    # Extract numeric drift scores per column
-    report_dict = report.as_dict() if hasattr(report, "as_dict") else {}
+def extract_drift_scores(report_dict: dict) -> dict:
+    """Pull numeric drift scores per column out of a report dict."""
     drift_scores = {}
 
     metrics_list = report_dict.get("metrics", [])
@@ -51,7 +97,71 @@ def run_drift_check(current_data: pd.DataFrame, reference_data: pd.DataFrame, mo
         elif metric.get("metric") == "DatasetDriftMetric":
             drift_scores["dataset"] = float(result.get("share_of_drifted_columns", 0.0))
 
+    return drift_scores
+
+
+def run_drift_check(current_data: pd.DataFrame, reference_data, model_version="v1", backend=None,
+                    timings: dict = None):
+    """
+    Run drift detection on current vs reference data with the configured
+    backend, then run governance checks.
+    `reference_data` is a DataFrame or a precomputed ReferenceProfile.
+    If `timings` is given, seconds per phase (compute, governance) are added to it.
+    Returns a tuple: (alerts, drift_scores)
+    """
+    backend = backend or DRIFT_BACKEND
+    if backend not in DRIFT_BACKENDS:
+        raise ValueError(f"Unknown drift backend: {backend!r} (expected one of {sorted(DRIFT_BACKENDS)})")
+    timings = {} if timings is None else timings
+
+    started = time.perf_counter()
+    report_dict = DRIFT_BACKENDS[backend](current_data, reference_data)
+    drift_scores = extract_drift_scores(report_dict)
+    timings["compute"] = time.perf_counter() - started
+
     # Run governance checks (keeps existing alerts)
+    started = time.perf_counter()
     alerts = governance.check_metrics(report_dict, model_version=model_version)
+    timings["governance"] = time.perf_counter() - started
 
     return alerts, drift_scores
+
+
+def run_streaming_drift_check(state, model_version="v1", timings: dict = None):
+    """
+    Drift from a StreamingDriftState snapshot (no production data is read),
+    followed by the same governance checks.
+    Returns a tuple: (alerts, drift_scores)
+    """
+    timings = {} if timings is None else timings
+    started = time.perf_counter()
+    report_dict = state.snapshot()
+    drift_scores = extract_drift_scores(report_dict)
+    timings["compute"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    alerts = governance.check_metrics(report_dict, model_version=model_version)
+    timings["governance"] = time.perf_counter() - started
+    return alerts, drift_scores
+
+
+def drift_job(current_data: pd.DataFrame, model_version="v1", backend=None, profile=None):
+    """
+    Drift-executor entry point: the worker loads (and memoizes) the reference
+    profile itself, so only the production window is sent to it.
+    Returns (alerts, drift_scores, timings); the timings travel back with the
+    result because the job may run in another process. With `profile` (a
+    profiling mode) the drift check is profiled in the worker and the output
+    file is returned as timings["profile_output"].
+    """
+    started = time.perf_counter()
+    reference = load_reference_profile(model_version)
+    timings = {"load_reference": time.perf_counter() - started}
+    if profile is None:
+        alerts, drift_scores = run_drift_check(current_data, reference, model_version, backend, timings)
+    else:
+        from app.core.profiling import run_profiled
+        (alerts, drift_scores), timings["profile_output"] = run_profiled(
+            "drift", profile, run_drift_check, current_data, reference, model_version, backend, timings
+        )
+    return alerts, drift_scores, timings
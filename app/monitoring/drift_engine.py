@@ -0,0 +1,271 @@
+# app/monitoring/drift_engine.py
+# Native NumPy/SciPy drift engine (alternative to Evidently)
+import numpy as np
+import pandas as pd
+
+# scipy.stats / scipy.spatial are imported lazily inside the statistical-test
+# functions that use them: they take most of a second to import
+
+# Same defaults as Evidently's DataDriftPreset
+DRIFT_SHARE = 0.5
+DISTANCE_THRESHOLD = 0.1
+P_VALUE_THRESHOLD = 0.05
+LARGE_REFERENCE_ROWS = 1000
+MAX_CATEGORIES = 5
+MAX_DISCRETE_VALUES = 20
+
+TARGET_COLUMN = "target"
+
+STATTEST_NAMES = {
+    "wasserstein": "Wasserstein distance (normed)",
+    "jensenshannon": "Jensen-Shannon distance",
+    "ks": "K-S p_value",
+    "chisquare": "chi-square p_value",
+    "z": "Z-test p_value",
+}
+
+
+class Distribution:
+    """
+    Compressed 1-D sample: sorted unique values and their counts.
+    Every metric below is exact on this form, so callers can keep a
+    summary instead of the raw rows.
+    """
+
+    def __init__(self, values, counts):
+        self.values = np.asarray(values, dtype=np.float64)
+        self.counts = np.asarray(counts, dtype=np.float64)
+        self.n = float(self.counts.sum())
+
+    @classmethod
+    def from_array(cls, data):
+        data = np.asarray(data, dtype=np.float64)
+        data = data[~np.isnan(data)]
+        values, counts = np.unique(data, return_counts=True)
+        return cls(values, counts)
+
+    @property
+    def n_unique(self):
+        return int(len(self.values))
+
+    def mean(self):
+        return float(np.dot(self.values, self.counts) / self.n)
+
+    def std(self):
+        mean = self.mean()
+        return float(np.sqrt(np.dot((self.values - mean) ** 2, self.counts) / self.n))
+
+    def expand(self):
+        """Back to a raw (sorted) sample."""
+        return np.repeat(self.values, self.counts.astype(np.int64))
+
+    def cdf(self, points):
+        """Empirical CDF evaluated at `points` (right-continuous)."""
+        cum = np.concatenate(([0.0], np.cumsum(self.counts))) / self.n
+        return cum[np.searchsorted(self.values, points, side="right")]
+
+
+# ---- Binning ----
+def binned_percents(reference: Distribution, current: Distribution, numerical: bool = True):
+    """
+    Bucket both samples the way Evidently does: Sturges bins over the pooled
+    range for numerical columns with many values, one bucket per value otherwise.
+    """
+    if numerical and reference.n_unique > MAX_DISCRETE_VALUES:
+        lo = min(reference.values[0], current.values[0])
+        hi = max(reference.values[-1], current.values[-1])
+        n_edges = int(np.ceil(np.log2(reference.n + current.n) + 1))
+        bins = np.histogram_bin_edges([lo, hi], bins=n_edges)
+        ref_counts = np.histogram(reference.values, bins, weights=reference.counts)[0]
+        cur_counts = np.histogram(current.values, bins, weights=current.counts)[0]
+    else:
+        keys = np.union1d(reference.values, current.values)
+        ref_counts = np.zeros(len(keys))
+        cur_counts = np.zeros(len(keys))
+        ref_counts[np.searchsorted(keys, reference.values)] = reference.counts
+        cur_counts[np.searchsorted(keys, current.values)] = current.counts
+    return ref_counts / reference.n, cur_counts / current.n
+
+
+def _fill_zeroes(percents):
+    percents = percents.copy()
+    nonzero_min = percents[percents != 0].min()
+    percents[percents == 0] = nonzero_min / 10**6 if nonzero_min <= 0.0001 else 0.0001
+    return percents
+
+
+# ---- Metrics ----
+def psi(ref_percents, cur_percents) -> float:
+    """Population Stability Index over matching buckets."""
+    ref_percents = _fill_zeroes(np.asarray(ref_percents, dtype=np.float64))
+    cur_percents = _fill_zeroes(np.asarray(cur_percents, dtype=np.float64))
+    return float(np.sum((ref_percents - cur_percents) * np.log(ref_percents / cur_percents)))
+
+
+def jensen_shannon(ref_percents, cur_percents) -> float:
+    """Jensen-Shannon distance (natural log) over matching buckets."""
+    from scipy.spatial import distance
+    return float(distance.jensenshannon(ref_percents, cur_percents))
+
+
+def ks_statistic(reference: Distribution, current: Distribution) -> float:
+    """Two-sample Kolmogorov-Smirnov statistic (max CDF gap)."""
+    points = np.union1d(reference.values, current.values)
+    return float(np.max(np.abs(reference.cdf(points) - current.cdf(points))))
+
+
+def ks_p_value(reference: Distribution, current: Distribution) -> float:
+    # Only selected for small references, so expanding back to raw rows is cheap
+    from scipy import stats
+    return float(stats.ks_2samp(reference.expand(), current.expand())[1])
+
+
+def wasserstein_distance(u_values, v_values, u_weights=None, v_weights=None) -> float:
+    from scipy import stats
+    return float(stats.wasserstein_distance(u_values, v_values, u_weights, v_weights))
+
+
+def wasserstein_norm(reference: Distribution, current: Distribution) -> float:
+    """First Wasserstein distance normed by the reference standard deviation."""
+    norm = max(reference.std(), 0.001)
+    wd = wasserstein_distance(reference.values, current.values, reference.counts, current.counts)
+    return float(wd / norm)
+
+
+def chisquare_p_value(reference: Distribution, current: Distribution) -> float:
+    from scipy import stats
+    ref_percents, cur_percents = binned_percents(reference, current, numerical=False)
+    return float(stats.chisquare(cur_percents * current.n, ref_percents * current.n)[1])
+
+
+def z_p_value(reference: Distribution, current: Distribution) -> float:
+    keys = np.union1d(reference.values, current.values)
+    if len(keys) == 1:
+        return 1.0
+    # share of rows that are not the first key
+    p1 = 1.0 - reference.counts[reference.values == keys[0]].sum() / reference.n
+    p2 = 1.0 - current.counts[current.values == keys[0]].sum() / current.n
+    pooled = (p1 * reference.n + p2 * current.n) / (reference.n + current.n)
+    z = (p1 - p2) / np.sqrt(pooled * (1 - pooled) * (1.0 / reference.n + 1.0 / current.n))
+    from scipy import stats
+    return float(2 * (1 - stats.norm.cdf(np.abs(z))))
+
+
+# ---- Column / dataset drift ----
+def select_stattest(reference: Distribution, current: Distribution, column_type: str) -> str:
+    """Evidently's default stattest choice for a column."""
+    n_values = len(np.union1d(reference.values, current.values))
+    if reference.n > LARGE_REFERENCE_ROWS:
+        if column_type == "num" and n_values > MAX_CATEGORIES:
+            return "wasserstein"
+        return "jensenshannon"
+    if column_type == "num" and n_values > MAX_CATEGORIES:
+        return "ks"
+    return "chisquare" if n_values > 2 else "z"
+
+
+def column_drift(column: str, reference: Distribution, current: Distribution, column_type: str = "num") -> dict:
+    """
+    Drift of one column: the Evidently-compatible drift_score plus PSI, KS,
+    Wasserstein and Jensen-Shannon computed side by side.
+    """
+    numerical = column_type == "num"
+    ref_percents, cur_percents = binned_percents(reference, current, numerical)
+    metrics = {
+        "psi": psi(ref_percents, cur_percents),
+        "jensenshannon": jensen_shannon(ref_percents, cur_percents),
+        "ks": ks_statistic(reference, current),
+        "wasserstein": wasserstein_norm(reference, current),
+    }
+
+    stattest = select_stattest(reference, current, column_type)
+    if stattest in ("wasserstein", "jensenshannon"):
+        score = metrics[stattest]
+        threshold = DISTANCE_THRESHOLD
+        detected = score >= threshold
+    else:
+        if stattest == "ks":
+            score = ks_p_value(reference, current)
+        elif stattest == "chisquare":
+            score = chisquare_p_value(reference, current)
+        else:
+            score = z_p_value(reference, current)
+        threshold = P_VALUE_THRESHOLD
+        detected = score <= threshold if stattest == "ks" else score < threshold
+
+    return {
+        "column_name": column,
+        "column_type": column_type,
+        "stattest_name": STATTEST_NAMES[stattest],
+        "stattest_threshold": threshold,
+        "drift_score": score,
+        "drift_detected": bool(detected),
+        "metrics": metrics,
+    }
+
+
+def column_type_of(column: str, series: pd.Series) -> str:
+    if column == TARGET_COLUMN or not pd.api.types.is_numeric_dtype(series):
+        return "cat"
+    return "num"
+
+
+def build_report_dict(drift_by_columns: dict, drift_share: float = DRIFT_SHARE) -> dict:
+    """Wrap per-column results in the `Report.as_dict()` layout Governance reads."""
+    n_columns = len(drift_by_columns)
+    n_drifted = sum(1 for info in drift_by_columns.values() if info["drift_detected"])
+    share = n_drifted / n_columns if n_columns else 0.0
+    dataset = {
+        "number_of_columns": n_columns,
+        "number_of_drifted_columns": n_drifted,
+        "share_of_drifted_columns": share,
+        "dataset_drift": share >= drift_share if n_columns else False,
+    }
+    return {
+        "metrics": [
+            {"metric": "DatasetDriftMetric", "result": {"drift_share": drift_share, **dataset}},
+            {"metric": "DataDriftTable", "result": {**dataset, "drift_by_columns": drift_by_columns}},
+        ]
+    }
+
+
+def compute_drift(current_data: pd.DataFrame, reference_data: pd.DataFrame, drift_share: float = DRIFT_SHARE) -> dict:
+    """
+    Column-by-column drift of current vs reference data.
+    Returns a dict shaped like Evidently's `Report.as_dict()`.
+    """
+    drift_by_columns = {}
+    for col in reference_data.columns:
+        if col not in current_data.columns:
+            continue
+        # Categorical (non-numeric) columns are label-encoded on the pooled values
+        ref_col, cur_col = reference_data[col], current_data[col]
+        column_type = column_type_of(col, ref_col)
+        if not pd.api.types.is_numeric_dtype(ref_col):
+            codes, _ = pd.factorize(pd.concat([ref_col, cur_col]).astype(str))
+            ref_col, cur_col = codes[:len(ref_col)], codes[len(ref_col):]
+
+        reference = Distribution.from_array(ref_col)
+        current = Distribution.from_array(cur_col)
+        if reference.n == 0 or current.n == 0:
+            continue
+        drift_by_columns[col] = column_drift(col, reference, current, column_type)
+
+    return build_report_dict(drift_by_columns, drift_share)
+
+
+def compute_drift_from_profile(current_data: pd.DataFrame, profile, drift_share: float = DRIFT_SHARE) -> dict:
+    """
+    Same as `compute_drift`, but the reference side comes from a precomputed
+    ReferenceProfile, so only the production data is processed.
+    """
+    drift_by_columns = {}
+    for col in profile.columns:
+        if col not in current_data.columns:
+            continue
+        current = Distribution.from_array(current_data[col])
+        if current.n == 0:
+            continue
+        drift_by_columns[col] = column_drift(col, profile.distribution(col), current, column_type_of(col, current_data[col]))
+
+    return build_report_dict(drift_by_columns, drift_share)
@@ -6,21 +6,19 @@ import os
 from app.utils.alerts import send_email_alert, send_slack_alert
 from app.core.config import LOGS_PATH  # configurable logs folder
 
-# ensure logs folder exists
-os.makedirs(LOGS_PATH, exist_ok=True)
-
-# setup logger
 logger = logging.getLogger("governance")
-logger.setLevel(logging.INFO)
 
-# Remove all existing handlers
-if logger.hasHandlers():
-    logger.handlers.clear()
-    
-handler = logging.FileHandler(os.path.join(LOGS_PATH, "governance_alerts.log"))
-formatter = logging.Formatter('%(asctime)s | %(levelname)s | %(message)s')
-handler.setFormatter(formatter)
-logger.addHandler(handler)
+
+def get_logger() -> logging.Logger:
+    """Governance logger; the logs folder and file handler are set up on first use."""
+    if not logger.handlers:
+        os.makedirs(LOGS_PATH, exist_ok=True)
+        logger.setLevel(logging.INFO)
+        handler = logging.FileHandler(os.path.join(LOGS_PATH, "governance_alerts.log"))
+        formatter = logging.Formatter('%(asctime)s | %(levelname)s | %(message)s')
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+    return logger
 
 
 class Governance:
@@ -99,7 +97,7 @@ class Governance:
             "model_version": model_version,
             "alert": message
         }
-        logger.info(json.dumps(log_entry))
+        get_logger().info(json.dumps(log_entry))
 
 
 def run_governance_checks(report_dict: dict, model_version: str = "v1", thresholds: dict = None):
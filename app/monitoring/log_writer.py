@@ -0,0 +1,184 @@
+# app/monitoring/log_writer.py
+# Write-behind queue in front of the prediction log
+import threading
+import time
+
+import pyarrow as pa
+
+from app.core.config import (
+    PREDICTION_LOG_FLUSH_ROWS,
+    PREDICTION_LOG_FLUSH_MS,
+    PREDICTION_LOG_QUEUE_ROWS,
+    PREDICTION_LOG_BLOCK_MS,
+    SHADOW_LOG_DIR,
+)
+from app.core.executors import QueueFullError
+from app.core.metrics import metrics
+from app.monitoring.prediction_log import PredictionLog, get_prediction_log
+
+
+class WriteBehindLog:
+    """
+    Request paths `submit` scored batches to an in-memory queue; a background
+    thread appends them to the PredictionLog in bulk once `flush_rows` rows are
+    pending or `flush_ms` has passed. When `queue_rows` rows are pending,
+    `submit` waits up to `block_ms` for the writer and then raises
+    QueueFullError, so a slow disk pushes back on producers instead of growing
+    memory without bound.
+    """
+
+    def __init__(self, log: PredictionLog, flush_rows: int = PREDICTION_LOG_FLUSH_ROWS,
+                 flush_ms: float = PREDICTION_LOG_FLUSH_MS, queue_rows: int = PREDICTION_LOG_QUEUE_ROWS,
+                 block_ms: float = PREDICTION_LOG_BLOCK_MS):
+        self.log = log
+        self.flush_rows = max(1, flush_rows)
+        self.flush_interval = flush_ms / 1000.0
+        self.queue_rows = max(self.flush_rows, queue_rows)
+        self.block_timeout = block_ms / 1000.0
+
+        self._pending = []
+        self._pending_rows = 0
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()  # one bulk append at a time, in order
+        self._thread = None
+        self._closing = False
+
+        # stats
+        self.submitted_rows = 0
+        self.written_rows = 0
+        self.flushes = 0
+        self.rejected = 0
+
+    @property
+    def pending_rows(self) -> int:
+        return self._pending_rows
+
+    def start(self):
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._closing = False
+            self._thread = threading.Thread(target=self._run, name="prediction-log-writer", daemon=True)
+            self._thread.start()
+
+    def submit(self, batch, wait: bool = False):
+        """
+        Queue a scored batch (DataFrame or a table from `log.from_arrays`).
+        wait=True blocks until the writer makes room instead of raising
+        (bulk uploads, which should slow down rather than fail).
+        """
+        if len(batch) == 0:
+            return
+        table = batch if isinstance(batch, pa.Table) else self.log.to_table(batch)
+        self.start()
+        with self._cond:
+            deadline = time.monotonic() + self.block_timeout
+            while self._pending_rows and self._pending_rows + table.num_rows > self.queue_rows:
+                if wait:
+                    self._cond.notify_all()
+                    self._cond.wait(self.flush_interval)
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.rejected += 1
+                    raise QueueFullError(f"prediction log queue is full ({self._pending_rows} rows pending)")
+                self._cond.notify_all()
+                self._cond.wait(remaining)
+            self._pending.append(table)
+            self._pending_rows += table.num_rows
+            self.submitted_rows += table.num_rows
+            if self._pending_rows >= self.flush_rows:
+                self._cond.notify_all()
+
+    def flush(self):
+        """
+        Append everything queued so far (also called by readers and on
+        shutdown). If the append fails the rows stay queued and the error is
+        raised; the writer thread retries on its next flush.
+        """
+        with self._flush_lock:
+            with self._cond:
+                pending, self._pending, self._pending_rows = self._pending, [], 0
+                self._cond.notify_all()  # wake producers waiting for space
+            if not pending:
+                return
+            table = pending[0] if len(pending) == 1 else pa.concat_tables(pending)
+            try:
+                self.log.append(table)
+            except Exception:
+                # back at the front of the queue: the next flush retries them in order
+                with self._cond:
+                    self._pending[:0] = pending
+                    self._pending_rows += table.num_rows
+                raise
+            self.written_rows += table.num_rows
+            self.flushes += 1
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._closing or self._pending_rows >= self.flush_rows,
+                                    timeout=self.flush_interval)
+                closing = self._closing
+            try:
+                self.flush()
+            except Exception as e:
+                print("Prediction log writer error:", e)
+            if closing:
+                return
+
+    def close(self):
+        """Stop the writer thread after a final flush (lifespan shutdown)."""
+        with self._cond:
+            thread, self._thread = self._thread, None
+            self._closing = True
+            self._cond.notify_all()
+        if thread is not None:
+            thread.join()
+        self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "pending_rows": self._pending_rows,
+            "submitted_rows": self.submitted_rows,
+            "written_rows": self.written_rows,
+            "flushes": self.flushes,
+            "rejected": self.rejected,
+            "fsync": self.log.fsync,
+        }
+
+
+# ---- Process-wide writer for the shared prediction log ----
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_prediction_writer(features: list) -> WriteBehindLog:
+    """Shared writer; the first call opens the log (at startup, from the lifespan)."""
+    global _writer
+    if _writer is not None:
+        return _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = WriteBehindLog(get_prediction_log(features))
+        return _writer
+
+
+metrics.gauge("prediction_log_queue_rows", "Rows waiting in the prediction log write-behind queue",
+              fn=lambda: _writer.pending_rows if _writer is not None else 0)
+metrics.counter("prediction_log_written_rows_total", "Rows appended to the prediction log",
+                fn=lambda: _writer.written_rows if _writer is not None else 0)
+metrics.counter("prediction_log_rejected_total", "Batches rejected because the write queue was full",
+                fn=lambda: _writer.rejected if _writer is not None else 0)
+
+
+# ---- Challenger predictions from shadow scoring (separate log, same schema) ----
+_shadow_writer = None
+
+
+def get_shadow_writer(features: list) -> WriteBehindLog:
+    global _shadow_writer
+    with _writer_lock:
+        if _shadow_writer is None:
+            _shadow_writer = WriteBehindLog(PredictionLog(features, directory=SHADOW_LOG_DIR))
+        return _shadow_writer
@@ -0,0 +1,344 @@
+# app/monitoring/prediction_log.py
+# Append-only, segmented production prediction log (Arrow IPC)
+import glob
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from app.core.config import (
+    LEGACY_PREDICTION_LOG,
+    PREDICTION_LOG_DIR,
+    PREDICTION_LOG_SEGMENT_ROWS,
+    PREDICTION_LOG_SEGMENT_SECONDS,
+    PREDICTION_LOG_RETENTION_ROWS,
+    PREDICTION_LOG_FSYNC,
+)
+
+LOG_COLUMNS = [
+    ("target", pa.float64()),
+    ("model_prediction", pa.int64()),
+    ("model_probability", pa.float64()),
+    ("model_risk_level", pa.string()),
+    ("model_version", pa.string()),
+    ("timestamp", pa.timestamp("us", tz="UTC")),
+]
+
+SEGMENT_SUFFIX = ".arrows"
+OPEN_MARKER = ".open"
+
+
+def log_schema(features: list) -> pa.Schema:
+    return pa.schema([(f, pa.float64()) for f in features] + LOG_COLUMNS)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass
+    return True
+
+
+def _utc(value) -> pd.Timestamp:
+    """Timestamp in UTC; naive values are taken as UTC, aware ones converted."""
+    ts = pd.Timestamp(value)
+    return ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+
+
+def _ts_range_ns(table: pa.Table):
+    """(min, max) of the timestamp column in epoch nanoseconds."""
+    bounds = pc.min_max(table.column("timestamp").cast(pa.int64()))
+    return bounds["min"].as_py() * 1000, bounds["max"].as_py() * 1000
+
+
+class Segment:
+    """
+    One segment file. Sealed segments are immutable and carry their time range
+    and row count in the file name, so readers can pick segments without
+    opening them: seg-<opened_ns>-<min_ts_ns>-<max_ts_ns>-<rows>.arrows
+    Open segments are named seg-<opened_ns>-<pid>.open.arrows
+    """
+
+    def __init__(self, path: str, opened_ns: int, start_ns: int = None, end_ns: int = None, rows: int = None,
+                 pid: int = None):
+        self.path = path
+        self.opened_ns = opened_ns
+        self.start_ns = start_ns
+        self.end_ns = end_ns
+        self.rows = rows
+        self.pid = pid
+
+    @property
+    def sealed(self) -> bool:
+        return self.rows is not None
+
+    @classmethod
+    def parse(cls, path: str):
+        name = os.path.basename(path)[:-len(SEGMENT_SUFFIX)]
+        parts = name.split("-")
+        if name.endswith(OPEN_MARKER):
+            return cls(path, int(parts[1]), pid=int(parts[2][:-len(OPEN_MARKER)]))
+        return cls(path, *(int(p) for p in parts[1:5]))
+
+    def read(self) -> pa.Table:
+        """Read all complete record batches (an open segment may end mid-batch)."""
+        batches = []
+        with pa.OSFile(self.path, "rb") as source:
+            try:
+                reader = pa.ipc.open_stream(source)
+                for batch in reader:
+                    batches.append(batch)
+            except (pa.ArrowInvalid, OSError):
+                if not batches:
+                    return None
+        return pa.Table.from_batches(batches) if batches else None
+
+
+class PredictionLog:
+    """
+    Production prediction log stored as append-only Arrow IPC stream segments.
+    Each append writes one record batch to the active segment, which is sealed
+    (closed and renamed) once it reaches `segment_rows` rows or
+    `segment_seconds` age. Retention drops whole sealed segments, so nothing
+    is ever rewritten.
+    """
+
+    def __init__(self, features: list, directory: str = PREDICTION_LOG_DIR,
+                 segment_rows: int = PREDICTION_LOG_SEGMENT_ROWS,
+                 segment_seconds: float = PREDICTION_LOG_SEGMENT_SECONDS,
+                 retention_rows: int = PREDICTION_LOG_RETENTION_ROWS,
+                 fsync: bool = PREDICTION_LOG_FSYNC):
+        self.features = list(features)
+        self.schema = log_schema(self.features)
+        self.directory = directory
+        self.segment_rows = segment_rows
+        self.segment_seconds = segment_seconds
+        self.retention_rows = retention_rows
+        self.fsync = fsync
+
+        self._lock = threading.Lock()
+        self._writer = None
+        self._sink = None
+        self._active = None
+        self._active_rows = 0
+        self._active_opened = 0.0
+        self._active_opened_ns = None
+        self._active_min_ns = None
+        self._active_max_ns = None
+        self._foreign_rows = {}  # path -> (size, rows) of segments other processes are writing
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._seal_orphans()
+
+    # ---- Segments ----
+    def segments(self) -> list:
+        """All segments in write order."""
+        paths = glob.glob(os.path.join(self.directory, "seg-*" + SEGMENT_SUFFIX))
+        return sorted((Segment.parse(p) for p in paths), key=lambda s: (s.opened_ns, s.path))
+
+    def _seal_orphans(self):
+        """Seal open segments left behind by processes that are gone."""
+        for seg in self.segments():
+            if seg.sealed or (seg.pid != os.getpid() and _pid_alive(seg.pid)):
+                continue
+            table = seg.read()
+            if table is None or table.num_rows == 0:
+                os.remove(seg.path)
+                continue
+            # keep only complete batches
+            with pa.OSFile(seg.path, "wb") as sink, pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            self._rename_sealed(seg.path, seg.opened_ns, *_ts_range_ns(table), table.num_rows)
+
+    def _rename_sealed(self, path: str, opened_ns: int, start_ns: int, end_ns: int, rows: int):
+        sealed = os.path.join(self.directory, f"seg-{opened_ns}-{start_ns}-{end_ns}-{rows}{SEGMENT_SUFFIX}")
+        os.replace(path, sealed)
+
+    def _open_segment(self):
+        self._active_opened_ns = time.time_ns()
+        self._active = os.path.join(
+            self.directory, f"seg-{self._active_opened_ns}-{os.getpid()}{OPEN_MARKER}{SEGMENT_SUFFIX}"
+        )
+        self._sink = open(self._active, "wb")
+        self._writer = pa.ipc.new_stream(self._sink, self.schema)
+        self._active_rows = 0
+        self._active_opened = time.monotonic()
+        self._active_min_ns = None
+        self._active_max_ns = None
+
+    def _seal_active(self):
+        if self._writer is None:
+            return
+        self._writer.close()
+        self._sink.close()
+        if self._active_rows:
+            self._rename_sealed(
+                self._active, self._active_opened_ns, self._active_min_ns, self._active_max_ns, self._active_rows
+            )
+        else:
+            os.remove(self._active)
+        self._writer = self._sink = self._active = None
+        self._active_rows = 0
+
+    # ---- Writes ----
+    def to_table(self, df: pd.DataFrame) -> pa.Table:
+        """Coerce a scored batch to the typed log schema (unknown columns are dropped)."""
+        df = df.reindex(columns=self.schema.names)
+        df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True)
+        return pa.Table.from_pandas(df, schema=self.schema, preserve_index=False)
+
+    def from_arrays(self, X, preds, probas, risk_levels, model_version: str, target=None) -> pa.Table:
+        """Build a log table straight from the scoring arrays (no pandas)."""
+        n = len(preds)
+        columns = [pa.array(X[:, j], type=pa.float64()) for j in range(len(self.features))]
+        columns += [
+            pa.array(np.full(n, np.nan) if target is None else target, type=pa.float64()),
+            pa.array(preds, type=pa.int64()),
+            pa.array(probas, type=pa.float64()),
+            pa.array(risk_levels, type=pa.string()),
+            pa.array([model_version] * n, type=pa.string()),
+            pa.array(np.full(n, np.datetime64(time.time_ns() // 1000, "us")), type=self.schema.field("timestamp").type),
+        ]
+        return pa.Table.from_arrays(columns, schema=self.schema)
+
+    def append(self, df):
+        """Append a scored batch: a DataFrame or a table from `from_arrays`."""
+        if len(df) == 0:
+            return
+        table = df if isinstance(df, pa.Table) else self.to_table(df)
+        min_ns, max_ns = _ts_range_ns(table)
+        with self._lock:
+            if self._writer is None:
+                self._open_segment()
+            self._writer.write_table(table)
+            self._sink.flush()
+            if self.fsync:
+                os.fsync(self._sink.fileno())
+            self._active_rows += table.num_rows
+            self._active_min_ns = min_ns if self._active_min_ns is None else min(self._active_min_ns, min_ns)
+            self._active_max_ns = max_ns if self._active_max_ns is None else max(self._active_max_ns, max_ns)
+
+            if (self._active_rows >= self.segment_rows
+                    or time.monotonic() - self._active_opened >= self.segment_seconds):
+                self._seal_active()
+                self._enforce_retention()
+
+    def rotate(self):
+        """Seal the active segment now (e.g. on shutdown)."""
+        with self._lock:
+            self._seal_active()
+            self._enforce_retention()
+
+    def _enforce_retention(self):
+        sealed = [s for s in self.segments() if s.sealed]
+        total = sum(s.rows for s in sealed) + self._active_rows
+        for seg in sealed:
+            if total - seg.rows < self.retention_rows:
+                break
+            os.remove(seg.path)
+            total -= seg.rows
+
+    # ---- Reads ----
+    def _read_segments(self, segments: list) -> pd.DataFrame:
+        tables = [t for t in (s.read() for s in segments) if t is not None]
+        if not tables:
+            return pd.DataFrame(columns=self.schema.names)
+        return pa.concat_tables(tables).to_pandas()
+
+    def n_rows(self) -> int:
+        return sum(s.rows if s.sealed else self._open_rows(s) for s in self.segments())
+
+    def row_counts(self) -> dict:
+        """
+        {opened_ns: rows} of every segment. Sealed segments and this process's
+        active one are counted without reading; segments other processes are
+        writing are read only when their size changed, so polling an idle log
+        costs one directory listing.
+        """
+        counts, foreign = {}, {}
+        for seg in self.segments():
+            if seg.sealed or seg.path == self._active:
+                counts[seg.opened_ns] = seg.rows if seg.sealed else self._active_rows
+                continue
+            try:
+                size = os.path.getsize(seg.path)
+            except OSError:  # sealed meanwhile; counted on the next call
+                continue
+            cached = self._foreign_rows.get(seg.path)
+            if cached is None or cached[0] != size:
+                cached = (size, self._open_rows(seg))
+            foreign[seg.path] = cached
+            counts[seg.opened_ns] = cached[1]
+        self._foreign_rows = foreign
+        return counts
+
+    def _open_rows(self, seg: Segment) -> int:
+        if seg.path == self._active:
+            return self._active_rows
+        table = seg.read()
+        return table.num_rows if table is not None else 0
+
+    def tail(self, n: int) -> pd.DataFrame:
+        """Last `n` rows, reading only the newest segments that cover them."""
+        chosen, rows = [], 0
+        for seg in reversed(self.segments()):
+            chosen.append(seg)
+            rows += seg.rows if seg.sealed else self._open_rows(seg)
+            if rows >= n:
+                break
+        df = self._read_segments(list(reversed(chosen)))
+        return df.tail(n).reset_index(drop=True)
+
+    def read_range(self, start=None, end=None) -> pd.DataFrame:
+        """Rows with start <= timestamp <= end, skipping segments outside the range."""
+        start_ns = _utc(start).value if start is not None else None
+        end_ns = _utc(end).value if end is not None else None
+        chosen = []
+        for seg in self.segments():
+            if end_ns is not None and seg.sealed and seg.start_ns > end_ns:
+                continue
+            if start_ns is not None and seg.sealed and seg.end_ns < start_ns:
+                continue
+            chosen.append(seg)
+        df = self._read_segments(chosen)
+        if start_ns is not None:
+            df = df[df["timestamp"] >= pd.Timestamp(start_ns, tz="UTC")]
+        if end_ns is not None:
+            df = df[df["timestamp"] <= pd.Timestamp(end_ns, tz="UTC")]
+        return df.reset_index(drop=True)
+
+    # ---- Migration ----
+    def import_csv(self, path: str):
+        """One-off import of a legacy predictions_log.csv into a sealed segment."""
+        if not os.path.exists(path) or any(True for _ in self.segments()):
+            return 0
+        legacy = pd.read_csv(path)
+        if legacy.empty:
+            return 0
+        self.append(legacy)
+        self.rotate()
+        return len(legacy)
+
+
+# ---- Process-wide log (one active segment per process) ----
+_log = None
+_log_lock = threading.Lock()
+
+
+def get_prediction_log(features: list) -> PredictionLog:
+    """Shared PredictionLog; the first call also imports the legacy CSV log."""
+    global _log
+    with _log_lock:
+        if _log is None:
+            _log = PredictionLog(features)
+            imported = _log.import_csv(LEGACY_PREDICTION_LOG)
+            if imported:
+                print(f"Imported {imported} rows from {LEGACY_PREDICTION_LOG} into {_log.directory}")
+        return _log
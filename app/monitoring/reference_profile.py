@@ -0,0 +1,168 @@
+# app/monitoring/reference_profile.py
+# Precomputed reference distribution per model version
+import os
+import json
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import MODELS_DIR, FEATURES_FILENAME
+from app.monitoring.drift_engine import Distribution, MAX_DISCRETE_VALUES
+
+PROFILE_FILENAME = "reference_profile.npz"
+REFERENCE_FILENAME = "reference_data.csv"
+
+PROFILE_FORMAT_VERSION = 1
+N_BINS = 50
+QUANTILES = np.linspace(0.0, 1.0, 101)
+
+
+def profile_path(model_version: str) -> str:
+    return os.path.join(MODELS_DIR, model_version, PROFILE_FILENAME)
+
+
+def reference_data_path(model_version: str) -> str:
+    return os.path.join(MODELS_DIR, model_version, REFERENCE_FILENAME)
+
+
+def _bin_edges(dist: Distribution, n_bins: int = N_BINS) -> np.ndarray:
+    """
+    Interior bin edges for a feature: one bin per value for discrete features,
+    reference quantile bins otherwise. Outer bins are open-ended.
+    """
+    if dist.n_unique <= MAX_DISCRETE_VALUES:
+        return (dist.values[1:] + dist.values[:-1]) / 2.0
+    cum = np.cumsum(dist.counts) / dist.n
+    qs = np.linspace(0.0, 1.0, n_bins + 1)[1:-1]
+    edges = dist.values[np.searchsorted(cum, qs)]
+    return np.unique(edges)
+
+
+class FeatureProfile:
+    def __init__(self, name, distribution: Distribution, bin_edges, hist, quantiles):
+        self.name = name
+        self.distribution = distribution
+        self.bin_edges = np.asarray(bin_edges, dtype=np.float64)
+        self.hist = np.asarray(hist, dtype=np.float64)
+        self.quantiles = np.asarray(quantiles, dtype=np.float64)
+
+    @classmethod
+    def from_array(cls, name, data):
+        dist = Distribution.from_array(data)
+        edges = _bin_edges(dist)
+        hist = np.bincount(
+            np.searchsorted(edges, dist.values, side="right"),
+            weights=dist.counts,
+            minlength=len(edges) + 1,
+        )
+        cum = np.cumsum(dist.counts) / dist.n
+        quantiles = dist.values[np.minimum(np.searchsorted(cum, QUANTILES), dist.n_unique - 1)]
+        return cls(name, dist, edges, hist, quantiles)
+
+    @property
+    def moments(self) -> dict:
+        dist = self.distribution
+        return {
+            "n": dist.n,
+            "mean": dist.mean(),
+            "std": dist.std(),
+            "min": float(dist.values[0]),
+            "max": float(dist.values[-1]),
+        }
+
+
+class ReferenceProfile:
+    """
+    Everything the drift checks need from the reference set, computed once:
+    per-feature sorted unique values + counts (an exact, compressed copy of the
+    sample), bin edges and histogram, quantiles and moments.
+    """
+
+    def __init__(self, model_version: str, features: dict):
+        self.model_version = model_version
+        self.features = features  # name -> FeatureProfile
+        self._frame = None
+
+    @classmethod
+    def from_frame(cls, reference_df: pd.DataFrame, features: list, model_version: str = "v1"):
+        return cls(model_version, {f: FeatureProfile.from_array(f, reference_df[f]) for f in features})
+
+    @property
+    def columns(self) -> list:
+        return list(self.features)
+
+    def distribution(self, feature: str) -> Distribution:
+        return self.features[feature].distribution
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Rebuild a reference DataFrame (each column sorted independently) for
+        backends that want raw rows, e.g. Evidently.
+        """
+        if self._frame is None:
+            self._frame = pd.DataFrame({f: p.distribution.expand() for f, p in self.features.items()})
+        return self._frame
+
+    # ---- Persistence ----
+    def save(self, path: str):
+        arrays = {
+            "format_version": np.array(PROFILE_FORMAT_VERSION),
+            "model_version": np.array(self.model_version),
+            "features": np.array(self.columns),
+        }
+        for name, p in self.features.items():
+            arrays[f"{name}__values"] = p.distribution.values
+            arrays[f"{name}__counts"] = p.distribution.counts
+            arrays[f"{name}__bin_edges"] = p.bin_edges
+            arrays[f"{name}__hist"] = p.hist
+            arrays[f"{name}__quantiles"] = p.quantiles
+            arrays[f"{name}__moments"] = np.array(list(p.moments.values()))
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp.npz"
+        np.savez_compressed(tmp_path, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str):
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["format_version"]) != PROFILE_FORMAT_VERSION:
+                raise ValueError(f"Unsupported reference profile format in {path}")
+            features = {}
+            for name in data["features"].tolist():
+                dist = Distribution(data[f"{name}__values"], data[f"{name}__counts"])
+                features[name] = FeatureProfile(
+                    name, dist, data[f"{name}__bin_edges"], data[f"{name}__hist"], data[f"{name}__quantiles"]
+                )
+            return cls(str(data["model_version"]), features)
+
+
+def build_reference_profile(reference_df: pd.DataFrame, features: list, model_version: str = "v1", path: str = None):
+    """Build the profile for a model version and store it next to the model."""
+    profile = ReferenceProfile.from_frame(reference_df, features, model_version)
+    profile.save(path or profile_path(model_version))
+    return profile
+
+
+@lru_cache(maxsize=None)
+def _load_profile(model_version: str, path: str, mtime: float) -> ReferenceProfile:
+    if mtime:
+        return ReferenceProfile.load(path)
+
+    # No artifact yet: build it from the reference CSV once
+    with open(os.path.join(MODELS_DIR, model_version, FEATURES_FILENAME), "r") as f:
+        features = json.load(f)
+    reference_df = pd.read_csv(reference_data_path(model_version))
+    print(f"Reference profile missing for {model_version}, building {path}")
+    return build_reference_profile(reference_df, features, model_version, path)
+
+
+def load_reference_profile(model_version: str = "v1") -> ReferenceProfile:
+    """
+    Memoized per model version (and artifact mtime, so a rebuilt profile is
+    picked up without a restart).
+    """
+    path = profile_path(model_version)
+    mtime = os.path.getmtime(path) if os.path.exists(path) else 0.0
+    return _load_profile(model_version, path, mtime)
@@ -0,0 +1,100 @@
+# app/monitoring/report_cache.py
+
+# On-demand Evidently HTML for the latest drift window
+import asyncio
+import hashlib
+import os
+import threading
+
+import pandas as pd
+
+from app.core.config import DRIFT_REPORT_CACHE_DIR, DRIFT_REPORT_CACHE_FILES
+from app.core.executors import run_drift
+from app.core.metrics import DRIFT_PHASE
+from app.monitoring.drift import render_report_html
+
+
+def report_key(window: pd.DataFrame, model_version: str) -> str:
+    """Hash of the window's values, its columns and the model version."""
+    h = hashlib.blake2b(digest_size=12)
+    h.update(model_version.encode())
+    h.update(",".join(map(str, window.columns)).encode())
+    h.update(pd.util.hash_pandas_object(window, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+class HtmlReportCache:
+    """
+    The drift loop hands over every window it checks (`update`); nothing is
+    rendered then. `get` renders the HTML report of the latest window on the
+    drift executor the first time it is asked for, and serves the cached file
+    until the window changes. Concurrent requests for the same report share
+    one render.
+    """
+
+    def __init__(self, directory: str = DRIFT_REPORT_CACHE_DIR, max_files: int = DRIFT_REPORT_CACHE_FILES):
+        self.directory = directory
+        self.max_files = max(1, max_files)
+        self.key = None
+        self._window = None
+        self._model_version = None
+        self._lock = threading.Lock()
+        self._renders = {}  # key -> asyncio.Task, while rendering
+
+    def update(self, window: pd.DataFrame, model_version: str) -> str:
+        """Remember the latest drift window (called from the drift loop, off the event loop)."""
+        key = report_key(window, model_version)
+        with self._lock:
+            self.key, self._window, self._model_version = key, window, model_version
+        return key
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.html")
+
+    def latest_file(self):
+        """Newest rendered report on disk (e.g. rendered by another worker), or None."""
+        try:
+            files = [os.path.join(self.directory, f) for f in os.listdir(self.directory) if f.endswith(".html")]
+        except OSError:
+            return None
+        return max(files, key=os.path.getmtime) if files else None
+
+    async def get(self):
+        """Path of the HTML report for the latest window, rendering it if needed; None without a window."""
+        with self._lock:
+            key, window, model_version = self.key, self._window, self._model_version
+        if key is None:
+            return self.latest_file()
+        path = self.path(key)
+        if os.path.exists(path):
+            return path
+
+        task = self._renders.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._render(key, window, model_version, path))
+            self._renders[key] = task
+            task.add_done_callback(lambda _: self._renders.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _render(self, key: str, window: pd.DataFrame, model_version: str, path: str) -> str:
+        with DRIFT_PHASE.labels("render_html").time():
+            await run_drift(render_report_html, window, model_version, path)
+        await asyncio.to_thread(self._evict, keep=path)
+        return path
+
+    def _evict(self, keep: str):
+        """Delete all but the newest `max_files` reports."""
+        try:
+            files = [os.path.join(self.directory, f) for f in os.listdir(self.directory) if f.endswith(".html")]
+        except OSError:
+            return
+        files.sort(key=os.path.getmtime, reverse=True)
+        for f in files[self.max_files:]:
+            if f != keep:
+                try:
+                    os.remove(f)
+                except OSError:
+                    pass
+
+
+html_report_cache = HtmlReportCache()
@@ -0,0 +1,225 @@
+# app/monitoring/streaming.py
+# Incremental drift state updated as predictions are scored
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import DRIFT_BACKEND, DRIFT_WINDOW_ROWS, DRIFT_WINDOW_BUCKETS, DRIFT_WINDOW_MAX_AGE
+from app.monitoring.drift_engine import (
+    DISTANCE_THRESHOLD,
+    MAX_CATEGORIES,
+    STATTEST_NAMES,
+    build_report_dict,
+    jensen_shannon,
+    psi,
+    wasserstein_distance,
+)
+from app.monitoring.log_writer import get_prediction_writer
+from app.monitoring.reference_profile import load_reference_profile
+
+STREAMING_ENABLED = DRIFT_BACKEND == "streaming"
+
+
+class _Bucket:
+    """Histogram counts and moments for a contiguous slice of the window."""
+
+    def __init__(self, n_features: int, n_bins: int):
+        self.hist = np.zeros((n_features, n_bins))
+        self.bin_sum = np.zeros((n_features, n_bins))
+        self.n = np.zeros(n_features)
+        self.sum = np.zeros(n_features)
+        self.rows = 0
+        self.updated_at = time.time()
+
+
+class StreamingDriftState:
+    """
+    Rolling window of production rows kept as per-feature histograms over the
+    reference bin edges. `update` is O(batch), `snapshot` is O(features x bins)
+    and expiry subtracts whole aged-out buckets from the running totals.
+
+    Discrete features get one bin per reference value, with edges at the
+    midpoints between values. Their scores match Evidently's as long as
+    production values come from the reference set. A value the reference
+    never had (e.g. above its max) is merged into the bin of the nearest
+    reference value, whereas Evidently counts it as a new category. Continuous
+    features are a binned approximation of Evidently's numbers (each bin's
+    mass is placed at its within-bin mean).
+    """
+
+    def __init__(self, profile, window_rows: int = DRIFT_WINDOW_ROWS, n_buckets: int = DRIFT_WINDOW_BUCKETS,
+                 max_age_seconds: float = DRIFT_WINDOW_MAX_AGE):
+        self.profile = profile
+        self.features = profile.columns
+        self.window_rows = window_rows
+        self.bucket_rows = max(1, window_rows // n_buckets)
+        self.max_age_seconds = max_age_seconds
+
+        self._edges = [profile.features[f].bin_edges for f in self.features]
+        self._n_bins = max(len(e) for e in self._edges) + 1
+        self._ref_hist = np.zeros((len(self.features), self._n_bins))
+        self._ref_points = np.zeros((len(self.features), self._n_bins))
+        for j, f in enumerate(self.features):
+            fp = profile.features[f]
+            self._ref_hist[j, :len(fp.hist)] = fp.hist
+            self._ref_points[j, :len(fp.hist)] = _bin_points(fp)
+
+        self._totals = _Bucket(len(self.features), self._n_bins)
+        self._buckets = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def n_rows(self) -> int:
+        return self._totals.rows
+
+    # ---- Writes ----
+    def update(self, df):
+        """
+        Add a scored batch (DataFrame, or a matrix in `self.features` order);
+        splits it across buckets so expiry stays granular.
+        """
+        if isinstance(df, pd.DataFrame):
+            X = df[self.features].to_numpy(dtype=np.float64)
+        else:
+            X = np.asarray(df, dtype=np.float64)
+        with self._lock:
+            start = 0
+            while start < len(X):
+                bucket = self._current_bucket()
+                stop = min(len(X), start + self.bucket_rows - bucket.rows)
+                self._add(bucket, X[start:stop])
+                start = stop
+            self._expire()
+
+    def _current_bucket(self) -> _Bucket:
+        if not self._buckets or self._buckets[-1].rows >= self.bucket_rows:
+            self._buckets.append(_Bucket(len(self.features), self._n_bins))
+        return self._buckets[-1]
+
+    def _add(self, bucket: _Bucket, X: np.ndarray):
+        valid = ~np.isnan(X)
+        for j, edges in enumerate(self._edges):
+            col = X[valid[:, j], j]
+            idx = np.searchsorted(edges, col, side="right")
+            counts = np.bincount(idx, minlength=self._n_bins)
+            sums = np.bincount(idx, weights=col, minlength=self._n_bins)
+            for target in (bucket, self._totals):
+                target.hist[j] += counts
+                target.bin_sum[j] += sums
+        Xz = np.where(valid, X, 0.0)
+        for target in (bucket, self._totals):
+            target.n += valid.sum(axis=0)
+            target.sum += Xz.sum(axis=0)
+            target.rows += len(X)
+        bucket.updated_at = time.time()
+
+    def _expire(self):
+        now = time.time()
+        while self._buckets:
+            oldest = self._buckets[0]
+            over_size = self._totals.rows - oldest.rows >= self.window_rows
+            too_old = self.max_age_seconds and now - oldest.updated_at > self.max_age_seconds
+            if not (over_size or too_old):
+                break
+            self._buckets.popleft()
+            self._totals.hist -= oldest.hist
+            self._totals.bin_sum -= oldest.bin_sum
+            self._totals.n -= oldest.n
+            self._totals.sum -= oldest.sum
+            self._totals.rows -= oldest.rows
+
+    def reset(self):
+        with self._lock:
+            self._buckets.clear()
+            self._totals = _Bucket(len(self.features), self._n_bins)
+
+    # ---- Reads ----
+    def snapshot(self) -> dict:
+        """Drift of the current window vs the reference, as a report dict."""
+        with self._lock:
+            self._expire()
+            cur_hist = self._totals.hist.copy()
+            cur_sum = self._totals.bin_sum.copy()
+            n = self._totals.n.copy()
+            mean = np.divide(self._totals.sum, n, out=np.zeros_like(n), where=n > 0)
+
+        drift_by_columns = {}
+        for j, f in enumerate(self.features):
+            if n[j] == 0:
+                continue
+            fp = self.profile.features[f]
+            k = len(fp.hist)
+            ref_p = self._ref_hist[j, :k] / self._ref_hist[j, :k].sum()
+            cur_p = cur_hist[j, :k] / n[j]
+            ref_points = self._ref_points[j, :k]
+            # current mass sits at its own mean inside each bin
+            cur_points = np.divide(cur_sum[j, :k], cur_hist[j, :k], out=ref_points.copy(), where=cur_hist[j, :k] > 0)
+            ref_std = max(fp.moments["std"], 0.001)
+
+            metrics = {
+                "psi": psi(ref_p, cur_p),
+                "jensenshannon": jensen_shannon(ref_p, cur_p),
+                "ks": float(np.max(np.abs(np.cumsum(ref_p) - np.cumsum(cur_p)))),
+                "wasserstein": wasserstein_distance(ref_points, cur_points, ref_p, cur_p) / ref_std,
+            }
+            stattest = "wasserstein" if fp.distribution.n_unique > MAX_CATEGORIES else "jensenshannon"
+            score = metrics[stattest]
+            drift_by_columns[f] = {
+                "column_name": f,
+                "column_type": "num",
+                "stattest_name": STATTEST_NAMES[stattest],
+                "stattest_threshold": DISTANCE_THRESHOLD,
+                "drift_score": score,
+                "drift_detected": bool(score >= DISTANCE_THRESHOLD),
+                "metrics": metrics,
+                "current_mean": float(mean[j]),
+            }
+
+        return build_report_dict(drift_by_columns)
+
+
+def _bin_points(fp) -> np.ndarray:
+    """Reference mean inside each bin, used as the bin's location for Wasserstein."""
+    dist = fp.distribution
+    idx = np.searchsorted(fp.bin_edges, dist.values, side="right")
+    mass = np.bincount(idx, weights=dist.counts, minlength=len(fp.hist))
+    total = np.bincount(idx, weights=dist.values * dist.counts, minlength=len(fp.hist))
+    return np.divide(total, mass, out=np.zeros_like(total), where=mass > 0)
+
+
+# ---- Process-wide state per model version ----
+_states = {}
+_states_lock = threading.Lock()
+
+
+def seed_from_log(state: StreamingDriftState, model_version: str):
+    """Fill a new state with the newest logged rows of `model_version` (history from before a restart)."""
+    logged = get_prediction_writer(state.features).log.tail(state.window_rows)
+    if "model_version" in logged.columns:
+        logged = logged[logged["model_version"] == model_version]
+    if not logged.empty:
+        state.update(logged)
+
+
+def get_drift_state(model_version: str = "v1") -> StreamingDriftState:
+    """
+    The state of `model_version`, created on first use and seeded from the
+    prediction log before anything else can update it (at startup for the
+    active model, on the first scored batch after a version change).
+    """
+    with _states_lock:
+        state = _states.get(model_version)
+        if state is None:
+            state = StreamingDriftState(load_reference_profile(model_version))
+            seed_from_log(state, model_version)
+            _states[model_version] = state
+        return state
+
+
+def record_predictions(df, model_version: str = "v1"):
+    """Feed a scored batch to the streaming drift state (no-op unless enabled)."""
+    if STREAMING_ENABLED:
+        get_drift_state(model_version).update(df)
@@ -2,7 +2,6 @@
 
 import smtplib
 from email.message import EmailMessage
-import requests
 
 def send_email_alert(message: str):
     # Configure your SMTP settings here
@@ -23,6 +22,7 @@ def send_slack_alert(message: str):
     # Slack webhook URL
     webhook_url = "https://hooks.slack.com/services/XXXX/YYYY/ZZZZ"
     try:
+        import requests  # only needed once an alert actually fires
         requests.post(webhook_url, json={"text": message})
     except Exception as e:
         print(f"Failed to send Slack alert: {e}")
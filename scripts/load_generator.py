@@ -0,0 +1,224 @@
+# scripts/load_generator.py
+
+# Open-loop load generation against /predict, with latency histograms
+import asyncio
+import math
+import random
+import time
+from collections import Counter
+
+import numpy as np
+
+from app.api.traffic_daemon import sample_batch_csv
+
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+# distinct pre-serialized bodies per batch size, so the generator does not
+# spend the CPU it is measuring on sampling and CSV encoding
+PAYLOADS_PER_SIZE = 32
+
+
+class LatencyHistogram:
+    """
+    HDR-style histogram of latencies, counted in whole microseconds. Values
+    below `2 * 10**significant_digits` us are exact; above that each power of
+    two is split into the same number of linear sub-buckets, so any recorded
+    value is kept to `significant_digits` decimal digits at fixed memory.
+    Values above `highest_ms` land in the last bucket (the exact max is kept).
+    """
+
+    def __init__(self, highest_ms: float = 60_000.0, significant_digits: int = 2):
+        self.sub_bucket_count = 1 << math.ceil(math.log2(2 * 10 ** significant_digits))
+        self.sub_bucket_half = self.sub_bucket_count // 2
+        highest_us = max(int(highest_ms * 1000), self.sub_bucket_count)
+        n_buckets = highest_us.bit_length() - self.sub_bucket_count.bit_length() + 1
+        self.counts = np.zeros(self.sub_bucket_count + n_buckets * self.sub_bucket_half, dtype=np.int64)
+        self.total = 0
+        self.sum_us = 0
+        self.max_us = 0
+
+    def _index(self, value_us: int) -> int:
+        if value_us < self.sub_bucket_count:
+            return value_us
+        shift = value_us.bit_length() - self.sub_bucket_count.bit_length() + 1
+        index = self.sub_bucket_count + (shift - 1) * self.sub_bucket_half + (value_us >> shift) - self.sub_bucket_half
+        return min(index, len(self.counts) - 1)
+
+    def _highest_equivalent(self, index: int) -> int:
+        if index < self.sub_bucket_count:
+            return index
+        shift, offset = divmod(index - self.sub_bucket_count, self.sub_bucket_half)
+        shift += 1
+        return ((offset + self.sub_bucket_half) << shift) + (1 << shift) - 1
+
+    def record(self, value_ms: float, count: int = 1):
+        value_us = max(0, int(round(value_ms * 1000.0)))
+        self.counts[self._index(value_us)] += count
+        self.total += count
+        self.sum_us += value_us * count
+        self.max_us = max(self.max_us, value_us)
+
+    def merge(self, other: "LatencyHistogram"):
+        if len(other.counts) != len(self.counts):
+            raise ValueError("Histograms must have the same range and precision")
+        self.counts += other.counts
+        self.total += other.total
+        self.sum_us += other.sum_us
+        self.max_us = max(self.max_us, other.max_us)
+
+    def percentile(self, p: float) -> float:
+        """Latency in ms at or below which `p` percent of the recorded values fall."""
+        if self.total == 0:
+            return 0.0
+        target = max(1, math.ceil(p / 100.0 * self.total))
+        index = int(np.searchsorted(np.cumsum(self.counts), target))
+        if index == len(self.counts) - 1:  # overflow bucket
+            return self.max_us / 1000.0
+        return min(self._highest_equivalent(index), self.max_us) / 1000.0
+
+    def summary(self) -> dict:
+        out = {
+            "count": self.total,
+            "mean_ms": round(self.sum_us / self.total / 1000.0, 3) if self.total else 0.0,
+        }
+        for p in PERCENTILES:
+            out[f"p{p:g}_ms"] = round(self.percentile(p), 3)
+        out["max_ms"] = round(self.max_us / 1000.0, 3)
+        return out
+
+
+def parse_batch_sizes(spec: str):
+    """
+    "1:0.6,10:0.3,1000:0.1" -> ([1, 10, 1000], [0.6, 0.3, 0.1]). A size without
+    a weight gets weight 1, so "1,10" samples both sizes equally.
+    """
+    sizes, weights = [], []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        size, _, weight = part.partition(":")
+        sizes.append(int(size))
+        weights.append(float(weight) if weight else 1.0)
+    if not sizes or any(s < 1 for s in sizes) or any(w < 0 for w in weights) or sum(weights) <= 0:
+        raise ValueError(f"Invalid batch size distribution: {spec!r}")
+    return sizes, weights
+
+
+def build_payloads(df, sizes: list, per_size: int = PAYLOADS_PER_SIZE, seed=None) -> dict:
+    """{batch size: [CSV bodies]} sampled from the source data up front."""
+    rng = np.random.RandomState(seed)
+    return {
+        size: [sample_batch_csv(df, size, random_state=rng) for _ in range(per_size)]
+        for size in sizes
+    }
+
+
+class LoadResult:
+    """
+    Outcome of one open-loop run. `response_time` is measured from the time a
+    request was scheduled to be sent, so time spent waiting for a free slot or
+    behind a stalled generator counts against the service (coordinated
+    omission correction). `service_time` is measured from the actual send and
+    is what a closed-loop client would have reported.
+    """
+
+    def __init__(self, target_rps: float, duration: float, concurrency: int):
+        self.target_rps = target_rps
+        self.duration = duration
+        self.concurrency = concurrency
+        self.response_time = LatencyHistogram()
+        self.service_time = LatencyHistogram()
+        self.sent = 0
+        self.ok = 0
+        self.rows = 0
+        self.errors = Counter()
+        self.max_dispatch_lag_ms = 0.0
+        self.elapsed = 0.0
+
+    def summary(self) -> dict:
+        completed = self.ok + sum(self.errors.values())
+        elapsed = self.elapsed or self.duration
+        return {
+            "target_rps": self.target_rps,
+            "achieved_rps": round(completed / elapsed, 2) if elapsed else 0.0,
+            "duration_s": round(elapsed, 3),
+            "concurrency": self.concurrency,
+            "sent": self.sent,
+            "ok": self.ok,
+            "rows_per_s": round(self.rows / elapsed, 1) if elapsed else 0.0,
+            "error_rate": round(sum(self.errors.values()) / completed, 4) if completed else 0.0,
+            "errors": dict(self.errors),
+            # how late the generator itself dispatched requests; if this is
+            # large the client, not the service, was the bottleneck
+            "max_dispatch_lag_ms": round(self.max_dispatch_lag_ms, 3),
+            "response_time": self.response_time.summary(),
+            "service_time": self.service_time.summary(),
+        }
+
+
+async def run_load(client, url: str, payloads: dict, rate: float, duration: float,
+                   concurrency: int = 64, weights=None, arrival: str = "constant", seed=None) -> LoadResult:
+    """
+    Send `rate` requests/s to `url` for `duration` seconds, whether or not
+    earlier requests have finished (open loop), with at most `concurrency` in
+    flight. Batch sizes are drawn from `payloads` with `weights`; arrivals are
+    evenly spaced ("constant") or exponentially spaced ("poisson").
+    Only successful responses are recorded in the latency histograms.
+    """
+    if rate <= 0 or duration <= 0:
+        raise ValueError("rate and duration must be positive")
+    if arrival not in ("constant", "poisson"):
+        raise ValueError(f"Unknown arrival process: {arrival}")
+
+    rng = random.Random(seed)
+    sizes = list(payloads)
+    weights = list(weights) if weights is not None else [1.0] * len(sizes)
+    slots = asyncio.Semaphore(max(1, concurrency))
+    result = LoadResult(rate, duration, concurrency)
+
+    async def fire(intended: float, size: int, body: bytes):
+        async with slots:
+            sent = time.perf_counter()
+            try:
+                resp = await client.post(url, content=body, headers={"Content-Type": "text/csv"})
+                status = resp.status_code
+            except Exception as e:
+                result.errors[type(e).__name__] += 1
+                return
+            done = time.perf_counter()
+        if status != 200:
+            result.errors[f"http_{status}"] += 1
+            return
+        result.ok += 1
+        result.rows += size
+        result.response_time.record((done - intended) * 1000.0)
+        result.service_time.record((done - sent) * 1000.0)
+
+    tasks = []
+    start = time.perf_counter()
+    offset = 0.0  # seconds from start to the next send
+    while offset < duration:
+        intended = start + offset
+        now = time.perf_counter()
+        if intended > now:
+            await asyncio.sleep(intended - now)
+        lag_ms = (time.perf_counter() - intended) * 1000.0
+        result.max_dispatch_lag_ms = max(result.max_dispatch_lag_ms, lag_ms)
+        size = rng.choices(sizes, weights)[0]
+        tasks.append(asyncio.create_task(fire(intended, size, rng.choice(payloads[size]))))
+        result.sent += 1
+        if arrival == "poisson":
+            offset += rng.expovariate(rate)
+        else:
+            # from the request index: summing 1/rate would let rounding add a request
+            offset = result.sent / rate
+
+    await asyncio.gather(*tasks)
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def is_saturated(summary: dict, min_ratio: float = 0.95, max_error_rate: float = 0.01) -> bool:
+    """The service did not keep up with the offered rate, or started failing requests."""
+    return (summary["achieved_rps"] < min_ratio * summary["target_rps"]
+            or summary["error_rate"] > max_error_rate)
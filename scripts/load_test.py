@@ -0,0 +1,94 @@
+# scripts/load_test.py
+# Open-loop load test of /predict at one or more fixed request rates:
+#   python scripts/load_test.py --rates 10,20,50,100 --duration 30 --batch-sizes 1:0.7,10:0.2,100:0.1
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+import httpx
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.load_generator import PERCENTILES, build_payloads, is_saturated, parse_batch_sizes, run_load
+from app.api.traffic_daemon import SOURCE_DATA
+
+API_URL = "http://localhost:8000/predict"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Open-loop load generator for /predict")
+    parser.add_argument("--url", default=API_URL)
+    parser.add_argument("--source", default=SOURCE_DATA, help="CSV the request batches are sampled from")
+    parser.add_argument("--rates", default="10", help="comma-separated requests/s, run one after another")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds per rate")
+    parser.add_argument("--warmup", type=float, default=5.0, help="seconds at the first rate before measuring")
+    parser.add_argument("--concurrency", type=int, default=64, help="maximum requests in flight")
+    parser.add_argument("--batch-sizes", default="1:0.6,5:0.3,100:0.1",
+                        help="rows per request as size:weight pairs")
+    parser.add_argument("--arrival", choices=("constant", "poisson"), default="constant")
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", default=None, help="also write the per-rate summaries to this file")
+    return parser.parse_args(argv)
+
+
+def format_row(summary: dict) -> str:
+    rt = summary["response_time"]
+    latencies = " ".join(f"{rt[f'p{p:g}_ms']:>9.1f}" for p in PERCENTILES)
+    return (f"{summary['target_rps']:>8g} {summary['achieved_rps']:>9.1f} {latencies} "
+            f"{rt['max_ms']:>9.1f} {summary['error_rate']:>7.2%} {summary['max_dispatch_lag_ms']:>8.1f}")
+
+
+async def main(argv=None) -> int:
+    args = parse_args(argv)
+    rates = [float(r) for r in args.rates.split(",") if r.strip()]
+    sizes, weights = parse_batch_sizes(args.batch_sizes)
+
+    try:
+        df = pd.read_csv(args.source)
+    except Exception as e:
+        print("Failed to load source data:", e)
+        return 1
+    payloads = build_payloads(df, sizes, seed=args.seed)
+
+    print(f"Target API: {args.url}  concurrency={args.concurrency}  batch sizes={args.batch_sizes}  "
+          f"arrival={args.arrival}  {args.duration:g}s per rate")
+    print("Latencies are measured from each request's scheduled send time (coordinated omission corrected).\n")
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    summaries = []
+    async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+        if args.warmup > 0:
+            await run_load(client, args.url, payloads, rates[0], args.warmup,
+                           args.concurrency, weights, args.arrival, args.seed)
+
+        header = " ".join(f"{f'p{p:g} ms':>9}" for p in PERCENTILES)
+        print(f"{'rps':>8} {'achieved':>9} {header} {'max ms':>9} {'errors':>7} {'lag ms':>8}")
+        for rate in rates:
+            result = await run_load(client, args.url, payloads, rate, args.duration,
+                                    args.concurrency, weights, args.arrival, args.seed)
+            summary = result.summary()
+            summaries.append(summary)
+            print(format_row(summary))
+            if summary["errors"]:
+                print(f"{'':>8} errors: {summary['errors']}")
+
+    saturated = [s for s in summaries if is_saturated(s)]
+    if saturated:
+        print(f"\nSaturated at {saturated[0]['target_rps']:g} req/s "
+              f"(achieved {saturated[0]['achieved_rps']:.1f} req/s, error rate {saturated[0]['error_rate']:.2%}).")
+    else:
+        print("\nNo saturation up to the highest rate tested.")
+
+    if args.json:
+        os.makedirs(os.path.dirname(args.json) or ".", exist_ok=True)
+        with open(args.json, "w") as f:
+            json.dump(summaries, f, indent=2)
+        print(f"Summaries written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
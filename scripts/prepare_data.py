@@ -1,9 +1,13 @@
 # Preparing data
 
 import os
+import sys
 import pandas as pd
 from sklearn.model_selection import train_test_split
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.monitoring.reference_profile import build_reference_profile, PROFILE_FILENAME
+
 
 # -----------------------------
 # Paths
@@ -15,6 +19,7 @@ MODELS_DIR = "models/v1"
 CLEAN_DATA_PATH = os.path.join(PROCESSED_DATA_DIR, "credit_default_clean.csv")
 CURRENT_DATA_PATH = os.path.join(PROCESSED_DATA_DIR, "current_data.csv")
 REFERENCE_DATA_PATH = os.path.join(MODELS_DIR, "reference_data.csv")
+REFERENCE_PROFILE_PATH = os.path.join(MODELS_DIR, PROFILE_FILENAME)
 
 
 # -----------------------------
@@ -106,9 +111,13 @@ def main():
     reference_df.to_csv(REFERENCE_DATA_PATH, index=False)
     current_df.to_csv(CURRENT_DATA_PATH, index=False)
 
+    # Precompute the reference distribution used by drift checks
+    build_reference_profile(reference_df, FEATURE_COLUMNS, model_version="v1", path=REFERENCE_PROFILE_PATH)
+
     print("Data preparation completed successfully.")
     print(f"Clean data saved to: {CLEAN_DATA_PATH}")
     print(f"Reference data saved to: {REFERENCE_DATA_PATH}")
+    print(f"Reference profile saved to: {REFERENCE_PROFILE_PATH}")
     print(f"Current data saved to: {CURRENT_DATA_PATH}")
 
 
@@ -1,5 +1,6 @@
 # offline training
 import os
+import sys
 import json
 import joblib
 import pandas as pd
@@ -7,6 +8,9 @@ from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import accuracy_score, roc_auc_score
 from sklearn.model_selection import train_test_split
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.inference.compiled import export_linear_model
+
 
 # -----------------------------
 # Paths
@@ -16,6 +20,7 @@ MODEL_DIR = "models/v1"
 
 MODEL_PATH = os.path.join(MODEL_DIR, "model.pkl")
 FEATURES_PATH = os.path.join(MODEL_DIR, "features.json")
+LINEAR_MODEL_PATH = os.path.join(MODEL_DIR, "linear_model.json")
 
 
 # -----------------------------
@@ -73,6 +78,9 @@ def main():
     with open(FEATURES_PATH, "w") as f:
         json.dump(FEATURE_COLUMNS, f, indent=2)
 
+    # Coefficients for the sklearn-free serving scorer
+    export_linear_model(model, FEATURE_COLUMNS, LINEAR_MODEL_PATH)
+
     print("Model and features saved successfully.")
 
 
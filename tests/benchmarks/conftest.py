@@ -0,0 +1,74 @@
+# tests/benchmarks/conftest.py
+# Benchmarks are opt-in: RUN_BENCHMARKS=1 pytest tests/benchmarks -s
+#
+# Results are written to BENCHMARK_OUTPUT (default reports/benchmarks/latest.json)
+# and compared with BENCHMARK_BASELINE (default tests/benchmarks/baseline.json).
+# BENCHMARK_SAVE_BASELINE=1 stores this run as the new baseline instead;
+# BENCHMARK_STRICT=1 fails the session on a regression.
+
+import os
+import pytest
+
+from app.monitoring import governance, log_writer
+from app.monitoring.log_writer import WriteBehindLog
+from app.monitoring.prediction_log import PredictionLog
+from app.inference.registry import model_registry
+from tests.benchmarks.report import (
+    DEFAULT_BASELINE,
+    DEFAULT_OUTPUT,
+    DEFAULT_TOLERANCE,
+    compare,
+    format_comparison,
+    load_report,
+    write_report,
+)
+from tests.benchmarks.timing import RESULTS
+
+
+def pytest_collection_modifyitems(config, items):
+    if os.environ.get("RUN_BENCHMARKS") == "1":
+        return
+    skip = pytest.mark.skip(reason="benchmark (set RUN_BENCHMARKS=1 to run)")
+    for item in items:
+        if "benchmarks" in str(item.fspath):
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def isolated_prediction_log(tmp_path_factory):
+    """Predictions scored by the benchmarks go to a temp log, not data/production."""
+    directory = tmp_path_factory.mktemp("prediction_log")
+    features = model_registry.champion.features
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(log_writer, "_writer", WriteBehindLog(PredictionLog(features, directory=str(directory / "segments"))))
+        patch.setattr(log_writer, "_shadow_writer", WriteBehindLog(PredictionLog(features, directory=str(directory / "shadow"))))
+        yield directory
+
+
+@pytest.fixture(autouse=True)
+def offline_alerts(monkeypatch):
+    """Drift benchmarks trigger governance alerts; keep them offline (and out of the timings)."""
+    monkeypatch.setattr(governance, "send_email_alert", lambda message: None)
+    monkeypatch.setattr(governance, "send_slack_alert", lambda message: None)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not RESULTS:
+        return
+    baseline_path = os.environ.get("BENCHMARK_BASELINE", DEFAULT_BASELINE)
+    if os.environ.get("BENCHMARK_SAVE_BASELINE") == "1":
+        write_report(RESULTS, baseline_path)
+        print(f"\nBenchmark baseline saved to {baseline_path}")
+        return
+
+    output = os.environ.get("BENCHMARK_OUTPUT", DEFAULT_OUTPUT)
+    write_report(RESULTS, output)
+    print(f"\nBenchmark results written to {output}")
+    if not os.path.exists(baseline_path):
+        return
+
+    tolerance = float(os.environ.get("BENCHMARK_TOLERANCE", DEFAULT_TOLERANCE))
+    rows = compare(RESULTS, load_report(baseline_path)["results"], tolerance)
+    print(format_comparison(rows))
+    if os.environ.get("BENCHMARK_STRICT") == "1" and any(regressed for *_, regressed in rows):
+        session.exitstatus = 1
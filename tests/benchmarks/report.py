@@ -0,0 +1,94 @@
+# tests/benchmarks/report.py
+# JSON benchmark reports and comparison against a stored baseline:
+#   python -m tests.benchmarks.report reports/benchmarks/latest.json tests/benchmarks/baseline.json
+
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+from tests.benchmarks.timing import result_key
+
+DEFAULT_OUTPUT = "reports/benchmarks/latest.json"
+DEFAULT_BASELINE = "tests/benchmarks/baseline.json"
+# a result regresses when its p50 exceeds the baseline p50 by this factor
+# and by more than MIN_DELTA_MS (sub-0.1 ms timings are mostly noise)
+DEFAULT_TOLERANCE = 1.25
+MIN_DELTA_MS = 0.1
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def environment() -> dict:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def write_report(results: list, path: str) -> dict:
+    report = {"environment": environment(), "results": results}
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def load_report(path: str) -> dict:
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def compare(results: list, baseline: list, tolerance: float = DEFAULT_TOLERANCE,
+            min_delta_ms: float = MIN_DELTA_MS) -> list:
+    """
+    One row per result present in both runs: (key, baseline p50, current p50,
+    ratio, regressed). Results missing from either run are skipped.
+    """
+    before = {result_key(r): r for r in baseline}
+    rows = []
+    for r in results:
+        key = result_key(r)
+        if key not in before or not before[key]["p50_ms"]:
+            continue
+        base = before[key]["p50_ms"]
+        ratio = r["p50_ms"] / base
+        rows.append((key, base, r["p50_ms"], ratio, ratio > tolerance and r["p50_ms"] - base > min_delta_ms))
+    return rows
+
+
+def format_comparison(rows: list) -> str:
+    lines = [f"{'benchmark':<48} {'baseline p50 ms':>16} {'current p50 ms':>15} {'ratio':>7}"]
+    for key, base, current, ratio, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        lines.append(f"{key:<48} {base:>16.3f} {current:>15.3f} {ratio:>6.2f}x{flag}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if not 1 <= len(argv) <= 3:
+        print("usage: python -m tests.benchmarks.report CURRENT.json [BASELINE.json] [TOLERANCE]")
+        return 2
+    current = load_report(argv[0])
+    baseline = load_report(argv[1] if len(argv) > 1 else DEFAULT_BASELINE)
+    tolerance = float(argv[2]) if len(argv) > 2 else DEFAULT_TOLERANCE
+
+    rows = compare(current["results"], baseline["results"], tolerance)
+    print(format_comparison(rows))
+    return 1 if any(regressed for *_, regressed in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+# tests/benchmarks/test_bench_dashboard.py
+
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from tests.benchmarks.timing import measure, record
+from app.main import app, MAX_DISPLAY, MAX_DRIFT_ROWS
+from app.api.background_drift import build_dashboard_payload
+from app.api.dashboard_data import DashboardSnapshot, dashboard_snapshot
+
+client = TestClient(app)
+
+
+def _window(n: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    probas = rng.random(n)
+    return pd.DataFrame({
+        "model_prediction": (probas >= 0.5).astype(int),
+        "model_probability": probas,
+        "model_risk_level": np.where(probas >= 0.75, "High", np.where(probas >= 0.5, "Medium", "Low")),
+        "timestamp": pd.Timestamp.utcnow() + pd.to_timedelta(np.arange(n), unit="s"),
+    })
+
+
+def test_dashboard_payload_and_publish():
+    window = _window(MAX_DRIFT_ROWS)
+    drift = {f"feature_{i}": 0.01 * i for i in range(8)}
+
+    build = record("dashboard_build_payload", measure(lambda: build_dashboard_payload(window, drift, MAX_DISPLAY)),
+                   rows=MAX_DRIFT_ROWS)
+    payload = build_dashboard_payload(window, drift, MAX_DISPLAY)
+    snapshot = DashboardSnapshot(fallback_file="")
+    # a new payload each time, as after a drift cycle
+    payloads = [{**payload, "n_rows": i} for i in range(200)]
+    publish = record("dashboard_publish", measure(lambda: snapshot.publish(payloads.pop()), repeat=100))
+    print(f"\nbuild payload p50={build['p50_ms']:.3f} ms, publish p50={publish['p50_ms']:.3f} ms")
+
+
+def test_dashboard_data_endpoint():
+    dashboard_snapshot.publish(build_dashboard_payload(_window(MAX_DISPLAY), {"age": 0.1}, MAX_DISPLAY))
+
+    full = record("dashboard_data_200", measure(lambda: client.get("/dashboard/data"), repeat=300, warmup=10))
+    etag = client.get("/dashboard/data").headers["etag"]
+    cached = record("dashboard_data_304", measure(
+        lambda: client.get("/dashboard/data", headers={"If-None-Match": etag}), repeat=300, warmup=10))
+    print(f"\n/dashboard/data p50: 200={full['p50_ms']:.3f} ms, 304={cached['p50_ms']:.3f} ms")
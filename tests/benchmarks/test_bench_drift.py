@@ -0,0 +1,46 @@
+# tests/benchmarks/test_bench_drift.py
+
+import pandas as pd
+
+from tests.benchmarks.timing import measure, record
+from app.inference.predictor import Predictor
+from app.monitoring.drift import run_drift_check, run_streaming_drift_check
+from app.monitoring.reference_profile import load_reference_profile
+from app.monitoring.streaming import StreamingDriftState
+
+WINDOW_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+EVIDENTLY_WINDOW_SIZES = [1_000, 10_000]  # seconds per check beyond that
+
+FEATURES = Predictor().features
+source = pd.read_csv("data/processed/current_data.csv")[FEATURES]
+
+
+def _window(n: int) -> pd.DataFrame:
+    return source.sample(n, replace=True, random_state=0).reset_index(drop=True)
+
+
+def test_drift_check_vs_window_size():
+    profile = load_reference_profile("v1")
+
+    print(f"\n{'rows':>9} {'native p50 ms':>14} {'streaming update ms':>20} {'streaming check ms':>19}")
+    for n in WINDOW_SIZES:
+        window = _window(n)
+        repeat = 10 if n <= 10_000 else 3
+        native = record("drift_check_native", measure(
+            lambda: run_drift_check(window, profile, "v1", backend="native"), repeat=repeat, warmup=1), rows=n)
+
+        state = StreamingDriftState(profile, window_rows=n)
+        update = record("drift_streaming_update", measure(lambda: state.update(window), repeat=repeat, warmup=1), rows=n)
+        check = record("drift_streaming_check", measure(lambda: run_streaming_drift_check(state), repeat=repeat, warmup=1), rows=n)
+        print(f"{n:>9} {native['p50_ms']:>14.1f} {update['p50_ms']:>20.1f} {check['p50_ms']:>19.2f}")
+
+
+def test_evidently_drift_check():
+    profile = load_reference_profile("v1")
+    print(f"\n{'rows':>9} {'evidently p50 ms':>17}")
+    for n in EVIDENTLY_WINDOW_SIZES:
+        window = _window(n)
+        stats = record("drift_check_evidently", measure(
+            lambda: run_drift_check(window, profile, "v1", backend="evidently"),
+            repeat=3, warmup=1), rows=n)
+        print(f"{n:>9} {stats['p50_ms']:>17.1f}")
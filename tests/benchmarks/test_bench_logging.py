@@ -0,0 +1,48 @@
+# tests/benchmarks/test_bench_logging.py
+
+import json
+
+import numpy as np
+
+from tests.benchmarks.timing import measure, record
+from app.core.config import FEATURES_PATH
+from app.inference.results import risk_levels
+from app.monitoring.log_writer import WriteBehindLog
+from app.monitoring.prediction_log import PredictionLog
+
+BATCH_SIZES = [1, 100, 10_000]
+
+with open(FEATURES_PATH) as f:
+    FEATURES = json.load(f)
+
+
+def _table(log: PredictionLog, n: int):
+    rng = np.random.default_rng(0)
+    X = rng.random((n, len(FEATURES)))
+    probas = rng.random(n)
+    return log.from_arrays(X, (probas >= 0.5).astype(int), probas, risk_levels(probas), "v1")
+
+
+def test_log_append_throughput(tmp_path):
+    # no retention or sealing inside the measurement
+    log = PredictionLog(FEATURES, directory=str(tmp_path), segment_rows=10**9, retention_rows=10**9)
+
+    print(f"\n{'rows/batch':>10} {'append p50 ms':>14} {'rows/s':>12}")
+    for n in BATCH_SIZES:
+        table = _table(log, n)
+        stats = record("log_append", measure(lambda: log.append(table), repeat=200 if n <= 100 else 20), rows=n)
+        print(f"{n:>10} {stats['p50_ms']:>14.3f} {n / stats['p50_ms'] * 1000:>12.0f}")
+
+
+def test_write_behind_submit_cost(tmp_path):
+    """What a request pays to hand a batch to the writer (the append itself happens later)."""
+    writer = WriteBehindLog(PredictionLog(FEATURES, directory=str(tmp_path)), queue_rows=10**9)
+    writer.start()
+    try:
+        print(f"\n{'rows/batch':>10} {'submit p50 ms':>14}")
+        for n in BATCH_SIZES:
+            table = _table(writer.log, n)
+            stats = record("log_submit", measure(lambda: writer.submit(table), repeat=200 if n <= 100 else 20), rows=n)
+            print(f"{n:>10} {stats['p50_ms']:>14.4f}")
+    finally:
+        writer.close()
@@ -0,0 +1,32 @@
+# tests/benchmarks/test_bench_predict.py
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from tests.benchmarks.timing import measure, record
+from app.main import app, initialize
+
+BATCH_SIZES = [1, 10, 1_000, 100_000]
+
+source = pd.read_csv("data/processed/current_data.csv")
+
+
+@pytest.fixture(scope="module")
+def client():
+    # model, prediction log writer and warm-up, without the background loops
+    initialize()
+    return TestClient(app)
+
+
+def test_predict_csv_latency(client):
+    print(f"\n{'rows':>8} {'p50 ms':>10} {'p99 ms':>10} {'rows/s':>12}")
+    for n in BATCH_SIZES:
+        body = source.sample(n, replace=True, random_state=0).to_csv(index=False).encode()
+
+        def call():
+            response = client.post("/predict", files={"file": ("batch.csv", body, "text/csv")})
+            assert response.status_code == 200
+
+        stats = record("predict_csv", measure(call, repeat=100 if n <= 1000 else 5, warmup=2), rows=n)
+        print(f"{n:>8} {stats['p50_ms']:>10.2f} {stats['p99_ms']:>10.2f} {n / stats['p50_ms'] * 1000:>12.0f}")
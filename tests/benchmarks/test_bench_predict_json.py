@@ -0,0 +1,47 @@
+# tests/benchmarks/test_bench_predict_json.py
+
+from fastapi.testclient import TestClient
+
+from tests.benchmarks.timing import measure, record
+from app.main import app
+
+# Latency targets for single-record online scoring, measured in-process
+# (TestClient overhead included, network excluded)
+P50_TARGET_MS = 5.0
+P99_TARGET_MS = 20.0
+
+APPLICANT = {
+    "credit_limit": 50000.0,
+    "age": 35,
+    "pay_delay_sep": 0,
+    "pay_delay_aug": -1,
+    "bill_amt_sep": 12000.0,
+    "bill_amt_aug": 11000.0,
+    "pay_amt_sep": 3000.0,
+    "pay_amt_aug": 2500.0
+}
+
+client = TestClient(app)
+
+
+def test_predict_json_latency_targets():
+    stats = record("predict_json", measure(lambda: client.post("/predict/json", json=APPLICANT), repeat=500, warmup=20), rows=1)
+    print(f"\n/predict/json single record: p50={stats['p50_ms']:.3f} ms p99={stats['p99_ms']:.3f} ms")
+
+    assert stats["p50_ms"] <= P50_TARGET_MS
+    assert stats["p99_ms"] <= P99_TARGET_MS
+
+
+def test_predict_json_vs_csv_upload():
+    import io
+    import pandas as pd
+    csv_bytes = pd.DataFrame([APPLICANT]).to_csv(index=False).encode("utf-8")
+
+    json_stats = measure(lambda: client.post("/predict/json", json=APPLICANT), repeat=200, warmup=10)
+    csv_stats = measure(
+        lambda: client.post("/predict", files={"file": ("a.csv", io.BytesIO(csv_bytes), "text/csv")}),
+        repeat=200, warmup=10,
+    )
+    print(f"\nsingle record p50: json={json_stats['p50_ms']:.3f} ms csv={csv_stats['p50_ms']:.3f} ms")
+
+    assert json_stats["p50_ms"] < csv_stats["p50_ms"]
@@ -0,0 +1,47 @@
+# tests/benchmarks/test_bench_results.py
+
+import json
+
+import numpy as np
+
+from tests.benchmarks.timing import measure, record
+from app.inference.results import results_json
+
+BATCH_SIZES = [100, 10_000, 100_000]
+
+
+def legacy_results_json(preds, probas) -> bytes:
+    """Per-row loop + json.dumps, as /predict built its response before."""
+    results = []
+    for i, (pred, proba) in enumerate(zip(preds, probas)):
+        results.append({
+            "row": i,
+            "probability": round(float(proba), 4),
+            "prediction": "Default" if pred == 1 else "No Default",
+            "risk_level": "High" if proba >= 0.75 else "Medium" if proba >= 0.5 else "Low"
+        })
+    return json.dumps({"n_rows": len(results), "results": results}, separators=(",", ":")).encode()
+
+
+def test_vectorized_result_builder():
+    rng = np.random.default_rng(0)
+
+    print(f"\n{'rows':>8} {'loop p50 ms':>12} {'records p50 ms':>15} {'columns p50 ms':>15} {'speedup':>8}")
+    for n in BATCH_SIZES:
+        probas = rng.random(n)
+        preds = (probas >= 0.5).astype(int)
+        # Predictor.predict returns lists
+        pred_list, proba_list = preds.tolist(), probas.tolist()
+        assert json.loads(results_json(pred_list, proba_list)) == json.loads(legacy_results_json(pred_list, proba_list))
+
+        repeat = 50 if n <= 10_000 else 10
+        loop = record("results_json_loop", measure(lambda: legacy_results_json(pred_list, proba_list), repeat=repeat), rows=n)
+        records = record("results_json_records", measure(lambda: results_json(pred_list, proba_list), repeat=repeat), rows=n)
+        columns = record("results_json_columns",
+                         measure(lambda: results_json(pred_list, proba_list, layout="columns"), repeat=repeat), rows=n)
+        print(f"{n:>8} {loop['p50_ms']:>12.3f} {records['p50_ms']:>15.3f} {columns['p50_ms']:>15.3f} "
+              f"{loop['p50_ms'] / records['p50_ms']:>7.1f}x")
+
+        if n >= 10_000:
+            assert records["p50_ms"] < loop["p50_ms"] / 2
+            assert columns["p50_ms"] < records["p50_ms"]
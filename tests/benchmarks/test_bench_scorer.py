@@ -0,0 +1,38 @@
+# tests/benchmarks/test_bench_scorer.py
+
+import numpy as np
+import pandas as pd
+
+from tests.benchmarks.timing import measure, record
+from app.inference.predictor import Predictor
+
+BATCH_SIZES = [1, 10, 100, 1_000, 10_000, 100_000]
+
+source = pd.read_csv("data/processed/current_data.csv")
+
+
+def test_compiled_vs_sklearn_scoring():
+    compiled = Predictor(scoring_mode="compiled")
+    sklearn = Predictor(scoring_mode="sklearn")
+
+    print(f"\n{'rows':>8} {'sklearn p50 ms':>15} {'compiled p50 ms':>16} {'speedup':>8}")
+    for n in BATCH_SIZES:
+        df = source.sample(n, replace=True, random_state=0).reset_index(drop=True)
+        repeat = 200 if n <= 1000 else 20
+        sk = record("score_sklearn", measure(lambda: sklearn.predict(df), repeat=repeat), rows=n)
+        co = record("score_compiled", measure(lambda: compiled.predict(df), repeat=repeat), rows=n)
+        print(f"{n:>8} {sk['p50_ms']:>15.3f} {co['p50_ms']:>16.3f} {sk['p50_ms'] / co['p50_ms']:>7.1f}x")
+
+        # per-call sklearn validation dominates small batches
+        if n <= 1000:
+            assert co["p50_ms"] < sk["p50_ms"]
+
+
+def test_compiled_matrix_scoring():
+    compiled = Predictor(scoring_mode="compiled")
+
+    print(f"\n{'rows':>8} {'matrix p50 ms':>14}")
+    for n in BATCH_SIZES:
+        X = np.ascontiguousarray(source[compiled.features].sample(n, replace=True, random_state=0), dtype=np.float64)
+        stats = record("score_matrix", measure(lambda: compiled.predict_matrix(X), repeat=200 if n <= 1000 else 20), rows=n)
+        print(f"{n:>8} {stats['p50_ms']:>14.4f}")
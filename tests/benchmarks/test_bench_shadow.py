@@ -0,0 +1,37 @@
+# tests/benchmarks/test_bench_shadow.py
+
+import numpy as np
+import pandas as pd
+
+from tests.benchmarks.timing import measure, record
+from app.inference import shadow
+from app.inference.compiled import LinearScorer
+from app.inference.predictor import Predictor
+from app.inference.shadow import ShadowScorer
+from app.monitoring.log_writer import WriteBehindLog
+from app.monitoring.prediction_log import PredictionLog
+
+BATCH_SIZES = [1, 10, 100, 1_000, 10_000]
+
+source = pd.read_csv("data/processed/current_data.csv")
+
+
+def test_fused_shadow_scoring_overhead(tmp_path, monkeypatch):
+    monkeypatch.setattr(shadow, "get_shadow_writer",
+                        lambda features: WriteBehindLog(PredictionLog(features, directory=str(tmp_path))))
+    champion = Predictor(scoring_mode="compiled")
+    challenger = Predictor(scoring_mode="compiled")
+    challenger.scorer = LinearScorer(challenger.features, challenger.scorer.coef * 1.5, challenger.scorer.intercept)
+    challenger.model_version = "v2"
+    scorer = ShadowScorer(champion, challenger, queue_batches=100_000)
+
+    # back-to-back calls keep the background thread busy: a worst case for p99
+    print(f"\n{'rows':>8} {'champion p50/p99 ms':>20} {'shadow p50/p99 ms':>18}")
+    for n in BATCH_SIZES:
+        X = np.ascontiguousarray(source[champion.features].sample(n, replace=True, random_state=0), dtype=np.float64)
+        repeat = 500 if n <= 1000 else 50
+        alone = record("score_champion", measure(lambda: champion.predict_matrix(X), repeat=repeat), rows=n)
+        shadowed = record("score_with_shadow", measure(lambda: scorer.predict_matrix(X), repeat=repeat), rows=n)
+        print(f"{n:>8} {alone['p50_ms']:>10.4f}/{alone['p99_ms']:<9.4f} {shadowed['p50_ms']:>8.4f}/{shadowed['p99_ms']:<9.4f}")
+        scorer.join()
+    scorer.close()
@@ -0,0 +1,68 @@
+# tests/benchmarks/test_bench_startup.py
+
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+import pandas as pd
+
+from tests.benchmarks.timing import record
+
+IMPORT_BUDGET_MS = 1000
+FIRST_PREDICT_BUDGET_S = 10
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_import_time_budget():
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app.main"],
+                         capture_output=True, text=True, check=True)
+    # "import time: self [us] | cumulative | imported package"
+    rows = [line.split("|") for line in out.stderr.splitlines() if line.startswith("import time:")]
+    cumulative = {name.strip(): int(cum) for _, cum, name in rows[1:]}
+    slowest = sorted(((us, name) for name, us in cumulative.items() if name.count(".") == 0), reverse=True)[:8]
+
+    total_ms = cumulative["app.main"] / 1000
+    record("startup_import", {"n": 1, "p50_ms": total_ms})
+    print(f"\nimport app.main: {total_ms:.0f} ms (budget {IMPORT_BUDGET_MS} ms)")
+    for us, name in slowest:
+        print(f"{name:>24} {us / 1000:8.1f} ms")
+    assert total_ms < IMPORT_BUDGET_MS
+
+
+def test_time_to_first_predict(tmp_path):
+    port = _free_port()
+    env = dict(os.environ, PREDICTION_LOG_DIR=str(tmp_path / "segments"), LOGS_PATH=str(tmp_path / "logs"),
+               LEADER_LOCK_FILE=str(tmp_path / "leader.lock"), MODEL_WATCH_SECONDS="0")
+    body = pd.read_csv("data/processed/current_data.csv").head(10).to_csv(index=False)
+
+    start = time.perf_counter()
+    server = subprocess.Popen([sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port)],
+                              env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        ready_s = first_predict_s = None
+        while time.perf_counter() - start < 60 and first_predict_s is None:
+            try:
+                if ready_s is None and httpx.get(f"http://127.0.0.1:{port}/ready").status_code == 200:
+                    ready_s = time.perf_counter() - start
+                response = httpx.post(f"http://127.0.0.1:{port}/predict",
+                                      files={"file": ("batch.csv", body, "text/csv")})
+                if response.status_code == 200:
+                    first_predict_s = time.perf_counter() - start
+            except httpx.TransportError:
+                time.sleep(0.05)
+    finally:
+        server.terminate()
+        server.wait(10)
+
+    record("startup_first_predict", {"n": 1, "p50_ms": first_predict_s * 1000})
+    print(f"\nready after {ready_s:.2f} s, first /predict after {first_predict_s:.2f} s "
+          f"(budget {FIRST_PREDICT_BUDGET_S} s)")
+    assert first_predict_s < FIRST_PREDICT_BUDGET_S
@@ -0,0 +1,38 @@
+# tests/benchmarks/timing.py
+
+import time
+
+import numpy as np
+
+# Everything passed to `record` in this session; conftest writes it out as JSON
+RESULTS = []
+
+
+def measure(fn, repeat: int = 50, warmup: int = 3) -> dict:
+    """Run `fn` repeatedly and return latency percentiles in milliseconds."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    samples = np.array(samples)
+    return {
+        "n": repeat,
+        "mean_ms": float(samples.mean()),
+        "p50_ms": float(np.percentile(samples, 50)),
+        "p99_ms": float(np.percentile(samples, 99)),
+    }
+
+
+def record(name: str, stats: dict, **params) -> dict:
+    """Keep `stats` for the JSON report under `name` and its parameters (e.g. rows=1000)."""
+    RESULTS.append({"name": name, "params": params, **stats})
+    return stats
+
+
+def result_key(result: dict) -> str:
+    """Stable id of a result across runs, e.g. "predict_csv[rows=1000]"."""
+    params = ",".join(f"{k}={v}" for k, v in sorted(result["params"].items()))
+    return f"{result['name']}[{params}]" if params else result["name"]
@@ -0,0 +1,115 @@
+# tests/integration/test_admin.py
+
+import os
+import shutil
+
+from fastapi.testclient import TestClient
+
+from app.api import admin
+from app.core import profiling
+from app.core.leader import LeaderLock
+from app.inference.registry import model_registry
+from app.main import app
+
+
+def test_admin_requires_token(monkeypatch):
+    client = TestClient(app)
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", None)
+    assert client.get("/admin/models").status_code == 404
+
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "secret")
+    assert client.get("/admin/models").status_code == 401
+    assert client.get("/admin/models", headers={"X-Admin-Token": "wrong"}).status_code == 401
+    response = client.get("/admin/models", headers={"X-Admin-Token": "secret"})
+    assert response.status_code == 200
+    assert response.json()["active"] == model_registry.active_version
+
+
+def test_activate_new_version_serves_it(monkeypatch, tmp_path):
+    shutil.copytree("models/v1", tmp_path / "v1")
+    shutil.copytree("models/v1", tmp_path / "v2")
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "secret")
+    monkeypatch.setattr(model_registry, "models_dir", str(tmp_path))
+    monkeypatch.setattr(model_registry, "active_file", str(tmp_path / "ACTIVE"))
+    headers = {"X-Admin-Token": "secret"}
+    previous = model_registry.active
+
+    record = {f: 0.0 for f in previous.features}
+    client = TestClient(app)
+    try:
+        assert client.post("/admin/models/v9/activate", headers=headers).status_code == 404
+
+        response = client.post("/admin/models/v2/activate", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["active"] == "v2"
+        assert model_registry.active.model_version == "v2"
+        assert (tmp_path / "ACTIVE").read_text().strip() == "v2"
+        assert client.post("/predict/json", json=record).status_code == 200
+    finally:
+        model_registry.activate(previous.model_version)
+        model_registry._loaded.pop("v2", None)
+
+
+CSV = (
+    "credit_limit,age,pay_delay_sep,pay_delay_aug,bill_amt_sep,bill_amt_aug,pay_amt_sep,pay_amt_aug\n"
+    "50000,35,0,-1,12000,11000,3000,2500\n"
+)
+
+
+def _predict(client, headers=None):
+    return client.post("/predict", content=CSV, headers={"Content-Type": "text/csv", **(headers or {})})
+
+
+def test_profile_next_requests(monkeypatch, tmp_path):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "secret")
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path))
+    headers = {"X-Admin-Token": "secret"}
+    client = TestClient(app)
+
+    assert client.post("/admin/profile?requests=1000", headers=headers).status_code == 400
+    assert client.post("/admin/profile?mode=nope", headers=headers).status_code == 400
+    response = client.post("/admin/profile?requests=1", headers=headers)
+    assert response.json()["requests_remaining"] == 1
+
+    profiled = _predict(client)
+    assert profiled.status_code == 200
+    path = profiled.headers["X-Profile-Output"]
+    assert path.startswith(str(tmp_path)) and os.path.exists(path)
+    assert "X-Profile-Output" not in _predict(client).headers
+
+    status = client.get("/admin/profile", headers=headers).json()
+    assert status["requests_remaining"] == 0
+    assert status["outputs"][-1] == path
+
+
+def test_profile_header_needs_admin_token(monkeypatch, tmp_path):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "secret")
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path))
+    client = TestClient(app)
+
+    assert "X-Profile-Output" not in _predict(client, {"X-Profile": "1"}).headers
+    assert "X-Profile-Output" not in _predict(client, {"X-Profile": "1", "X-Admin-Token": "wrong"}).headers
+    assert "X-Profile-Output" not in _predict(client, {"X-Profile": "0", "X-Admin-Token": "secret"}).headers
+    response = _predict(client, {"X-Profile": "1", "X-Admin-Token": "secret"})
+    assert os.path.exists(response.headers["X-Profile-Output"])
+
+
+def test_drift_profiling_is_armed_on_the_leader_only(monkeypatch, tmp_path):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "secret")
+    lock = LeaderLock(str(tmp_path / "leader.lock"))
+    monkeypatch.setattr(admin, "leader_lock", lock)
+    monkeypatch.setattr(profiling, "profile_schedule", profiling.ProfileSchedule())
+    monkeypatch.setattr(admin, "profile_schedule", profiling.profile_schedule)
+    headers = {"X-Admin-Token": "secret"}
+    client = TestClient(app)
+
+    response = client.post("/admin/profile?drift_cycles=1", headers=headers)
+    assert response.status_code == 409 and "leader" in response.json()["detail"]
+    assert client.post("/admin/profile?requests=1", headers=headers).status_code == 200
+
+    assert lock.try_acquire()
+    try:
+        response = client.post("/admin/profile?drift_cycles=2", headers=headers)
+        assert response.status_code == 200 and response.json()["drift_cycles_remaining"] == 2
+    finally:
+        lock.release()
@@ -1,7 +1,11 @@
 # tests/integration/test_api.py
 
+import gzip
 import io
+import json
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from fastapi.testclient import TestClient
 from app.main import app
 
@@ -78,3 +82,156 @@ def test_predict_endpoint_missing_columns():
 
     assert response.status_code == 400
     assert "Invalid schema" in response.json()["detail"]
+
+
+def test_predict_endpoint_rejects_empty_feature_cell():
+    df = pd.read_csv("data/processed/current_data.csv").head(3)
+    df.loc[2, "age"] = None
+
+    response = client.post("/predict", files={"file": ("gap.csv", df.to_csv(index=False), "text/csv")})
+
+    assert response.status_code == 400
+    assert "row(s): 2" in response.json()["detail"]
+
+
+APPLICANT = {
+    "credit_limit": 50000.0,
+    "age": 35,
+    "pay_delay_sep": 0,
+    "pay_delay_aug": -1,
+    "bill_amt_sep": 12000.0,
+    "bill_amt_aug": 11000.0,
+    "pay_amt_sep": 3000.0,
+    "pay_amt_aug": 2500.0
+}
+
+
+def test_predict_json_single_record():
+    response = client.post("/predict/json", json=APPLICANT)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["prediction"] in (0, 1)
+    assert 0.0 <= body["probability"] <= 1.0
+
+
+def test_predict_json_batch_matches_csv_endpoint():
+    records = [APPLICANT, {**APPLICANT, "pay_delay_sep": 3, "credit_limit": 10000.0}]
+    response = client.post("/predict/json", json=records)
+    assert response.status_code == 200
+    body = response.json()
+
+    csv_bytes = pd.DataFrame(records).to_csv(index=False).encode("utf-8")
+    csv_body = client.post("/predict", files={"file": ("t.csv", io.BytesIO(csv_bytes), "text/csv")}).json()
+
+    assert [r["probability"] for r in body] == [r["probability"] for r in csv_body["results"]]
+
+
+def test_predict_json_rejects_invalid_record():
+    response = client.post("/predict/json", json={"credit_limit": 50000.0})
+    assert response.status_code == 422
+
+
+def test_predict_stream_ndjson_matches_predict():
+    df = pd.read_csv("data/processed/current_data.csv").head(250)
+    upload = {"file": ("batch.csv", df.to_csv(index=False), "text/csv")}
+
+    expected = client.post("/predict", files=upload).json()["results"]
+    response = client.post("/predict/stream?chunk_rows=100", files=upload)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines == expected
+
+
+def test_predict_stream_csv_has_one_header():
+    df = pd.read_csv("data/processed/current_data.csv").head(25)
+    response = client.post(
+        "/predict/stream?format=csv&chunk_rows=10",
+        files={"file": ("batch.csv", df.to_csv(index=False), "text/csv")},
+    )
+
+    assert response.status_code == 200
+    result = pd.read_csv(io.StringIO(response.text))
+    assert list(result.columns) == ["row", "probability", "prediction", "risk_level"]
+    assert result["row"].tolist() == list(range(25))
+
+
+def test_predict_stream_rejects_missing_columns():
+    response = client.post(
+        "/predict/stream",
+        files={"file": ("batch.csv", "credit_limit,age\n1000,30\n", "text/csv")},
+    )
+    assert response.status_code == 400
+    assert "Missing required columns" in response.json()["detail"]
+
+
+def _sample_frame(n=20):
+    return pd.read_csv("data/processed/current_data.csv").head(n)
+
+
+def _arrow_bytes(df):
+    sink = pa.BufferOutputStream()
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def test_predict_accepts_arrow_and_returns_arrow():
+    df = _sample_frame()
+    expected = client.post("/predict", files={"file": ("batch.csv", df.to_csv(index=False), "text/csv")}).json()
+
+    response = client.post(
+        "/predict",
+        content=_arrow_bytes(df),
+        headers={"Content-Type": "application/vnd.apache.arrow.stream", "Accept": "application/vnd.apache.arrow.stream"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apache.arrow.stream"
+    result = pa.ipc.open_stream(response.content).read_all().to_pylist()
+    assert result == expected["results"]
+
+
+def test_predict_accepts_gzip_parquet_and_ndjson():
+    df = _sample_frame()
+    expected = client.post("/predict", files={"file": ("batch.csv", df.to_csv(index=False), "text/csv")}).json()
+
+    sink = pa.BufferOutputStream()
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), sink)
+    response = client.post(
+        "/predict",
+        content=gzip.compress(sink.getvalue().to_pybytes()),
+        headers={"Content-Type": "application/vnd.apache.parquet", "Content-Encoding": "gzip"},
+    )
+    assert response.status_code == 200
+    assert response.json() == expected
+
+    ndjson = df.to_json(orient="records", lines=True)
+    response = client.post("/predict", files={"file": ("batch.ndjson", ndjson, "application/x-ndjson")})
+    assert response.json() == expected
+
+
+def test_predict_response_compression_and_negotiation_errors():
+    df = _sample_frame(200)
+    response = client.post(
+        "/predict",
+        files={"file": ("batch.csv", df.to_csv(index=False), "text/csv")},
+        headers={"Accept": "text/csv", "Accept-Encoding": "zstd"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "zstd"
+    body = pa.CompressedInputStream(pa.BufferReader(response.content), "zstd").read()
+    assert len(pd.read_csv(io.BytesIO(body))) == 200
+
+    response = client.post(
+        "/predict",
+        files={"file": ("batch.csv", df.to_csv(index=False), "text/csv")},
+        headers={"Accept": "application/xml"},
+    )
+    assert response.status_code == 406
+
+    response = client.post("/predict", content=b"...", headers={"Content-Type": "text/csv", "Content-Encoding": "br"})
+    assert response.status_code == 415
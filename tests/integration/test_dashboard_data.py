@@ -0,0 +1,112 @@
+# tests/integration/test_dashboard_data.py
+
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.api.dashboard_data import DashboardSnapshot, dashboard_snapshot, drift_delta, event_stream, prediction_delta
+
+client = TestClient(app)
+
+PAYLOAD = {"n_rows": 2, "results": [], "drift": [{"column": "age", "score": 0.01}]}
+
+
+def test_dashboard_data_served_from_snapshot_with_etag():
+    dashboard_snapshot.publish(PAYLOAD)
+
+    response = client.get("/dashboard/data")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok", "data": PAYLOAD}
+    etag = response.headers["etag"]
+
+    repeat = client.get("/dashboard/data", headers={"If-None-Match": etag})
+    assert repeat.status_code == 304
+    assert repeat.content == b""
+    assert client.get("/dashboard/data", headers={"If-None-Match": "W/" + etag}).status_code == 304
+
+    # republishing identical data keeps the ETag
+    version = dashboard_snapshot.version
+    dashboard_snapshot.publish(dict(PAYLOAD))
+    assert dashboard_snapshot.version == version
+    assert client.get("/dashboard/data", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_new_snapshot_invalidates_etag():
+    dashboard_snapshot.publish(PAYLOAD)
+    etag = client.get("/dashboard/data").headers["etag"]
+
+    dashboard_snapshot.publish({**PAYLOAD, "n_rows": 3})
+    response = client.get("/dashboard/data", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["data"]["n_rows"] == 3
+    assert response.headers["etag"] != etag
+
+
+def test_follower_reloads_the_file_written_by_the_leader(tmp_path):
+    path = tmp_path / "drift_report.json"
+    follower = DashboardSnapshot(fallback_file=str(path))
+    assert follower.reload(None) is None  # nothing published yet
+
+    path.write_text(json.dumps(PAYLOAD))
+    mtime = follower.reload(None)
+    assert follower.payload == PAYLOAD
+    version = follower.version
+
+    assert follower.reload(mtime) == mtime  # unchanged file is not re-read
+    assert follower.version == version
+
+
+def _result(ts, probability):
+    return {"prediction": "No Default", "probability": probability, "risk_level": "Low", "timestamp": ts}
+
+
+def test_prediction_and_drift_deltas():
+    previous = [_result("t1", 0.1), _result("t2", 0.2), _result("t2", 0.3)]
+    current = previous[1:] + [_result("t3", 0.4)]
+    assert prediction_delta(previous, current) == [_result("t3", 0.4)]
+    # window moved past everything we had: no delta, resync instead
+    assert prediction_delta(previous, [_result("t4", 0.5)]) is None
+
+    before = [{"column": "age", "score": 0.1}, {"column": "credit_limit", "score": 0.2}]
+    after = [{"column": "age", "score": 0.1}, {"column": "credit_limit", "score": 0.3}]
+    assert drift_delta(before, after) == [{"column": "credit_limit", "score": 0.3}]
+
+
+class _StubRequest:
+    """Stays connected for `events` reads of the stream."""
+
+    def __init__(self, events):
+        self.remaining = events
+
+    async def is_disconnected(self):
+        self.remaining -= 1
+        return self.remaining < 0
+
+
+def test_event_stream_sends_snapshot_then_deltas():
+    base = {"n_rows": 1, "results": [_result("t1", 0.1)], "drift": [{"column": "age", "score": 0.1}]}
+    dashboard_snapshot.publish(base)
+
+    async def run():
+        stream = event_stream(_StubRequest(2), keepalive=1)
+        first = await stream.__anext__()
+        dashboard_snapshot.publish({
+            "n_rows": 2,
+            "results": [_result("t1", 0.1), _result("t2", 0.2)],
+            "drift": [{"column": "age", "score": 0.15}],
+        })
+        second = await stream.__anext__()
+        await stream.aclose()
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first.startswith(b"event: snapshot\n")
+    assert second.startswith(b"event: delta\n")
+    delta = json.loads(second.decode().split("data: ", 1)[1])
+    assert delta["n_rows"] == 2
+    assert delta["predictions"] == [_result("t2", 0.2)]
+    assert delta["drift"] == [{"column": "age", "score": 0.15}]
+    assert not dashboard_snapshot._subscribers
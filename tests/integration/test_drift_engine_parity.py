@@ -0,0 +1,43 @@
+# tests/integration/test_drift_engine_parity.py
+
+from pathlib import Path
+import pandas as pd
+import pytest
+from evidently.report import Report
+from evidently.metric_preset import DataDriftPreset
+
+from app.monitoring.drift import run_drift_check
+from app.monitoring.drift_engine import compute_drift
+
+repo_root = Path(__file__).resolve().parents[2]
+current_df = pd.read_csv(repo_root / "data" / "processed" / "current_data.csv")
+reference_df = pd.read_csv(repo_root / "models" / "v1" / "reference_data.csv")
+
+
+def _drift_by_columns(report_dict):
+    for metric in report_dict["metrics"]:
+        if metric["metric"] == "DataDriftTable":
+            return metric["result"]["drift_by_columns"]
+    return {}
+
+
+def test_native_engine_matches_evidently():
+    report = Report(metrics=[DataDriftPreset()])
+    report.run(current_data=current_df, reference_data=reference_df)
+    expected = _drift_by_columns(report.as_dict())
+
+    actual = _drift_by_columns(compute_drift(current_df, reference_df))
+
+    assert set(actual) == set(expected)
+    for col, info in expected.items():
+        assert actual[col]["stattest_name"] == info["stattest_name"]
+        assert actual[col]["drift_score"] == pytest.approx(info["drift_score"], rel=1e-9)
+        assert actual[col]["drift_detected"] == info["drift_detected"]
+
+
+def test_run_drift_check_backends_agree():
+    ev_alerts, ev_scores = run_drift_check(current_df, reference_df, backend="evidently")
+    nat_alerts, nat_scores = run_drift_check(current_df, reference_df, backend="native")
+
+    assert len(nat_alerts) == len(ev_alerts)
+    assert nat_scores == pytest.approx(ev_scores, rel=1e-9)
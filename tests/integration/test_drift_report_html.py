@@ -0,0 +1,31 @@
+# tests/integration/test_drift_report_html.py
+
+import os
+
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.monitoring.report_cache import html_report_cache
+
+REPORT_URL = "/reports/evidently/drift_report.html"
+
+
+def test_report_rendered_on_request_and_cached(monkeypatch, tmp_path):
+    monkeypatch.setattr(html_report_cache, "directory", str(tmp_path))
+    features = ["credit_limit", "age", "pay_delay_sep", "pay_delay_aug",
+                "bill_amt_sep", "bill_amt_aug", "pay_amt_sep", "pay_amt_aug"]
+    window = pd.read_csv("data/processed/current_data.csv")[features].head(500)
+    html_report_cache.update(window, "v1")
+    assert os.listdir(tmp_path) == []  # nothing rendered until asked
+
+    client = TestClient(app)
+    response = client.get(REPORT_URL)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/html")
+    assert "evidently" in response.text[:2000]
+
+    path = html_report_cache.path(html_report_cache.key)
+    mtime = os.path.getmtime(path)
+    assert client.get(REPORT_URL).status_code == 200
+    assert os.path.getmtime(path) == mtime  # served from the cache
@@ -0,0 +1,107 @@
+# tests/integration/test_executors.py
+
+import asyncio
+import statistics
+import time
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.main import app
+from app.api import background_drift
+from app.api.background_drift import drift_cycle
+from app.core.executors import BoundedExecutor, QueueFullError
+from app.core.leader import leader_lock
+from app.inference.registry import model_registry
+from app.monitoring import log_writer
+from app.monitoring.log_writer import WriteBehindLog
+from app.monitoring.prediction_log import PredictionLog
+
+
+@pytest.fixture
+def isolated_outputs(tmp_path, monkeypatch):
+    """Prediction log, dashboard JSON, leader lock and governance logs under tmp_path, not in the repo."""
+    writer = WriteBehindLog(PredictionLog(model_registry.champion.features, directory=str(tmp_path / "segments")))
+    monkeypatch.setattr(log_writer, "_writer", writer)
+    for module in (main, background_drift):
+        monkeypatch.setattr(module, "DASHBOARD_JSON", str(tmp_path / "evidently" / "drift_report.json"))
+    monkeypatch.setattr(leader_lock, "path", str(tmp_path / "leader.lock"))
+    # read by the drift worker processes when they start
+    monkeypatch.setenv("LOGS_PATH", str(tmp_path / "logs"))
+    return tmp_path
+
+
+def _health_latency_ms(client):
+    start = time.perf_counter()
+    response = client.get("/health")
+    assert response.status_code == 200
+    return 1000 * (time.perf_counter() - start)
+
+
+def test_health_latency_stays_flat_during_drift_check(isolated_outputs):
+    df = pd.read_csv("data/processed/current_data.csv").head(200)
+
+    with TestClient(app) as client:
+        # make sure the drift window is not empty
+        client.post("/predict", files={"file": ("batch.csv", df.to_csv(index=False), "text/csv")})
+
+        baseline = [_health_latency_ms(client) for _ in range(30)]
+
+        future = client.portal.start_task_soon(drift_cycle)
+        during = []
+        while not future.done():
+            during.append(_health_latency_ms(client))
+        assert future.result() is not None
+
+    assert len(during) >= 10
+    assert statistics.median(during) < 5 * statistics.median(baseline) + 20
+
+
+def test_bounded_executor_rejects_when_full():
+    executor = BoundedExecutor("test", "thread", workers=1, queue_size=0)
+
+    async def run():
+        first = asyncio.ensure_future(executor.run(time.sleep, 0.2))
+        await asyncio.sleep(0.05)
+        try:
+            await executor.run(time.sleep, 0)
+        except QueueFullError:
+            rejected = True
+        else:
+            rejected = False
+        await first
+        return rejected
+
+    try:
+        assert asyncio.run(run())
+    finally:
+        executor.shutdown()
+
+
+def test_admitted_request_is_not_rejected_midway():
+    executor = BoundedExecutor("test", "thread", workers=1, queue_size=0)
+
+    async def outsider(admitted):
+        await admitted.wait()
+        try:
+            await executor.run(time.sleep, 0)
+        except QueueFullError:
+            return True
+        return False
+
+    async def run():
+        admitted = asyncio.Event()
+        other = asyncio.ensure_future(outsider(admitted))  # created outside the admitted block
+        async with executor.admit():
+            admitted.set()
+            outsider_rejected = await other
+            # the admitted request's own steps are never rejected
+            steps = [await executor.run(lambda i=i: i) for i in range(3)]
+        return outsider_rejected, steps, executor.in_flight
+
+    try:
+        assert asyncio.run(run()) == (True, [0, 1, 2], 0)
+    finally:
+        executor.shutdown()
@@ -0,0 +1,29 @@
+# tests/integration/test_metrics_endpoint.py
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+
+CSV = (
+    "credit_limit,age,pay_delay_sep,pay_delay_aug,bill_amt_sep,bill_amt_aug,pay_amt_sep,pay_amt_aug\n"
+    "50000,35,0,-1,12000,11000,3000,2500\n"
+)
+
+
+def test_metrics_after_predict():
+    assert client.post("/predict", content=CSV, headers={"Content-Type": "text/csv"}).status_code == 200
+    client.get("/admin/models/v1/activate")  # templated route, 405
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert 'http_request_duration_seconds_count{method="POST",route="/predict",status="200"}' in text
+    assert 'route="/admin/models/{version}/activate",status="405"' in text
+    for phase in ("parse", "inference", "log_write", "serialize"):
+        assert f'predict_phase_seconds_count{{phase="{phase}"}}' in text
+    assert 'model_scored_rows_total{model_version="v1"}' in text
+    assert "prediction_log_queue_rows " in text
+    assert "dashboard_payload_age_seconds " in text
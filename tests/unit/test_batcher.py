@@ -0,0 +1,68 @@
+# tests/unit/test_batcher.py
+
+import asyncio
+import time
+import pandas as pd
+import pytest
+
+from app.inference.batcher import MicroBatcher
+from app.inference.predictor import Predictor
+
+predictor = Predictor()
+source = pd.read_csv("data/processed/current_data.csv").head(60)
+
+
+def test_concurrent_requests_are_coalesced():
+    batcher = MicroBatcher(predictor, max_batch_rows=1000, max_wait_ms=20)
+    chunks = [source.iloc[i:i + 3] for i in range(0, len(source), 3)]
+
+    async def run():
+        return await asyncio.gather(*(batcher.predict(c) for c in chunks))
+
+    results = asyncio.run(run())
+
+    for chunk, (preds, probas) in zip(chunks, results):
+        expected_preds, expected_probas = predictor.predict(chunk)
+        assert preds == expected_preds
+        assert probas == pytest.approx(expected_probas)
+
+    stats = batcher.stats()
+    assert stats["requests"] == len(chunks)
+    assert stats["rows"] == len(source)
+    assert stats["batches"] == 1
+
+
+def test_full_batch_is_scored_without_waiting():
+    batcher = MicroBatcher(predictor, max_batch_rows=10, max_wait_ms=10_000)
+
+    async def run():
+        return await asyncio.wait_for(
+            asyncio.gather(batcher.predict(source.iloc[:5]), batcher.predict(source.iloc[5:10])), timeout=2
+        )
+
+    results = asyncio.run(run())
+
+    assert [len(p) for p, _ in results] == [5, 5]
+    assert batcher.stats()["batches"] == 1
+
+
+def test_drain_scores_pending_requests_and_wait_excludes_scoring():
+    class SlowPredictor:
+        features = predictor.features
+
+        def predict(self, df):
+            time.sleep(0.2)
+            return predictor.predict(df)
+
+    batcher = MicroBatcher(SlowPredictor(), max_batch_rows=1000, max_wait_ms=10_000)
+
+    async def run():
+        request = asyncio.ensure_future(batcher.predict(source.iloc[:3]))
+        await asyncio.sleep(0)  # queued, the batch timer is 10 s away
+        await batcher.drain()
+        return request.result()
+
+    preds, _ = asyncio.run(run())
+
+    assert len(preds) == 3
+    assert batcher.stats()["mean_wait_ms"] < 100
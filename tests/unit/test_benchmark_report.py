@@ -0,0 +1,35 @@
+# tests/unit/test_benchmark_report.py
+
+from tests.benchmarks.report import compare, load_report, main, write_report
+from tests.benchmarks.timing import result_key
+
+
+def _result(name, p50, **params):
+    return {"name": name, "params": params, "n": 10, "p50_ms": p50, "p99_ms": p50 * 2}
+
+
+def test_result_key_is_stable():
+    assert result_key(_result("predict_csv", 1.0, rows=10, fmt="csv")) == "predict_csv[fmt=csv,rows=10]"
+    assert result_key(_result("dashboard_data_200", 1.0)) == "dashboard_data_200"
+
+
+def test_compare_flags_regressions_beyond_tolerance_and_noise_floor():
+    baseline = [_result("a", 10.0, rows=1), _result("b", 10.0), _result("tiny", 0.01), _result("gone", 1.0)]
+    current = [_result("a", 13.0, rows=1), _result("b", 11.0), _result("tiny", 0.05), _result("new", 1.0)]
+
+    rows = {key: regressed for key, _, _, _, regressed in compare(current, baseline, tolerance=1.25)}
+    assert rows == {"a[rows=1]": True, "b": False, "tiny": False}
+
+
+def test_report_roundtrip_and_cli_exit_code(tmp_path):
+    baseline, current = str(tmp_path / "baseline.json"), str(tmp_path / "current.json")
+    write_report([_result("a", 10.0)], baseline)
+    write_report([_result("a", 10.5)], current)
+
+    report = load_report(current)
+    assert report["results"][0]["p50_ms"] == 10.5
+    assert {"timestamp", "commit", "python", "cpu_count"} <= set(report["environment"])
+    assert main([current, baseline]) == 0
+
+    write_report([_result("a", 20.0)], current)
+    assert main([current, baseline]) == 1
@@ -0,0 +1,56 @@
+# tests/unit/test_compiled_scorer.py
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.config import MODEL_PATH, LINEAR_MODEL_PATH
+from app.inference.compiled import LinearScorer, export_linear_model
+from app.inference.predictor import InvalidFeatureValues, Predictor
+
+current_df = pd.read_csv("data/processed/current_data.csv")
+
+
+def test_compiled_scorer_matches_sklearn():
+    model = joblib.load(MODEL_PATH)
+    scorer = LinearScorer.load(LINEAR_MODEL_PATH)
+
+    X = current_df[scorer.features]
+    expected = model.predict_proba(X)[:, 1]
+    actual = scorer.predict_proba(X.to_numpy(dtype=np.float64))
+
+    np.testing.assert_allclose(actual, expected, rtol=1e-12, atol=1e-15)
+
+
+def test_predictor_modes_agree():
+    compiled = Predictor(scoring_mode="compiled")
+    sklearn = Predictor(scoring_mode="sklearn")
+    assert compiled.scoring_mode == "compiled"
+    assert sklearn.scoring_mode == "sklearn"
+
+    preds_c, probas_c = compiled.predict(current_df)
+    preds_s, probas_s = sklearn.predict(current_df)
+
+    assert preds_c == preds_s
+    np.testing.assert_allclose(probas_c, probas_s, rtol=1e-12)
+
+
+def test_export_roundtrip(tmp_path):
+    model = joblib.load(MODEL_PATH)
+    path = str(tmp_path / "linear_model.json")
+    export_linear_model(model, list(model.feature_names_in_), path)
+
+    scorer = LinearScorer.load(path)
+
+    np.testing.assert_array_equal(scorer.coef, model.coef_[0])
+    assert scorer.intercept == model.intercept_[0]
+
+
+def test_predictor_rejects_missing_feature_values():
+    df = current_df.head(3).copy()
+    df.loc[1, df.columns[0]] = np.nan
+    for mode in ("compiled", "sklearn"):
+        with pytest.raises(InvalidFeatureValues) as excinfo:
+            Predictor(scoring_mode=mode).predict(df)
+        assert excinfo.value.rows == [1]
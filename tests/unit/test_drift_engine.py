@@ -0,0 +1,36 @@
+# tests/unit/test_drift_engine.py
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from app.monitoring.drift_engine import Distribution, ks_statistic, psi, wasserstein_norm, compute_drift
+
+
+def test_distribution_metrics_match_raw_samples():
+    rng = np.random.default_rng(0)
+    ref = rng.integers(0, 50, 2000).astype(float)
+    cur = rng.integers(5, 55, 700).astype(float)
+
+    ref_dist, cur_dist = Distribution.from_array(ref), Distribution.from_array(cur)
+
+    assert ks_statistic(ref_dist, cur_dist) == pytest.approx(stats.ks_2samp(ref, cur).statistic)
+    assert wasserstein_norm(ref_dist, cur_dist) == pytest.approx(stats.wasserstein_distance(ref, cur) / np.std(ref))
+
+
+def test_psi_is_zero_for_identical_buckets():
+    assert psi([0.2, 0.3, 0.5], [0.2, 0.3, 0.5]) == pytest.approx(0.0)
+    assert psi([0.2, 0.3, 0.5], [0.5, 0.3, 0.2]) > 0.2
+
+
+def test_compute_drift_flags_shifted_column():
+    rng = np.random.default_rng(1)
+    reference = pd.DataFrame({"a": rng.normal(0, 1, 5000), "b": rng.normal(0, 1, 5000)})
+    current = pd.DataFrame({"a": rng.normal(0, 1, 1000), "b": rng.normal(1, 1, 1000)})
+
+    table = compute_drift(current, reference)["metrics"][1]["result"]["drift_by_columns"]
+
+    assert not table["a"]["drift_detected"]
+    assert table["b"]["drift_detected"]
+    assert set(table["b"]["metrics"]) == {"psi", "ks", "wasserstein", "jensenshannon"}
@@ -0,0 +1,53 @@
+# tests/unit/test_drift_watermark.py
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.api import background_drift
+from app.api.background_drift import DriftWatermark, new_rows
+
+
+def test_new_rows_counts_growth_and_new_segments_only():
+    assert new_rows({1: 5, 2: 3}, {1: 5, 2: 3}) == 0
+    assert new_rows({1: 5, 2: 3}, {2: 4, 3: 2}) == 3  # segment 1 dropped by retention
+
+
+def test_watermark_needs_new_rows_model_change_or_staleness():
+    watermark = DriftWatermark(min_new_rows=10, max_staleness=60)
+    assert watermark.due({}, "v1", now=0)
+    watermark.mark({1: 100}, "v1", now=0)
+
+    assert not watermark.due({1: 109}, "v1", now=30)
+    assert watermark.due({1: 110}, "v1", now=30)
+    assert watermark.due({1: 100}, "v2", now=30)
+    assert watermark.due({1: 100}, "v1", now=60)
+
+    watermark.max_staleness = 0
+    assert not watermark.due({1: 100}, "v1", now=10_000)
+
+
+def test_drift_loop_skips_cycles_without_new_rows(monkeypatch):
+    positions = [{1: 5}, {1: 5}, {1: 5}, {1: 6}]
+    cycles = []
+
+    def log_position(features):
+        if not positions:
+            raise asyncio.CancelledError
+        return positions.pop(0)
+
+    async def drift_cycle(max_rows, max_display):
+        cycles.append(max_rows)
+
+    monkeypatch.setattr(background_drift, "log_position", log_position)
+    monkeypatch.setattr(background_drift, "drift_cycle", drift_cycle)
+    monkeypatch.setattr(background_drift, "model_registry",
+                        SimpleNamespace(active=SimpleNamespace(features=["a"], model_version="v1")))
+    skipped = background_drift.DRIFT_CYCLES_SKIPPED._default.value()
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(background_drift.drift_loop(0, watermark=DriftWatermark(max_staleness=0)))
+
+    assert len(cycles) == 2
+    assert background_drift.DRIFT_CYCLES_SKIPPED._default.value() - skipped == 2
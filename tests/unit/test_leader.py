@@ -0,0 +1,96 @@
+# tests/unit/test_leader.py
+
+import asyncio
+import os
+import subprocess
+import sys
+
+from app.core.leader import LeaderLock, run_as_leader
+
+HOLD_LOCK = """
+import sys, time
+from app.core.leader import LeaderLock
+assert LeaderLock(sys.argv[1]).try_acquire()
+print("locked", flush=True)
+time.sleep(60)
+"""
+
+
+def test_only_one_holder(tmp_path):
+    path = str(tmp_path / "leader.lock")
+    first, second = LeaderLock(path), LeaderLock(path)
+
+    assert first.try_acquire()
+    assert not second.try_acquire()
+    first.release()
+    assert second.try_acquire()
+    second.release()
+
+
+def test_follower_takes_over_when_leader_process_dies(tmp_path):
+    path = str(tmp_path / "leader.lock")
+    leader = subprocess.Popen([sys.executable, "-c", HOLD_LOCK, path], stdout=subprocess.PIPE, text=True)
+    try:
+        assert leader.stdout.readline().strip() == "locked"
+        follower = LeaderLock(path)
+        assert not follower.try_acquire()
+    finally:
+        leader.kill()
+        leader.wait()
+    assert follower.try_acquire()
+    follower.release()
+
+
+def test_jobs_run_only_in_the_leader(tmp_path):
+    path = str(tmp_path / "leader.lock")
+    leader, follower = LeaderLock(path), LeaderLock(path)
+    started = []
+
+    def job(name):
+        async def run():
+            started.append(name)
+            await asyncio.sleep(3600)
+        return run
+
+    async def scenario():
+        a = asyncio.create_task(run_as_leader([job("a")], leader, retry_seconds=0.01))
+        await asyncio.sleep(0.05)
+        b = asyncio.create_task(run_as_leader([job("b")], follower, retry_seconds=0.01))
+        await asyncio.sleep(0.05)
+        assert started == ["a"]
+
+        # the leader stops (shutdown): the follower takes over on its next retry
+        a.cancel()
+        await asyncio.gather(a, return_exceptions=True)
+        await asyncio.sleep(0.05)
+        assert started == ["a", "b"]
+        b.cancel()
+        await asyncio.gather(b, return_exceptions=True)
+
+    asyncio.run(scenario())
+    assert not leader.is_leader and not follower.is_leader
+
+
+REGISTER = """
+import sys, time
+from app.core.leader import LeaderLock
+LeaderLock(sys.argv[1]).register()
+print("registered", flush=True)
+time.sleep(60)
+"""
+
+
+def test_worker_count_follows_live_workers(tmp_path):
+    lock = LeaderLock(str(tmp_path / "leader.lock"))
+    assert lock.worker_count() == 1  # nobody registered yet: this process alone
+    lock.register()
+    other = subprocess.Popen([sys.executable, "-c", REGISTER, lock.path], stdout=subprocess.PIPE, text=True)
+    try:
+        assert other.stdout.readline().strip() == "registered"
+        assert lock.worker_count() == 2
+    finally:
+        other.kill()
+        other.wait()
+    assert lock.worker_count() == 1
+    assert os.listdir(lock.workers_dir) == [str(os.getpid())]  # the dead worker's file is gone
+    lock.unregister()
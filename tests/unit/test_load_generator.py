@@ -0,0 +1,107 @@
+# tests/unit/test_load_generator.py
+
+import asyncio
+
+import httpx
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.load_generator import (
+    LatencyHistogram,
+    build_payloads,
+    is_saturated,
+    parse_batch_sizes,
+    run_load,
+)
+
+
+def test_histogram_is_exact_for_small_values():
+    hist = LatencyHistogram()
+    for ms in (0.001, 0.1, 0.2, 0.25):
+        hist.record(ms)
+    assert hist.total == 4
+    assert hist.percentile(50) == 0.1
+    assert hist.percentile(100) == 0.25
+
+
+def test_histogram_percentiles_within_two_significant_digits():
+    rng = np.random.RandomState(0)
+    values = rng.lognormal(mean=2.0, sigma=1.0, size=20_000)  # ms, long tail
+    hist = LatencyHistogram()
+    for v in values:
+        hist.record(v)
+    for p in (50, 90, 99, 99.9):
+        expected = np.percentile(values, p, method="higher")
+        assert hist.percentile(p) == pytest.approx(expected, rel=0.01)
+    assert hist.summary()["max_ms"] == pytest.approx(values.max(), abs=0.001)
+    assert hist.summary()["mean_ms"] == pytest.approx(values.mean(), rel=0.001)
+
+
+def test_histogram_clamps_values_beyond_range_and_merges():
+    a, b = LatencyHistogram(highest_ms=100), LatencyHistogram(highest_ms=100)
+    a.record(1.0)
+    b.record(5_000.0)
+    a.merge(b)
+    assert a.total == 2
+    assert a.percentile(100) == 5_000.0
+    with pytest.raises(ValueError):
+        a.merge(LatencyHistogram(highest_ms=10_000))
+
+
+def test_parse_batch_sizes():
+    assert parse_batch_sizes("1:0.6, 10:0.3,1000:0.1") == ([1, 10, 1000], [0.6, 0.3, 0.1])
+    assert parse_batch_sizes("1,10") == ([1, 10], [1.0, 1.0])
+    for bad in ("", "0:1", "5:-1", "5:0"):
+        with pytest.raises(ValueError):
+            parse_batch_sizes(bad)
+
+
+def test_build_payloads_samples_csv_bodies():
+    df = pd.DataFrame({"a": range(5), "b": range(5)})
+    payloads = build_payloads(df, [1, 8], per_size=3, seed=0)
+    assert [len(payloads[s]) for s in (1, 8)] == [3, 3]
+    assert len(pd.read_csv(pd.io.common.BytesIO(payloads[8][0]))) == 8
+
+
+def _client(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://test")
+
+
+def test_open_loop_rate_and_error_accounting():
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        return httpx.Response(503 if len(calls) % 4 == 0 else 200, json={})
+
+    async def go():
+        async with _client(handler) as client:
+            return await run_load(client, "/predict", {1: [b"a\n1\n"]}, rate=200, duration=0.25, seed=0)
+
+    result = asyncio.run(go()).summary()
+    assert result["sent"] == 50 and len(calls) == 50
+    assert result["ok"] + result["errors"]["http_503"] == 50
+    assert result["error_rate"] == pytest.approx(0.24, abs=0.02)
+    assert result["response_time"]["count"] == result["ok"]
+    assert calls[0].headers["content-type"] == "text/csv"
+
+
+def test_response_time_includes_queueing_behind_slow_requests():
+    # one request at a time, each taking 20 ms, offered every 5 ms: a
+    # closed-loop client would report ~20 ms, but requests queue for longer
+    # and longer behind each other
+    async def handler(request):
+        await asyncio.sleep(0.02)
+        return httpx.Response(200, json={})
+
+    async def go():
+        async with _client(handler) as client:
+            return await run_load(client, "/predict", {1: [b"a\n1\n"]}, rate=200, duration=0.2,
+                                  concurrency=1, seed=0)
+
+    result = asyncio.run(go())
+    summary = result.summary()
+    assert summary["service_time"]["p99_ms"] < 100
+    assert summary["response_time"]["p99_ms"] > 400
+    assert is_saturated(summary)
@@ -0,0 +1,92 @@
+# tests/unit/test_log_writer.py
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.executors import QueueFullError
+from app.monitoring.log_writer import WriteBehindLog
+from app.monitoring.prediction_log import PredictionLog
+
+FEATURES = ["credit_limit", "age"]
+
+
+def _batch(n, start=0):
+    return pd.DataFrame({
+        "credit_limit": np.arange(start, start + n, dtype=float),
+        "age": np.full(n, 30),
+        "model_prediction": np.zeros(n, dtype=int),
+        "model_probability": np.full(n, 0.25),
+        "model_risk_level": "Low",
+        "model_version": "v1",
+        "timestamp": pd.Timestamp("2026-01-01", tz="UTC"),
+    })
+
+
+def test_submitted_rows_are_written_in_bulk_and_in_order(tmp_path):
+    writer = WriteBehindLog(PredictionLog(FEATURES, directory=str(tmp_path)), flush_rows=10, flush_ms=10_000)
+
+    for i in range(4):
+        writer.submit(_batch(3, i * 3))
+    # 12 rows >= flush_rows: the writer thread flushes without waiting for the interval
+    deadline = time.monotonic() + 2
+    while writer.written_rows < 12 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    writer.close()
+
+    assert writer.flushes == 1
+    assert writer.log.tail(100)["credit_limit"].tolist() == list(np.arange(12.0))
+
+
+def test_time_trigger_and_close_flush_pending_rows(tmp_path):
+    writer = WriteBehindLog(PredictionLog(FEATURES, directory=str(tmp_path)), flush_rows=1000, flush_ms=20)
+
+    writer.submit(_batch(2))
+    time.sleep(0.2)
+    assert writer.log.n_rows() == 2
+
+    writer.submit(_batch(3, 2))
+    writer.close()
+    assert writer.log.n_rows() == 5
+    assert writer.pending_rows == 0
+
+
+def test_full_queue_rejects_after_block_timeout(tmp_path):
+    writer = WriteBehindLog(PredictionLog(FEATURES, directory=str(tmp_path)), flush_rows=5, flush_ms=10_000,
+                            queue_rows=5, block_ms=20)
+    # hold the flush lock so the writer cannot drain the queue
+    with writer._flush_lock:
+        writer.submit(_batch(5))
+        with pytest.raises(QueueFullError):
+            writer.submit(_batch(1, 5))
+    writer.close()
+
+    assert writer.rejected == 1
+    assert writer.log.n_rows() == 5
+
+
+def test_failed_append_keeps_rows_queued(tmp_path, monkeypatch):
+    log = PredictionLog(FEATURES, directory=str(tmp_path))
+    writer = WriteBehindLog(log, flush_rows=1000, flush_ms=10_000)
+    append = log.append
+    calls = []
+
+    def flaky_append(table):
+        calls.append(table.num_rows)
+        if len(calls) == 1:
+            raise OSError("No space left on device")
+        append(table)
+
+    monkeypatch.setattr(log, "append", flaky_append)
+    writer.submit(_batch(2))
+    writer.submit(_batch(3, 2))
+    with pytest.raises(OSError):
+        writer.flush()
+    assert writer.pending_rows == 5
+
+    writer.submit(_batch(1, 5))
+    writer.close()
+    assert calls == [5, 6]
+    assert log.tail(100)["credit_limit"].tolist() == list(np.arange(6.0))
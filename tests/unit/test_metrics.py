@@ -0,0 +1,101 @@
+# tests/unit/test_metrics.py
+
+import threading
+import time
+
+import pytest
+
+from app.core.metrics import Counter, Gauge, Histogram, MetricsRegistry
+
+
+def test_histogram_buckets_are_cumulative_and_inclusive():
+    hist = Histogram("latency_seconds", "test", buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        hist.observe(value)
+    text = hist.render()
+    assert 'latency_seconds_bucket{le="0.1"} 2' in text
+    assert 'latency_seconds_bucket{le="1"} 3' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 4' in text
+    assert "latency_seconds_count 4" in text
+    assert "latency_seconds_sum 2.65" in text
+    assert "# TYPE latency_seconds histogram" in text
+
+
+def test_labels_are_cached_and_rendered_sorted():
+    counter = Counter("requests_total", "test", ("route", "status"))
+    assert counter.labels("/b", 200) is counter.labels("/b", 200)
+    counter.labels("/b", 200).inc()
+    counter.labels("/a", "500").inc(2)
+    lines = counter.render().splitlines()[2:]
+    assert lines == ['requests_total{route="/a",status="500"} 2', 'requests_total{route="/b",status="200"} 1']
+    with pytest.raises(ValueError):
+        counter.labels("/a")
+
+
+def test_recording_from_many_threads_loses_nothing():
+    counter = Counter("rows_total", "test")
+    hist = Histogram("phase_seconds", "test", ("phase",))
+
+    def work():
+        child = hist.labels("parse")
+        for _ in range(10_000):
+            counter.inc()
+            child.observe(0.001)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert counter.labels().value() == 80_000
+    assert 'phase_seconds_count{phase="parse"} 80000' in hist.render()
+
+
+def test_callback_metrics_are_read_at_scrape_time():
+    registry = MetricsRegistry()
+    depth = {"rows": 3}
+    registry.gauge("queue_rows", "test", fn=lambda: depth["rows"])
+    registry.gauge("age_seconds", "test", fn=lambda: None)
+    depth["rows"] = 7
+    text = registry.render()
+    assert "queue_rows 7" in text
+    assert "age_seconds NaN" in text
+
+
+def test_failing_callback_does_not_break_the_scrape():
+    registry = MetricsRegistry()
+    registry.gauge("broken", "test", fn=lambda: 1 / 0)
+    registry.counter("ok_total", "test").inc()
+    text = registry.render()
+    assert "ok_total 1" in text and "broken" not in text
+
+
+def test_register_returns_the_existing_metric():
+    registry = MetricsRegistry()
+    first = registry.counter("x_total", "test")
+    assert registry.counter("x_total", "test") is first
+
+
+def test_timer_observes_elapsed_seconds():
+    hist = Histogram("block_seconds", "test", buckets=(0.001, 1.0))
+    with hist.time():
+        time.sleep(0.002)
+    text = hist.render()
+    assert 'block_seconds_bucket{le="0.001"} 0' in text
+    assert 'block_seconds_bucket{le="1"} 1' in text
+
+
+def test_observe_costs_microseconds():
+    child = Histogram("cost_seconds", "test", ("phase",)).labels("parse")
+    n = 20_000
+    started = time.perf_counter()
+    for _ in range(n):
+        child.observe(0.003)
+    per_call_us = (time.perf_counter() - started) / n * 1e6
+    assert per_call_us < 20  # typically ~1 us
+
+
+def test_gauge_set():
+    gauge = Gauge("temperature", "test")
+    gauge.set(3)
+    assert "temperature 3" in gauge.render()
@@ -0,0 +1,118 @@
+# tests/unit/test_model_registry.py
+
+import json
+import os
+import shutil
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from app.inference import shadow
+from app.inference.registry import ModelRegistry
+from app.monitoring.log_writer import WriteBehindLog
+from app.monitoring.prediction_log import PredictionLog
+
+ARTIFACTS = ["features.json", "linear_model.json"]
+
+
+@pytest.fixture
+def models_dir(tmp_path):
+    for version in ("v1", "v2"):
+        os.makedirs(tmp_path / version)
+        for name in ARTIFACTS:
+            shutil.copy(os.path.join("models/v1", name), tmp_path / version / name)
+    os.makedirs(tmp_path / "empty")  # no artifacts: not a version
+    return str(tmp_path)
+
+
+def test_discovers_versions_and_loads_lazily(models_dir):
+    registry = ModelRegistry(models_dir, default_version="v1", scoring_mode="compiled")
+    assert registry.versions() == ["v1", "v2"]
+    assert registry.status()["loaded"] == ["v1"]  # status resolves the default version only
+
+    assert registry.get("v2").model_version == "v2"
+    assert registry.get("v2") is registry.get("v2")
+    with pytest.raises(KeyError):
+        registry.get("empty")
+
+
+def test_activate_swaps_without_touching_inflight_predictor(models_dir):
+    registry = ModelRegistry(models_dir, default_version="v1", scoring_mode="compiled")
+    inflight = registry.active
+    X = np.zeros((3, len(inflight.features)))
+
+    registry.activate("v2")
+    assert registry.active_version == "v2"
+    # a request that captured the old model still scores with it
+    assert inflight.model_version == "v1"
+    assert len(inflight.predict_matrix(X)[0]) == 3
+
+    with pytest.raises(KeyError):
+        registry.activate("v3")
+    assert registry.active_version == "v2"
+
+
+def test_activate_rejects_different_features(models_dir):
+    with open(os.path.join(models_dir, "v2", "features.json")) as f:
+        features = json.load(f)
+    with open(os.path.join(models_dir, "v2", "features.json"), "w") as f:
+        json.dump(features[:-1], f)
+    # the linear artifact must match its own feature list
+    os.remove(os.path.join(models_dir, "v2", "linear_model.json"))
+    shutil.copy("models/v1/model.pkl", os.path.join(models_dir, "v2", "model.pkl"))
+
+    registry = ModelRegistry(models_dir, default_version="v1", scoring_mode="compiled")
+    with pytest.raises(ValueError):
+        registry.activate("v2")
+    assert registry.active_version == "v1"
+
+
+def test_challenger_shadows_until_promoted(models_dir, tmp_path, monkeypatch):
+    monkeypatch.setattr(shadow, "get_shadow_writer",
+                        lambda features: WriteBehindLog(PredictionLog(features, directory=str(tmp_path / "shadow"))))
+
+    registry = ModelRegistry(models_dir, default_version="v1", scoring_mode="compiled")
+    registry.set_challenger("v2")
+    assert registry.active_version == "v1"
+    assert registry.status()["challenger"] == "v2"
+    assert registry.shadow_stats()["fused"]
+    with pytest.raises(ValueError):
+        registry.set_challenger("v1")
+
+    registry.activate("v2")
+    assert registry.active is registry.get("v2")
+    assert registry.shadow_stats() is None
+
+
+def test_concurrent_swaps_close_every_replaced_scorer(models_dir, monkeypatch):
+    from app.inference import registry as registry_module
+    scorers = []
+
+    class FakeShadowScorer:
+        def __init__(self, champion, challenger):
+            self.model_version = champion.model_version
+            self.closed = 0
+            scorers.append(self)
+            time.sleep(0.001)  # widen the window between reading and replacing the active scorer
+
+        def close(self):
+            self.closed += 1
+
+    monkeypatch.setattr(registry_module, "ShadowScorer", FakeShadowScorer)
+    registry = ModelRegistry(models_dir, default_version="v1", scoring_mode="compiled")
+    registry.get("v2")
+
+    def swap(i):
+        registry.set_challenger("v2" if i % 2 else None)
+
+    threads = [threading.Thread(target=swap, args=(i,)) for i in range(50)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    active = [s for s in scorers if s is registry.active]
+    assert all(s.closed == 1 for s in scorers if s is not registry.active)
+    assert all(s.closed == 0 for s in active)
@@ -0,0 +1,104 @@
+# tests/unit/test_prediction_log.py
+
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from app.monitoring.prediction_log import PredictionLog
+
+FEATURES = ["credit_limit", "age"]
+
+
+def _batch(n, start, ts):
+    return pd.DataFrame({
+        "credit_limit": np.arange(start, start + n, dtype=float),
+        "age": np.full(n, 30),
+        "target": np.nan,
+        "model_prediction": np.zeros(n, dtype=int),
+        "model_probability": np.full(n, 0.25),
+        "model_risk_level": "Low",
+        "model_version": "v1",
+        "timestamp": pd.Timestamp(ts, tz="UTC"),
+    })
+
+
+def test_append_rotates_and_drops_whole_segments(tmp_path):
+    log = PredictionLog(FEATURES, directory=str(tmp_path), segment_rows=10, retention_rows=25)
+
+    for i in range(10):
+        log.append(_batch(5, i * 5, "2026-01-01"))
+
+    sealed = [s for s in log.segments() if s.sealed]
+    assert all(s.rows == 10 for s in sealed)
+    # 50 rows written, retention keeps >= 25 rows in whole segments
+    assert 25 <= log.n_rows() < 35
+
+    tail = log.tail(7)
+    assert tail["credit_limit"].tolist() == list(np.arange(43, 50, dtype=float))
+    assert tail["age"].dtype == np.float64
+
+
+def test_read_range_skips_other_segments(tmp_path):
+    log = PredictionLog(FEATURES, directory=str(tmp_path), segment_rows=3)
+    log.append(_batch(3, 0, "2026-01-01"))
+    log.append(_batch(3, 100, "2026-02-01"))
+    log.append(_batch(2, 200, "2026-03-01"))
+
+    df = log.read_range("2026-01-15", "2026-02-15")
+
+    assert df["credit_limit"].tolist() == [100.0, 101.0, 102.0]
+
+    # aware bounds are converted to UTC (here 2026-01-31T23:00Z .. 2026-02-01T01:00Z)
+    aware = log.read_range(pd.Timestamp("2026-02-01", tz="Europe/Paris"),
+                           datetime(2026, 2, 1, 1, tzinfo=timezone.utc))
+    assert aware["credit_limit"].tolist() == [100.0, 101.0, 102.0]
+
+
+def test_open_segment_is_readable_and_sealed_on_restart(tmp_path):
+    log = PredictionLog(FEATURES, directory=str(tmp_path), segment_rows=100)
+    log.append(_batch(4, 0, "2026-01-01"))
+    assert not log.segments()[0].sealed
+    assert len(log.tail(10)) == 4
+
+    reopened = PredictionLog(FEATURES, directory=str(tmp_path))
+
+    assert [s.rows for s in reopened.segments()] == [4]
+
+
+def test_import_legacy_csv(tmp_path):
+    csv_path = tmp_path / "predictions_log.csv"
+    legacy = _batch(6, 0, "2026-01-15 16:07:20.196448+00:00")
+    legacy["timestamp"] = "2026-01-15 16:07:20.196448+00:00"
+    legacy.to_csv(csv_path, index=False)
+
+    log = PredictionLog(FEATURES, directory=str(tmp_path / "segments"))
+
+    assert log.import_csv(str(csv_path)) == 6
+    assert log.import_csv(str(csv_path)) == 0
+    assert log.tail(100)["timestamp"].iloc[0] == pd.Timestamp("2026-01-15 16:07:20.196448", tz="UTC")
+
+
+def test_append_from_arrays(tmp_path):
+    log = PredictionLog(FEATURES, directory=str(tmp_path))
+    X = np.array([[1000.0, 30.0], [2000.0, 40.0]])
+
+    log.append(log.from_arrays(X, np.array([0, 1]), np.array([0.2, 0.8]), np.array(["Low", "High"]), "v1"))
+
+    df = log.tail(10)
+    assert df["credit_limit"].tolist() == [1000.0, 2000.0]
+    assert df["model_risk_level"].tolist() == ["Low", "High"]
+    assert df["target"].isna().all()
+
+
+def test_row_counts_track_own_and_other_writers(tmp_path):
+    reader = PredictionLog(FEATURES, directory=str(tmp_path), segment_rows=5)
+    writer = PredictionLog(FEATURES, directory=str(tmp_path), segment_rows=5)
+    writer.append(_batch(5, 0, "2026-01-01"))
+    writer.append(_batch(2, 5, "2026-01-02"))
+
+    # the writer's open segment is read by the other instance, then cached by size
+    assert sorted(reader.row_counts().values()) == [2, 5]
+    assert writer.row_counts() == reader.row_counts()
+    writer.append(_batch(1, 7, "2026-01-03"))
+    assert sum(reader.row_counts().values()) == 8
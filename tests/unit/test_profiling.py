@@ -0,0 +1,81 @@
+# tests/unit/test_profiling.py
+
+import pstats
+import threading
+import time
+
+import pytest
+
+from app.core import profiling
+from app.core.profiling import ProfileSchedule, SamplingProfiler, run_profiled
+
+
+def busy_leaf(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+    return "done"
+
+
+def busy_caller(seconds):
+    return busy_leaf(seconds)
+
+
+def test_sampling_profiler_collapses_stacks(tmp_path):
+    profiler = SamplingProfiler(interval_ms=1)
+    profiler.start()
+    busy_caller(0.1)
+    profiler.stop()
+    assert profiler.samples > 10
+    path = profiler.write(str(tmp_path / "out.folded"))
+    lines = open(path).read().splitlines()
+    stack, count = lines[0].rsplit(" ", 1)
+    frames = stack.split(";")
+    assert frames[0] == threading.current_thread().name
+    assert frames[-2].startswith("busy_caller (test_profiling.py:")
+    assert frames[-1].startswith("busy_leaf (test_profiling.py:")
+    assert int(count) > 5
+
+
+def test_sampling_follows_other_threads():
+    worker = threading.Thread(target=busy_leaf, args=(0.1,), name="inference_0")
+    worker.start()
+    profiler = SamplingProfiler(interval_ms=1, threads=lambda: [worker.ident])
+    profiler.start()
+    worker.join()
+    profiler.stop()
+    assert any(s.startswith("inference_0;") and "busy_leaf" in s for s in profiler.stacks)
+
+
+@pytest.mark.parametrize("mode, extension", [("sampling", ".folded"), ("cprofile", ".pstats")])
+def test_run_profiled_writes_output(monkeypatch, tmp_path, mode, extension):
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path))
+    result, path = run_profiled("drift", mode, busy_caller, 0.05)
+    assert result == "done"
+    assert path.startswith(str(tmp_path)) and path.endswith(extension)
+    if mode == "cprofile":
+        names = {func[2] for func in pstats.Stats(path).stats}
+        assert {"busy_caller", "busy_leaf"} <= names
+    with pytest.raises(ValueError):
+        run_profiled("drift", "nope", busy_caller, 0)
+
+
+def test_schedule_counts_down():
+    schedule = ProfileSchedule()
+    assert not schedule.take_request() and schedule.take_drift_cycle() is None
+
+    schedule.arm(requests=2, drift_cycles=1, drift_mode="cprofile")
+    assert [schedule.take_request() for _ in range(3)] == [True, True, False]
+    assert schedule.take_drift_cycle() == "cprofile"
+    assert schedule.take_drift_cycle() is None
+    with pytest.raises(ValueError):
+        schedule.arm(drift_mode="nope")
+
+
+def test_schedule_is_cheap_when_disarmed():
+    schedule = ProfileSchedule()
+    n = 100_000
+    started = time.perf_counter()
+    for _ in range(n):
+        schedule.take_request()
+    assert (time.perf_counter() - started) / n < 5e-6
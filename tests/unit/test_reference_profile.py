@@ -0,0 +1,56 @@
+# tests/unit/test_reference_profile.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.monitoring.drift_engine import compute_drift, compute_drift_from_profile
+from app.monitoring.reference_profile import ReferenceProfile, load_reference_profile
+
+
+def _frames():
+    rng = np.random.default_rng(7)
+    reference = pd.DataFrame({
+        "amount": rng.lognormal(8, 1, 3000).round(),
+        "delay": rng.integers(-2, 8, 3000),
+    })
+    current = pd.DataFrame({
+        "amount": rng.lognormal(8.2, 1, 800).round(),
+        "delay": rng.integers(-1, 8, 800),
+    })
+    return reference, current
+
+
+def test_profile_roundtrip(tmp_path):
+    reference, _ = _frames()
+    profile = ReferenceProfile.from_frame(reference, ["amount", "delay"], model_version="v9")
+    path = str(tmp_path / "reference_profile.npz")
+    profile.save(path)
+
+    loaded = ReferenceProfile.load(path)
+
+    assert loaded.model_version == "v9"
+    assert loaded.columns == ["amount", "delay"]
+    for name in loaded.columns:
+        np.testing.assert_array_equal(loaded.features[name].bin_edges, profile.features[name].bin_edges)
+        np.testing.assert_array_equal(loaded.features[name].hist, profile.features[name].hist)
+        assert loaded.features[name].hist.sum() == len(reference)
+        assert loaded.features[name].moments["mean"] == pytest.approx(reference[name].mean())
+
+
+def test_profile_drift_matches_raw_reference():
+    reference, current = _frames()
+    profile = ReferenceProfile.from_frame(reference, ["amount", "delay"])
+
+    from_profile = compute_drift_from_profile(current, profile)["metrics"][1]["result"]["drift_by_columns"]
+    from_frame = compute_drift(current, reference)["metrics"][1]["result"]["drift_by_columns"]
+
+    for col in ("amount", "delay"):
+        assert from_profile[col]["drift_score"] == pytest.approx(from_frame[col]["drift_score"])
+
+
+def test_bundled_profile_is_memoized():
+    profile = load_reference_profile("v1")
+
+    assert load_reference_profile("v1") is profile
+    assert profile.features["age"].hist.sum() == 21000
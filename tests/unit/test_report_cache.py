@@ -0,0 +1,77 @@
+# tests/unit/test_report_cache.py
+
+import asyncio
+import os
+
+import pandas as pd
+
+from app.monitoring import report_cache
+from app.monitoring.report_cache import HtmlReportCache, report_key
+
+window = pd.DataFrame({"age": [30.0, 40.0, 50.0], "credit_limit": [1e4, 2e4, 3e4]})
+
+
+def test_report_key_depends_on_values_columns_and_model():
+    key = report_key(window, "v1")
+    assert key == report_key(window.copy(), "v1")
+    assert key != report_key(window, "v2")
+    assert key != report_key(window.assign(age=[30.0, 40.0, 51.0]), "v1")
+    assert key != report_key(window.rename(columns={"age": "years"}), "v1")
+
+
+def _fake_render(monkeypatch):
+    renders = []
+
+    def render(current_data, model_version, path):
+        renders.append((model_version, len(current_data)))
+        with open(path, "w") as f:
+            f.write(f"<html>{model_version}</html>")
+        return path
+
+    async def run_inline(fn, *args):
+        await asyncio.sleep(0.01)  # let concurrent requests pile up
+        return fn(*args)
+
+    monkeypatch.setattr(report_cache, "render_report_html", render)
+    monkeypatch.setattr(report_cache, "run_drift", run_inline)
+    return renders
+
+
+def test_renders_only_on_request_and_once_per_window(monkeypatch, tmp_path):
+    renders = _fake_render(monkeypatch)
+    cache = HtmlReportCache(str(tmp_path))
+    assert asyncio.run(cache.get()) is None  # no drift check yet
+
+    cache.update(window, "v1")
+    assert renders == []
+
+    async def three_requests():
+        return await asyncio.gather(cache.get(), cache.get(), cache.get())
+
+    paths = asyncio.run(three_requests())
+    assert len(set(paths)) == 1 and os.path.exists(paths[0])
+    assert renders == [("v1", 3)]
+
+    cache.update(window.copy(), "v1")  # same window next cycle: still cached
+    assert asyncio.run(cache.get()) == paths[0]
+    assert len(renders) == 1
+
+    cache.update(window.iloc[:2], "v1")
+    assert asyncio.run(cache.get()) != paths[0]
+    assert len(renders) == 2
+
+
+def test_keeps_newest_files(monkeypatch, tmp_path):
+    _fake_render(monkeypatch)
+    cache = HtmlReportCache(str(tmp_path), max_files=2)
+    for n in range(1, 5):
+        cache.update(window.iloc[:n], "v1")
+        asyncio.run(cache.get())
+    files = sorted(os.listdir(tmp_path))
+    assert len(files) == 2
+    assert cache.path(cache.key).endswith(tuple(files))
+
+
+def test_falls_back_to_newest_file_on_disk(tmp_path):
+    (tmp_path / "old.html").write_text("<html></html>")
+    assert asyncio.run(HtmlReportCache(str(tmp_path)).get()) == str(tmp_path / "old.html")
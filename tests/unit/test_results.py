@@ -0,0 +1,35 @@
+# tests/unit/test_results.py
+
+import json
+
+from app.inference.results import results_json, risk_levels
+
+
+def test_risk_bands_match_thresholds():
+    assert risk_levels([0.0, 0.4999, 0.5, 0.7499, 0.75, 1.0]).tolist() == [
+        "Low", "Low", "Medium", "Medium", "High", "High"
+    ]
+
+
+def test_records_and_columns_layouts():
+    preds, probas = [0, 1], [0.123456, 0.8]
+
+    records = json.loads(results_json(preds, probas))
+    assert records == {
+        "n_rows": 2,
+        "results": [
+            {"row": 0, "probability": 0.1235, "prediction": "No Default", "risk_level": "Low"},
+            {"row": 1, "probability": 0.8, "prediction": "Default", "risk_level": "High"},
+        ],
+    }
+
+    columns = json.loads(results_json(preds, probas, layout="columns"))
+    assert columns == {
+        "n_rows": 2,
+        "results": {
+            "row": [0, 1],
+            "probability": [0.1235, 0.8],
+            "prediction": ["No Default", "Default"],
+            "risk_level": ["Low", "High"],
+        },
+    }
@@ -0,0 +1,94 @@
+# tests/unit/test_shadow.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.inference import shadow
+from app.inference.compiled import LinearScorer, StackedLinearScorer
+from app.inference.predictor import Predictor
+from app.inference.shadow import ShadowScorer
+from app.monitoring.log_writer import WriteBehindLog
+from app.monitoring.prediction_log import PredictionLog
+
+current_df = pd.read_csv("data/processed/current_data.csv").head(500)
+
+
+def _challenger():
+    challenger = Predictor(scoring_mode="compiled")
+    challenger.model_version = "v2"
+    base = challenger.scorer
+    challenger.scorer = LinearScorer(base.features, base.coef * 1.5, base.intercept + 0.2)
+    return challenger
+
+
+@pytest.fixture(autouse=True)
+def shadow_log(tmp_path, monkeypatch):
+    writers = {}
+
+    def get_writer(features):
+        if "w" not in writers:
+            writers["w"] = WriteBehindLog(PredictionLog(features, directory=str(tmp_path)))
+        return writers["w"]
+
+    monkeypatch.setattr(shadow, "get_shadow_writer", get_writer)
+    return writers
+
+
+def test_stacked_scorer_matches_each_model():
+    champion, challenger = Predictor(scoring_mode="compiled"), _challenger()
+    X = current_df[champion.features].to_numpy(dtype=np.float64)
+
+    probas = StackedLinearScorer([champion.scorer, challenger.scorer]).predict_proba(X)
+
+    np.testing.assert_allclose(probas[:, 0], champion.scorer.predict_proba(X), rtol=1e-12)
+    np.testing.assert_allclose(probas[:, 1], challenger.scorer.predict_proba(X), rtol=1e-12)
+
+
+@pytest.mark.parametrize("champion_mode", ["compiled", "sklearn"])
+def test_returns_champion_output_and_compares_challenger(champion_mode, shadow_log):
+    champion, challenger = Predictor(scoring_mode=champion_mode), _challenger()
+    scorer = ShadowScorer(champion, challenger)
+    assert scorer.stacked is not None if champion_mode == "compiled" else scorer.stacked is None
+
+    preds, probas = scorer.predict(current_df)
+    expected_preds, expected_probas = champion.predict(current_df)
+    assert preds == expected_preds
+    np.testing.assert_allclose(probas, expected_probas, rtol=1e-12)
+
+    scorer.close()
+    stats = scorer.stats()
+    _, challenger_probas = challenger.predict(current_df)
+    agreement = np.mean((np.array(expected_probas) >= 0.5) == (np.array(challenger_probas) >= 0.5))
+    assert stats["challenger"] == "v2" and stats["n_rows"] == len(current_df)
+    assert stats["agreement"] == round(agreement, 4)
+    assert stats["score_psi"] > 0
+
+    # challenger predictions go to their own log
+    writer = shadow_log["w"]
+    writer.flush()
+    logged = writer.log.tail(len(current_df))
+    assert (logged["model_version"] == "v2").all()
+    np.testing.assert_allclose(logged["model_probability"], challenger_probas, rtol=1e-12)
+
+
+def test_closed_scorer_keeps_serving_without_comparing():
+    scorer = ShadowScorer(Predictor(scoring_mode="compiled"), _challenger(), queue_batches=1)
+    scorer.close()  # e.g. swapped out while a request is still running
+    X = current_df[scorer.features].to_numpy(dtype=np.float64)
+    preds, probas = scorer.predict_matrix(X)
+    assert len(preds) == len(X)
+    assert scorer.stats()["n_rows"] == 0
+
+
+def test_batchers_are_reused_per_version_pair(monkeypatch):
+    from app.api import routes
+    monkeypatch.setattr(routes, "batchers", {})
+    champion, challenger = Predictor(scoring_mode="compiled"), _challenger()
+
+    for _ in range(3):  # every set_challenger/activate builds a new ShadowScorer
+        scorer = ShadowScorer(champion, challenger)
+        assert routes.get_batcher(scorer).predictor is scorer
+        scorer.close()
+    assert routes.get_batcher(champion).predictor is champion
+    assert list(routes.batchers) == [(champion.model_version, "v2"), (champion.model_version, None)]
@@ -0,0 +1,41 @@
+# tests/unit/test_startup.py
+
+import json
+import subprocess
+import sys
+
+# Heavy or optional dependencies that must not load just by importing the app
+LAZY_MODULES = ["evidently", "plotly", "sklearn", "joblib", "scipy", "requests"]
+
+CHECK_IMPORT = """
+import json, logging, sys
+import app.main
+from app.inference.registry import model_registry
+from app.monitoring import log_writer
+print(json.dumps({
+    "loaded": sorted(m for m in %r if m in sys.modules),
+    "model_loaded": model_registry._active is not None,
+    "log_opened": log_writer._writer is not None,
+    "governance_handlers": len(logging.getLogger("governance").handlers),
+}))
+""" % (LAZY_MODULES,)
+
+
+def test_importing_the_app_has_no_side_effects():
+    # fresh interpreter: other tests have already imported and initialized everything here
+    out = subprocess.run([sys.executable, "-c", CHECK_IMPORT], capture_output=True, text=True, check=True)
+    state = json.loads(out.stdout.strip().splitlines()[-1])
+    assert state == {"loaded": [], "model_loaded": False, "log_opened": False, "governance_handlers": 0}
+
+
+def test_ready_after_startup():
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as client:
+        response = client.get("/ready")
+        assert response.status_code == 200
+        assert response.json()["startup_seconds"] >= 0
+
+    # not ready once shutdown has started
+    assert TestClient(app).get("/ready").status_code == 503
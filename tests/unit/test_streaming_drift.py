@@ -0,0 +1,77 @@
+# tests/unit/test_streaming_drift.py
+
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.monitoring import streaming
+from app.monitoring.drift_engine import compute_drift_from_profile
+from app.monitoring.prediction_log import PredictionLog
+from app.monitoring.reference_profile import ReferenceProfile
+from app.monitoring.streaming import StreamingDriftState
+
+
+def _profile():
+    rng = np.random.default_rng(3)
+    reference = pd.DataFrame({
+        "delay": rng.integers(-2, 9, 5000),
+        "amount": rng.normal(1000, 200, 5000),
+    })
+    return ReferenceProfile.from_frame(reference, ["delay", "amount"])
+
+
+def _table(report_dict):
+    return report_dict["metrics"][1]["result"]["drift_by_columns"]
+
+
+def test_snapshot_matches_batch_engine_for_discrete_features():
+    profile = _profile()
+    rng = np.random.default_rng(4)
+    current = pd.DataFrame({"delay": rng.integers(0, 9, 1200), "amount": rng.normal(1100, 200, 1200)})
+
+    state = StreamingDriftState(profile, window_rows=5000)
+    for start in range(0, len(current), 7):
+        state.update(current.iloc[start:start + 7])
+
+    streamed = _table(state.snapshot())
+    batch = _table(compute_drift_from_profile(current, profile))
+
+    assert streamed["delay"]["drift_score"] == pytest.approx(batch["delay"]["drift_score"])
+    # continuous features are a binned approximation
+    assert streamed["amount"]["drift_score"] == pytest.approx(batch["amount"]["drift_score"], abs=0.02)
+    assert streamed["amount"]["drift_detected"] == batch["amount"]["drift_detected"]
+
+
+def test_window_expires_whole_buckets():
+    profile = _profile()
+    state = StreamingDriftState(profile, window_rows=100, n_buckets=10)
+
+    old = pd.DataFrame({"delay": np.full(300, 8), "amount": np.full(300, 5000.0)})
+    new = pd.DataFrame({"delay": np.full(100, -2), "amount": np.full(100, 100.0)})
+    state.update(old)
+    state.update(new)
+
+    assert state.n_rows == 100
+    table = _table(state.snapshot())
+    assert table["delay"]["current_mean"] == pytest.approx(-2)
+    assert table["amount"]["current_mean"] == pytest.approx(100.0)
+
+
+def test_new_state_is_seeded_from_the_log_once(tmp_path, monkeypatch):
+    log = PredictionLog(["delay", "amount"], directory=str(tmp_path))
+    for version, n in (("v1", 30), ("v2", 5)):
+        log.append(pd.DataFrame({
+            "delay": np.zeros(n), "amount": np.full(n, 1000.0), "model_prediction": 0,
+            "model_probability": 0.1, "model_risk_level": "Low", "model_version": version,
+            "timestamp": pd.Timestamp("2026-01-01", tz="UTC"),
+        }))
+    monkeypatch.setattr(streaming, "_states", {})
+    monkeypatch.setattr(streaming, "get_prediction_writer", lambda features: SimpleNamespace(log=log))
+    monkeypatch.setattr(streaming, "load_reference_profile", lambda version: _profile())
+
+    state = streaming.get_drift_state("v1")
+    assert state.n_rows == 30  # only rows of its own model version
+    state.update(pd.DataFrame({"delay": [1.0], "amount": [900.0]}))
+    assert streaming.get_drift_state("v1") is state and state.n_rows == 31